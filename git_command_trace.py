@@ -0,0 +1,119 @@
+# File: git_command_trace.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import subprocess
+import threading
+import time
+
+
+class GitCommandTrace:
+    """Collects the git commands run during an action along with their timings, and the ssh commands run for git.
+
+    This module does not import GitPython, which runs `git version` when it is imported, so that actions which never
+    run a git command do not pay for it. The commands are recorded by the repo classes in git_traced_repo.
+    """
+
+    # Trace the commands of the running action are recorded in
+    active = None
+
+    def __init__(self, secrets=()):
+        """
+        :param secrets: values that must never appear in a recorded command line
+        """
+        self.secrets = [secret for secret in secrets if secret]
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def redact(self, argv):
+        """Return the command line with URL credentials and known secrets masked."""
+        from git.util import remove_password_if_present
+
+        redacted = []
+        for arg in remove_password_if_present([str(arg) for arg in argv]):
+            for secret in self.secrets:
+                arg = arg.replace(secret, "***")
+            redacted.append(arg)
+        return redacted
+
+    def record(self, argv, duration, exit_code, stdout_bytes, stderr_bytes):
+        """Record a finished git command."""
+        command = {
+            "argv": self.redact(argv),
+            "duration": round(duration, 4),
+            "exit_code": exit_code,
+            "stdout_bytes": stdout_bytes,
+            "stderr_bytes": stderr_bytes,
+        }
+        with self._lock:
+            self.commands.append(command)
+
+    def run(self, argv, **kwargs):
+        """Run a command git relies on, such as the ssh control commands, with subprocess.run and record it.
+
+        :param argv: command line to run
+        :param kwargs: keyword arguments of subprocess.run
+        :raises subprocess.TimeoutExpired: if the command does not finish in time, after recording it
+        """
+        start_time = time.monotonic()
+        try:
+            completed = subprocess.run(argv, **kwargs)
+        except subprocess.TimeoutExpired as e:
+            self.record(argv, time.monotonic() - start_time, None, output_size(e.stdout), output_size(e.stderr))
+            raise
+        self.record(argv, time.monotonic() - start_time, completed.returncode, output_size(completed.stdout), output_size(completed.stderr))
+        return completed
+
+    def reset(self):
+        """Forget the recorded commands and return them."""
+        with self._lock:
+            commands, self.commands = self.commands, []
+        return commands
+
+    def summary(self):
+        """Return the aggregated timings of the recorded commands."""
+        with self._lock:
+            commands = list(self.commands)
+
+        git_time = {}
+        for command in commands:
+            # Group by subcommand, e.g. 'clone' or 'pull'
+            subcommand = _subcommand(command["argv"])
+            git_time[subcommand] = round(git_time.get(subcommand, 0) + command["duration"], 4)
+
+        return {
+            "git_commands": len(commands),
+            "git_time": round(sum(command["duration"] for command in commands), 4),
+            "git_time_by_command": git_time,
+        }
+
+
+def output_size(output):
+    """Return the size of the captured output of a command, 0 if it was not captured."""
+    return len(output) if isinstance(output, (bytes, str)) else 0
+
+
+def _subcommand(argv):
+    """Return the git subcommand of a command line, skipping the global options before it and their values.
+
+    ssh commands are grouped by their control command, e.g. 'ssh -O check', and the start of a master is 'ssh'.
+    """
+    if argv[0] == "ssh":
+        return f"ssh -O {argv[argv.index('-O') + 1]}" if "-O" in argv else "ssh"
+    args = iter(argv[1:])
+    for arg in args:
+        if arg in ("-c", "-C"):
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return "git"
@@ -0,0 +1,179 @@
+# File: git_commit_builder.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from io import BytesIO
+from pathlib import Path
+
+import git
+from git.objects.fun import tree_to_stream
+from gitdb import IStream
+
+from git_repo_query import TREE_MODE, RepoQuery
+
+
+FILE_MODE = 0o100644
+
+
+def _adds_files(change):
+    """Return whether a nested change of a directory adds any file."""
+    if isinstance(change, dict):
+        return any(_adds_files(child) for child in change.values())
+    return change is not None
+
+
+class CommitBuilder:
+    """Builds a commit straight in the object database, without touching the working tree or the index.
+
+    Blobs are hashed into the object database as files are added. When the commit is created, only the trees on the
+    path of a changed file are rewritten; every other subtree of the parent commit is reused as it is.
+    """
+
+    def __init__(self, repo, parent=None):
+        """
+        :param repo: object of git.Repo class
+        :param parent: object of git.Commit class the new commit is based on, or None for a root commit
+        """
+        self.repo = repo
+        self.parent = parent
+        # Pending changes keyed by path: (binsha, mode) of the new blob, or None for a deleted file
+        self.changes = {}
+        self.query = RepoQuery(repo)
+
+    def _store(self, object_type, size, stream):
+        return self.repo.odb.store(IStream(object_type, size, stream)).binsha
+
+    def _parent_entry(self, path):
+        """Return the (binsha, mode) of a path in the parent commit, or None if it does not exist there."""
+        entry = (self.parent.tree.binsha, TREE_MODE) if self.parent else None
+        for name in path.split("/"):
+            if entry is None or entry[1] != TREE_MODE:
+                return None
+            entry = self.query.tree_entries(entry[0]).get(name)
+        return entry
+
+    def exists(self, path):
+        """Return whether the path is a file in the commit being built."""
+        if path in self.changes:
+            return self.changes[path] is not None
+        entry = self._parent_entry(path)
+        return entry is not None and entry[1] != TREE_MODE
+
+    def is_directory(self, path):
+        """Return whether the path is a directory holding files in the commit being built."""
+        prefix = f"{path}/"
+        pending = [changed for changed in self.changes if changed.startswith(prefix)]
+        if any(self.changes[changed] is not None for changed in pending):
+            return True
+        entry = self._parent_entry(path)
+        if entry is None or entry[1] != TREE_MODE:
+            return False
+        if not pending:
+            return True
+        # The directory only goes away once every file in it is deleted
+        return any(self.changes.get(file_path, True) is not None for file_path, *_ in self.query.diff_trees(entry[0], None, prefix))
+
+    def conflict(self, path):
+        """Return the path of a file or directory that stops a file from being written at the given path, or None.
+
+        A file cannot be written below another file, nor in place of a directory that still holds files.
+        """
+        parts = path.split("/")
+        for index in range(1, len(parts)):
+            directory = "/".join(parts[:index])
+            if self.exists(directory):
+                return directory
+        return path if self.is_directory(path) else None
+
+    def add(self, path, file_data):
+        """Hash the file into the object database and stage it at the given path.
+
+        :param path: path of the file relative to the repository
+        :param file_data: bytes of the file, or path of a file to stream into the object database
+        """
+        if isinstance(file_data, Path):
+            with file_data.open("rb") as stream:
+                binsha = self._store(git.Blob.type, file_data.stat().st_size, stream)
+        else:
+            binsha = self._store(git.Blob.type, len(file_data), BytesIO(file_data))
+        entry = self._parent_entry(path) if path not in self.changes else self.changes[path]
+        # Keep the mode of an existing file, e.g. the executable bit
+        mode = entry[1] if entry and entry[1] != TREE_MODE else FILE_MODE
+        self.changes[path] = (binsha, mode)
+
+    def remove(self, path):
+        """Stage the removal of the file at the given path."""
+        self.changes[path] = None
+
+    def _write_tree(self, binsha, changes, root=False):
+        """Write the tree with the given changes applied and return its binsha, or None if it ends up empty.
+
+        :param binsha: binsha of the tree in the parent commit, or None if it does not exist there
+        :param changes: nested dictionary of changes keyed by path component
+        :param root: whether this is the root tree, which is written even when empty
+        """
+        entries = self.query.tree_entries(binsha)
+        for name, change in changes.items():
+            if isinstance(change, dict):
+                existing = entries.get(name)
+                subtree = self._write_tree(existing[0] if existing and existing[1] == TREE_MODE else None, change)
+                change = (subtree, TREE_MODE) if subtree else None
+            if change is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = change
+
+        if not entries and not root:
+            return None
+
+        # git sorts tree entries by name, with a trailing slash on the names of subtrees
+        def sort_key(item):
+            name, (_, mode) = item
+            return (name + "/" if mode == TREE_MODE else name).encode()
+
+        stream = BytesIO()
+        tree_to_stream([(sha, mode, name) for name, (sha, mode) in sorted(entries.items(), key=sort_key)], stream.write)
+        size = stream.tell()
+        stream.seek(0)
+        return self._store(git.Tree.type, size, stream)
+
+    def write_tree(self):
+        """Write the trees touched by the pending changes and return the binsha of the root tree."""
+        nested = {}
+        # Deletions go first, so that a file added in place of a deleted directory replaces it, and the other way around
+        for path, change in sorted(self.changes.items(), key=lambda item: item[1] is not None):
+            *dirs, name = path.split("/")
+            node = nested
+            for index, directory in enumerate(dirs):
+                child = node.get(directory)
+                if child is None:
+                    child = node[directory] = {}
+                elif not isinstance(child, dict):
+                    raise ValueError(f"'{path}' conflicts with the file '{'/'.join(dirs[: index + 1])}'")
+                node = child
+            if _adds_files(node.get(name)):
+                raise ValueError(f"'{path}' conflicts with a directory of the same name")
+            node[name] = change
+        return self._write_tree(self.parent.tree.binsha if self.parent else None, nested, root=True)
+
+    def commit(self, message, actor):
+        """Create the commit and return it, or None if it would not change the tree of the parent commit.
+
+        :param message: commit message
+        :param actor: object of git.Actor class used as both author and committer
+        """
+        tree_sha = self.write_tree()
+        if self.parent and tree_sha == self.parent.tree.binsha:
+            return None
+        parents = [self.parent] if self.parent else []
+        return git.Commit.create_from_tree(self.repo, tree_sha.hex(), message, parent_commits=parents, author=actor, committer=actor)
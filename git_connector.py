@@ -16,24 +16,34 @@
 #
 # Standard library imports
 import ast
+import fcntl
+import hashlib
 import json
 import os
+import random
+import re
 import shlex
+import subprocess
+import tempfile
+import threading
+import time
 import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from shutil import rmtree
+from shutil import copyfileobj, rmtree, which
 
 # Phantom imports
 import phantom.app as phantom
-import phantom.rules as phantom_rules
-from Cryptodome.PublicKey import RSA
 from phantom.action_result import ActionResult
 from phantom.base_connector import BaseConnector
 
-import git
-
 # Local imports
 import git_consts as consts
+from git_command_trace import GitCommandTrace
+from git_repo_lock import RepoLock, RepoLockTimeout
+from git_repo_query import RepoQuery
 
 
 class GitConnector(BaseConnector):
@@ -41,6 +51,34 @@ class GitConnector(BaseConnector):
     git and helper methods required to run the actions.
     """
 
+    # Names of the handlers of each action, looked up when the action runs
+    ACTION_HANDLERS = {
+        "clone_repo": "_clone_repo",
+        "delete_clone": "_delete_clone",
+        "delete_file": "_delete_file",
+        "git_pull": "_git_pull",
+        "sync_all_repos": "_sync_all_repos",
+        "search_repos": "_search_repos",
+        "add_file": "_add_file",
+        "git_push": "_git_push",
+        "list_repos": "_list_repos",
+        "git_commit": "_git_commit",
+        "commit_files": "_commit_files",
+        "update_file": "_update_file",
+        "write_files": "_write_files",
+        "configure_ssh": "_configure_ssh",
+        "refresh_object_cache": "_refresh_object_cache_action",
+        "git_status": "_git_status",
+        "get_file": "_get_file",
+        "git_log": "_git_log",
+        "git_diff": "_git_diff",
+        "git_checkout": "_git_checkout",
+        "get_disk_usage": "_get_disk_usage",
+        "on_poll": "_on_poll",
+        "run_maintenance": "_run_maintenance",
+        "test_asset_connectivity": "_test_asset_connectivity",
+    }
+
     def __init__(self):
         # Calling the BaseConnector's init function
         super().__init__()
@@ -53,6 +91,13 @@ class GitConnector(BaseConnector):
         self.modified_repo_uri = None
         self.ssh = False
         self.ssh_host_key = None
+        self.object_cache_dir = None
+        self._state = {}
+        self._repos = {}
+        # Options shared by the ssh command of git and the master connections, set when SSH multiplexing is used
+        self._ssh_options = None
+        self._ssh_masters = set()
+        self._git_trace = GitCommandTrace()
         return
 
     def initialize(self):
@@ -65,6 +110,13 @@ class GitConnector(BaseConnector):
 
         self.config = self.get_config()
         self.app_state_dir = Path(self.get_state_dir())
+        self._git_trace = GitCommandTrace(secrets=[self.config.get(consts.GIT_CONFIG_PASSWORD), self.config.get("access_token")])
+        GitCommandTrace.active = self._git_trace
+        self.lock_timeout = self.config.get(consts.GIT_CONFIG_LOCK_TIMEOUT, consts.GIT_DEFAULT_LOCK_TIMEOUT)
+        self._state = self.load_state()
+        if not isinstance(self._state, dict):
+            self.debug_print("Resetting the state file with the default format")
+            self._state = {"app_version": self.get_app_json().get("app_version")}
         if self.get_action_identifier() == "configure_ssh":
             return phantom.APP_SUCCESS
         self.username = self.config.get(consts.GIT_CONFIG_USERNAME)
@@ -97,6 +149,8 @@ class GitConnector(BaseConnector):
         self.branch_name = param.get("branch") or self.branch_name
         self.modified_repo_uri = self.repo_uri
         supplied_access_token = param.get("access_token")
+        if supplied_access_token:
+            self._git_trace.secrets.append(supplied_access_token)
         use_asset_credentials = not requested_repo_uri or self._same_remote(configured_repo_uri, requested_repo_uri)
         self.access_token = supplied_access_token or (self.access_token if use_asset_credentials else None)
 
@@ -123,21 +177,7 @@ class GitConnector(BaseConnector):
             else:
                 self.save_progress("Connecting with SSH")
                 self.ssh = True
-                ssh_dir = self.app_state_dir / f".ssh-{self.get_asset_id()}"
-                ssh_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
-                rsa_key_path = ssh_dir / "id_rsa"
-                known_hosts_path = ssh_dir / "known_hosts"
-                host_key = (self.ssh_host_key or "").strip()
-                if "\n" in host_key or "\r" in host_key:
-                    host_key = ""
-                known_hosts_path.write_text(f"{host_key}\n" if host_key else "")
-                known_hosts_path.chmod(0o600)
-                git_ssh_cmd = (
-                    "ssh -oStrictHostKeyChecking=yes "
-                    f"-oUserKnownHostsFile={shlex.quote(str(known_hosts_path))} "
-                    f"-i {shlex.quote(str(rsa_key_path))}"
-                )
-                os.environ["GIT_SSH_COMMAND"] = git_ssh_cmd
+                os.environ["GIT_SSH_COMMAND"] = self._git_ssh_command()
         except AttributeError:
             return phantom.APP_ERROR
 
@@ -155,6 +195,162 @@ class GitConnector(BaseConnector):
 
         return phantom.APP_SUCCESS
 
+    def _git_ssh_command(self):
+        """Prepare the SSH directory of the asset and return the ssh command git runs to reach the remote."""
+        ssh_dir = self.app_state_dir / f".ssh-{self.get_asset_id()}"
+        if not ssh_dir.is_dir():
+            ssh_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        rsa_key_path = ssh_dir / "id_rsa"
+        known_hosts_path = ssh_dir / "known_hosts"
+        host_key = (self.ssh_host_key or "").strip()
+        if "\n" in host_key or "\r" in host_key:
+            host_key = ""
+
+        # Only rewrite known_hosts when the configured host key changed
+        known_hosts = f"{host_key}\n" if host_key else ""
+        try:
+            current_known_hosts = known_hosts_path.read_text()
+        except OSError:
+            current_known_hosts = None
+        if current_known_hosts != known_hosts:
+            known_hosts_path.write_text(known_hosts)
+            known_hosts_path.chmod(0o600)
+            if current_known_hosts is not None:
+                # Master connections were authenticated against the previous host key
+                self._close_ssh_sessions()
+
+        ssh_options = ["-oStrictHostKeyChecking=yes", f"-oUserKnownHostsFile={known_hosts_path}", "-i", str(rsa_key_path)]
+
+        if self.config.get(consts.GIT_CONFIG_SSH_MULTIPLEXING):
+            control_dir = self._ssh_control_dir(create=True)
+            if control_dir:
+                # ssh expands % tokens in the control path, %C being a hash of the local host, remote host, port and user
+                control_path = str(control_dir / consts.GIT_SSH_CONTROL_SOCKET_PREFIX).replace("%", "%%") + "%C"
+                ssh_options.append(f"-oControlPath={control_path}")
+                self._ssh_options = ssh_options
+                # git only goes through a master connection started by _start_ssh_master, and connects on its own otherwise
+                return f"ssh {shlex.join(ssh_options)} -oControlMaster=no"
+            self.debug_print("No private directory is available for SSH control sockets, connecting without multiplexing")
+
+        return f"ssh {shlex.join(ssh_options)}"
+
+    @staticmethod
+    def _ssh_destination(remote_url):
+        """Return the destination ssh connects to for a remote URL, or None if the remote is not reached over SSH.
+
+        :param remote_url: ssh://[user@]host[:port]/path or [user@]host:path URL
+        """
+        if not remote_url or remote_url.startswith("-"):
+            return None
+        if remote_url.startswith("ssh://"):
+            netloc = urllib.parse.urlparse(remote_url).netloc
+            return f"ssh://{netloc}" if netloc else None
+        # scp-like syntax, the host ends at the first colon as long as no slash comes before it
+        host, colon, _ = remote_url.partition(":")
+        return host if colon and host and "/" not in host else None
+
+    def _start_ssh_master(self, remote_url, deadline=None):
+        """Start a master connection to the SSH remote unless one is running, detached from the stdio of every caller.
+
+        A master that ssh forks off for ControlMaster=auto inherits the standard error of the git command that started
+        it, and older OpenSSH releases keep it open until ControlPersist expires, so whoever reads the output of that
+        git command waits for the master to exit. The master is therefore started here, with all of its stdio on
+        /dev/null, and git's ssh command only ever uses it. Without a master, git connects on its own.
+
+        :param remote_url: URL of the remote git is about to contact
+        :param deadline: time.monotonic() value by which the master must be up, if any
+        """
+        destination = self._ssh_destination(remote_url)
+        if not self._ssh_options or not destination or destination in self._ssh_masters:
+            return
+        self._ssh_masters.add(destination)
+
+        control_dir = self._ssh_control_dir()
+        if not control_dir:
+            return
+        timeout = (
+            consts.GIT_SSH_MASTER_START_TIMEOUT if deadline is None else min(consts.GIT_SSH_MASTER_START_TIMEOUT, self._remaining_time(deadline))
+        )
+        lock_name = hashlib.sha256(destination.encode()).hexdigest()[:16]
+        ssh = ["ssh", *self._ssh_options]
+        devnull = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        try:
+            # Concurrent actions on the same remote start a single master
+            with (control_dir / f"{consts.GIT_SSH_MASTER_LOCK_PREFIX}{lock_name}").open("w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                check = self._git_trace.run(
+                    [*ssh, "-O", "check", destination], timeout=consts.GIT_SSH_CONTROL_EXIT_TIMEOUT, check=False, **devnull
+                )
+                if check.returncode:
+                    # -f sends the master to the background once it is authenticated, so this returns once it can be used.
+                    # With auto rather than yes, ssh removes the socket a master that died left behind instead of giving up
+                    master = self._git_trace.run(
+                        [*ssh, "-oControlMaster=auto", f"-oControlPersist={consts.GIT_SSH_CONTROL_PERSIST}", "-N", "-f", destination],
+                        timeout=timeout,
+                        check=False,
+                        **devnull,
+                    )
+                    if master.returncode:
+                        self.debug_print(f"Unable to start the SSH master connection, exit code {master.returncode}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.debug_print(f"Unable to start the SSH master connection: {e!s}")
+
+    @staticmethod
+    def _remote_url(repo, remote=None):
+        """Return the URL of a remote of the repo, or None if it has none."""
+        try:
+            return repo.remote(remote or "origin").url
+        except Exception:
+            return None
+
+    def _ssh_control_dir(self, create=False):
+        """Return the directory holding the SSH control sockets of the asset, or None if there is no usable one.
+
+        Sockets live in the SSH directory of the asset when its path is short enough for a unix socket. Otherwise they
+        live in a private directory of the user in the temporary directory, which is only used when nobody else can
+        write to it.
+
+        :param create: whether to create the directory if it does not exist
+        """
+        ssh_dir = self.app_state_dir / f".ssh-{self.get_asset_id()}"
+        # The socket name is the prefix followed by a 40 character hash
+        socket_name_length = len(consts.GIT_SSH_CONTROL_SOCKET_PREFIX) + 40
+        if len(str(ssh_dir)) + 1 + socket_name_length <= consts.GIT_SSH_MAX_CONTROL_PATH:
+            return ssh_dir
+
+        user_dir = Path(tempfile.gettempdir()) / f"git-ssh-{os.getuid()}"
+        control_dir = user_dir / str(self.get_asset_id())
+        for directory in (user_dir, control_dir):
+            try:
+                if create:
+                    directory.mkdir(mode=0o700, exist_ok=True)
+                dir_stat = directory.lstat()
+            except OSError:
+                return None
+            if directory.is_symlink() or not directory.is_dir() or dir_stat.st_uid != os.getuid() or dir_stat.st_mode & 0o077:
+                return None
+        return control_dir
+
+    def _close_ssh_sessions(self):
+        """Ask the SSH master connections of the asset to exit, so that the next connection authenticates again."""
+        control_dir = self._ssh_control_dir()
+        if not control_dir:
+            return
+        for socket_path in control_dir.glob(f"{consts.GIT_SSH_CONTROL_SOCKET_PREFIX}*"):
+            try:
+                self._git_trace.run(
+                    ["ssh", "-oControlPath={}".format(str(socket_path).replace("%", "%%")), "-O", "exit", "git"],
+                    capture_output=True,
+                    timeout=consts.GIT_SSH_CONTROL_EXIT_TIMEOUT,
+                    check=False,
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                self.debug_print(f"Unable to close the SSH session {socket_path.name}: {e!s}")
+            # ssh leaves the socket of a master that is no longer running behind
+            socket_path.unlink(missing_ok=True)
+        for lock_path in control_dir.glob(f"{consts.GIT_SSH_MASTER_LOCK_PREFIX}*"):
+            lock_path.unlink(missing_ok=True)
+
     @staticmethod
     def _same_remote(configured_uri, requested_uri):
         """Return whether two HTTP(S) repository URLs use the same endpoint."""
@@ -175,6 +371,462 @@ class GitConnector(BaseConnector):
         except ValueError:
             return False
 
+    @staticmethod
+    def _utc_now():
+        """Return the current UTC time as an ISO 8601 string."""
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @staticmethod
+    def _seconds_since(timestamp):
+        """Return the seconds elapsed since a time returned by _utc_now(), or None if it is missing or malformed."""
+        try:
+            then = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return None
+        return (datetime.now(timezone.utc) - then).total_seconds()
+
+    @staticmethod
+    def _clean_remote_url(remote_url):
+        """Return the remote URL without any credentials embedded in it."""
+        remote_url = (remote_url or "").strip().rstrip("/")
+        if remote_url.startswith("http"):
+            parsed = urllib.parse.urlparse(remote_url)
+            port = f":{parsed.port}" if parsed.port else ""
+            remote_url = f"{parsed.scheme.casefold()}://{parsed.hostname}{port}{parsed.path}"
+        return remote_url
+
+    def _validate_integer(self, action_result, parameter, key, allow_zero=False):
+        """Validate that the given parameter is a positive integer.
+
+        :param action_result: object of ActionResult class
+        :param parameter: value of the parameter to validate
+        :param key: name of the parameter, used in the error message
+        :param allow_zero: whether zero is an acceptable value
+        :return: status success/failure, integer value of the parameter or None
+        """
+        if parameter is not None and parameter != "":
+            try:
+                if not float(parameter).is_integer():
+                    return action_result.set_status(phantom.APP_ERROR, consts.GIT_VALID_INT_MSG.format(param=key)), None
+                parameter = int(parameter)
+            except Exception:
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_VALID_INT_MSG.format(param=key)), None
+
+            if parameter < 0:
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_NON_NEG_INT_MSG.format(param=key)), None
+            if not allow_zero and parameter == 0:
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_NON_NEG_NON_ZERO_INT_MSG.format(param=key)), None
+            return phantom.APP_SUCCESS, parameter
+
+        return phantom.APP_SUCCESS, None
+
+    def _get_clone_options(self, action_result, param):
+        """Build the optional `git clone` arguments requested in the action parameters.
+
+        :param action_result: object of ActionResult class
+        :param param: dictionary on input parameters
+        :return: status success/failure, dictionary of keyword arguments for `git.Repo.clone_from`
+        """
+        ret_val, depth = self._validate_integer(action_result, param.get("depth"), "depth")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), None
+
+        clone_filter = param.get("filter")
+        if clone_filter and clone_filter not in consts.GIT_CLONE_FILTERS:
+            message = consts.GIT_INVALID_CLONE_FILTER_MSG.format(", ".join(consts.GIT_CLONE_FILTERS))
+            return action_result.set_status(phantom.APP_ERROR, message), None
+
+        tuning_profile = param.get("tuning_profile") or "none"
+        if tuning_profile not in consts.GIT_TUNING_PROFILES:
+            message = consts.GIT_INVALID_TUNING_PROFILE_MSG.format(", ".join(consts.GIT_TUNING_PROFILES))
+            return action_result.set_status(phantom.APP_ERROR, message), None
+
+        clone_options = {}
+        if depth:
+            clone_options["depth"] = depth
+        if str(param.get("single_branch", False)).lower() == "true":
+            clone_options["single_branch"] = True
+        if clone_filter:
+            clone_options["filter"] = clone_filter
+        if str(param.get("no_tags", False)).lower() == "true":
+            clone_options["no_tags"] = True
+        profile_config = consts.GIT_TUNING_PROFILES[tuning_profile]
+        if profile_config:
+            clone_options["config"] = [f"{key}={value}" for key, value in profile_config.items()]
+            # GitPython rejects --config as it could run commands, the values only ever come from the fixed profiles
+            clone_options["allow_unsafe_options"] = True
+
+        # Polled repos that are only fetched need no working tree, or no checkout unless one is asked for
+        poll_mode = param.get("poll_mode")
+        if poll_mode == "mirror":
+            clone_options["bare"] = True
+        elif poll_mode == "fetch" and str(param.get("checkout", False)).lower() != "true":
+            clone_options["no_checkout"] = True
+
+        return phantom.APP_SUCCESS, clone_options
+
+    def _object_cache_dir(self):
+        """Return the shared object cache directory for the current remote.
+
+        The cache is keyed on the remote URL without credentials, so every branch cloned from the same remote shares it.
+        """
+        remote = self._clean_remote_url(self.repo_uri).removesuffix(".git")
+        digest = hashlib.sha256(remote.encode()).hexdigest()[:16]
+        return self.app_state_dir / consts.GIT_OBJECT_CACHE_DIR / f"{digest}.git"
+
+    def _refresh_object_cache(self, cache_dir):
+        """Create the shared object cache if needed, pin the refs of the clones using it and fetch the remote into it.
+
+        Clones rely on the cache for the objects they did not download themselves. Automatic gc and maintenance are off
+        in the cache and the refs of every clone are pinned before the branches of the remote are pruned, so objects
+        only a clone still uses stay reachable.
+
+        :param cache_dir: path of the bare object cache repository
+        :return: object of git.Repo class for the cache
+        """
+        from git_traced_repo import TracedRepo
+
+        if not cache_dir.is_dir():
+            cache_dir.parent.mkdir(parents=True, exist_ok=True)
+            TracedRepo.init(cache_dir, bare=True)
+
+        cache = TracedRepo(cache_dir)
+        # Caches created before automatic gc was turned off are updated the first time they are refreshed
+        cache_config = cache.config_reader("repository")
+        missing_config = {key: value for key, value in consts.GIT_OBJECT_CACHE_CONFIG.items() if not cache_config.has_option(*key.split("."))}
+        if missing_config:
+            with cache.config_writer() as writer:
+                for key, value in missing_config.items():
+                    writer.set_value(*key.split("."), value)
+
+        for repo_dir in self._object_cache_users(cache_dir):
+            self._pin_object_cache_refs(cache, repo_dir)
+        self._start_ssh_master(self.modified_repo_uri)
+        cache.git.fetch("--prune", self.modified_repo_uri, "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+        return cache
+
+    def _pin_object_cache_refs(self, cache, repo_dir):
+        """Fetch the refs of a clone into the cache, keeping the objects the clone borrows from the cache reachable.
+
+        :param cache: object of git.Repo class for the cache
+        :param repo_dir: path of the cloned repository
+        """
+        prefix = f"{consts.GIT_OBJECT_CACHE_PIN_PREFIX}/{repo_dir.name}"
+        cache.git.fetch("--prune", str(repo_dir), f"+refs/heads/*:{prefix}/heads/*", f"+refs/remotes/*:{prefix}/remotes/*")
+
+    def _object_cache_dirs_of(self, repo_dir):
+        """Return the shared object caches a clone borrows objects from.
+
+        :param repo_dir: path of the cloned repository
+        :return: list of object cache directories
+        """
+        cache_root = (self.app_state_dir / consts.GIT_OBJECT_CACHE_DIR).resolve()
+        alternates = repo_dir / ".git" / "objects" / "info" / "alternates"
+        try:
+            lines = alternates.read_text().splitlines()
+        except OSError:
+            return []
+
+        cache_dirs = []
+        for line in lines:
+            objects_dir = Path(line.strip()).resolve()
+            if objects_dir.parent.parent == cache_root:
+                cache_dirs.append(objects_dir.parent)
+        return cache_dirs
+
+    def _object_cache_users(self, cache_dir):
+        """Return the clones in the state directory that borrow objects from the given cache.
+
+        :param cache_dir: path of the bare object cache repository
+        :return: list of clone directories
+        """
+        cache_dir = cache_dir.resolve()
+        return [path for path in self.app_state_dir.iterdir() if path.is_dir() and cache_dir in self._object_cache_dirs_of(path)]
+
+    def _unpin_object_cache_refs(self, cache, repo_name):
+        """Remove the refs that keep the objects of a clone reachable in the cache."""
+        prefix = f"{consts.GIT_OBJECT_CACHE_PIN_PREFIX}/{repo_name}/"
+        for ref in cache.git.for_each_ref("--format=%(refname)", prefix).splitlines():
+            cache.git.update_ref("-d", ref)
+
+    def _load_repo_manifest(self):
+        """Load the manifest of cloned repositories kept in the state directory."""
+        try:
+            manifest = json.loads((self.app_state_dir / consts.GIT_REPO_MANIFEST_DIR / consts.GIT_REPO_MANIFEST).read_text())
+            if not isinstance(manifest, dict):
+                raise ValueError
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault("repos", {})
+        if not isinstance(manifest.get("ignored"), dict):
+            manifest["ignored"] = {}
+        return manifest
+
+    @contextmanager
+    def _repo_manifest_lock(self):
+        """Hold the lock serializing the updates of the manifest across the actions of the asset."""
+        lock_path = self.app_state_dir / consts.GIT_REPO_MANIFEST_DIR / consts.GIT_REPO_MANIFEST_LOCK
+        lock_path.parent.mkdir(exist_ok=True)
+        with lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _save_repo_manifest(self, manifest):
+        """Save the manifest along with the modification time of the state directory it describes.
+
+        Must be called with the manifest lock held. The manifest is written to a temporary file and renamed over the
+        previous one, so concurrent actions never read a partial manifest. It lives in a subdirectory, so the rename does
+        not change the modification time of the state directory.
+        """
+        manifest_path = self.app_state_dir / consts.GIT_REPO_MANIFEST_DIR / consts.GIT_REPO_MANIFEST
+        tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}")
+        try:
+            # Earlier versions kept the manifest in the state directory itself
+            (self.app_state_dir / consts.GIT_REPO_MANIFEST).unlink(missing_ok=True)
+            manifest["state_dir_mtime"] = self.app_state_dir.stat().st_mtime_ns
+            tmp_path.write_text(json.dumps(manifest))
+            tmp_path.replace(manifest_path)
+        except OSError as e:
+            self.debug_print(f"Unable to save the repo manifest: {e!s}")
+            tmp_path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _edit_repo_manifest(self):
+        """Yield the reconciled manifest for changes, saving it afterwards if it changed, while holding the manifest lock."""
+        with self._repo_manifest_lock():
+            manifest = self._reconcile_repo_manifest()
+            saved = json.dumps(manifest)
+            yield manifest
+            if json.dumps(manifest) != saved:
+                self._save_repo_manifest(manifest)
+
+    def _update_repo_manifest(self, repo_name, **repo_info):
+        """Record a cloned repository, or update what is known about it, in the manifest."""
+        with self._edit_repo_manifest() as manifest:
+            repo_entry = manifest["repos"].setdefault(repo_name, {"repo_dir": str(self.app_state_dir / repo_name)})
+            repo_entry.update(repo_info)
+            manifest["ignored"].pop(repo_name, None)
+
+    def _remove_from_repo_manifest(self, repo_name):
+        """Forget a deleted repository in the manifest."""
+        with self._edit_repo_manifest() as manifest:
+            manifest["repos"].pop(repo_name, None)
+
+    def _sync_repo_manifest(self):
+        """Return the manifest of cloned repositories, reconciling it with the state directory if it changed."""
+        manifest = self._load_repo_manifest()
+        if manifest.get("state_dir_mtime") == self.app_state_dir.stat().st_mtime_ns:
+            return manifest
+        with self._repo_manifest_lock():
+            return self._reconcile_repo_manifest()
+
+    def _reconcile_repo_manifest(self):
+        """Load the manifest and reconcile it with the state directory if it changed. Called with the manifest lock held.
+
+        When the state directory was modified since the manifest was saved, only directories the manifest does not know
+        about yet are opened as git repositories, and entries for removed directories are dropped. Directories that are
+        not repositories are remembered along with their modification time and opened again once it changes, as a clone
+        may still have been in progress.
+        """
+        manifest = self._load_repo_manifest()
+        if manifest.get("state_dir_mtime") == self.app_state_dir.stat().st_mtime_ns:
+            return manifest
+
+        self.debug_print("State directory changed, reconciling the repo manifest")
+        subdirectories = {p.name: p for p in self.app_state_dir.iterdir() if p.is_dir()}
+        repos = {name: info for name, info in manifest["repos"].items() if name in subdirectories}
+        ignored = {}
+
+        import git
+
+        from git_traced_repo import TracedRepo
+
+        for name, path in subdirectories.items():
+            if name in repos:
+                continue
+            mtime = path.stat().st_mtime_ns
+            if manifest["ignored"].get(name) == mtime:
+                ignored[name] = mtime
+                continue
+            try:
+                repo = TracedRepo(path)
+            except git.exc.InvalidGitRepositoryError:
+                ignored[name] = mtime
+                continue
+
+            repo_info = {"repo_dir": str(repo.working_tree_dir or repo.git_dir)}
+            try:
+                repo_info["remote_url"] = self._clean_remote_url(repo.remotes.origin.url)
+                repo_info["branch"] = repo.active_branch.name
+            except Exception as e:
+                self.debug_print(f"Unable to read the remote of {name}: {e!s}")
+            repos[name] = repo_info
+
+        manifest["repos"] = repos
+        manifest["ignored"] = ignored
+        self._save_repo_manifest(manifest)
+        return manifest
+
+    def _record_repo_access(self, repo_names):
+        """Record in the manifest that the given repositories were used by the current action.
+
+        An access time is only written again once it is GIT_REPO_ACCESS_INTERVAL seconds old, so most actions leave the
+        manifest alone.
+        """
+
+        def is_stale(repo_info):
+            elapsed = self._seconds_since(repo_info.get("last_access"))
+            return elapsed is None or not 0 <= elapsed < consts.GIT_REPO_ACCESS_INTERVAL
+
+        repos = self._load_repo_manifest()["repos"]
+        if not any(name in repos and is_stale(repos[name]) for name in repo_names):
+            return
+        with self._edit_repo_manifest() as manifest:
+            now = self._utc_now()
+            for name in repo_names:
+                if name in manifest["repos"] and is_stale(manifest["repos"][name]):
+                    manifest["repos"][name]["last_access"] = now
+
+    @staticmethod
+    def _disk_usage(path):
+        """Return the disk space used by the files under a directory in bytes, without following symlinks."""
+        usage = 0
+        for dir_path, _, file_names in os.walk(path):
+            for file_name in file_names:
+                try:
+                    usage += os.lstat(os.path.join(dir_path, file_name)).st_blocks * 512
+                except OSError:
+                    pass
+        return usage
+
+    def _repo_usage(self):
+        """Return the manifest entries of the cloned repositories with their size on disk.
+
+        Sizes are kept in the manifest and only measured again for clones that were used or synced since.
+        """
+        manifest = self._sync_repo_manifest()
+        measured = {}
+        for name, repo_info in manifest["repos"].items():
+            changed_at = max(repo_info.get("last_access") or "", repo_info.get("last_sync") or "")
+            if "size" not in repo_info or changed_at >= repo_info.get("size_measured_at", ""):
+                measured[name] = {"size_measured_at": self._utc_now(), "size": self._disk_usage(repo_info["repo_dir"])}
+        # Clones are measured without the lock, which is only held to record the sizes
+        if measured:
+            with self._edit_repo_manifest() as manifest:
+                for name, size_info in measured.items():
+                    if name in manifest["repos"]:
+                        manifest["repos"][name].update(size_info)
+        return {name: info for name, info in manifest["repos"].items() if name != self.get_app_id()}
+
+    def _eviction_blocker(self, repo_dir):
+        """Return why a clone must not be evicted, or None if it holds nothing that only exists locally."""
+        import git
+
+        from git_traced_repo import TracedRepo
+
+        try:
+            repo = TracedRepo(repo_dir)
+        except Exception as e:
+            return f"cannot be opened: {e!s}"
+        try:
+            # Mirrors only hold copies of the remote branches
+            if repo.bare:
+                return None
+            # A fetch-only clone is never checked out, without an index every tracked file would look deleted
+            if (Path(repo.git_dir) / "index").is_file() and repo.git.status("--porcelain"):
+                return "has local changes"
+            if repo.git.rev_list("--branches", "--not", "--remotes", "-n", "1"):
+                return "has unpushed commits"
+        except git.exc.GitCommandError as e:
+            return f"cannot be inspected: {e!s}"
+        finally:
+            repo.close()
+        return None
+
+    def _enforce_disk_quota(self, keep=()):
+        """Evict the least recently used clones until the clones fit in the disk quota of the asset.
+
+        Clones with local changes or unpushed commits, and clones another action is working on, are never evicted.
+
+        :param keep: names of the repositories that must not be evicted
+        :return: list of evicted repository names
+        """
+        disk_quota = self.config.get(consts.GIT_CONFIG_DISK_QUOTA)
+        if not isinstance(disk_quota, (int, float)) or disk_quota <= 0:
+            return []
+        quota = int(disk_quota * 1024 * 1024)
+
+        usage = self._repo_usage()
+        total_size = sum(info["size"] for info in usage.values())
+        evicted_repos = []
+        # Clones never used by an action since they were recorded count as used when they were last synced
+        for name, repo_info in sorted(usage.items(), key=lambda item: item[1].get("last_access") or item[1].get("last_sync") or ""):
+            if total_size <= quota:
+                break
+            if name in keep:
+                continue
+
+            lock = self._repo_lock(name, timeout=0)
+            try:
+                lock.acquire()
+            except RepoLockTimeout:
+                self.debug_print(f"Not evicting {name}, another action is using it")
+                continue
+            try:
+                blocker = self._eviction_blocker(Path(repo_info["repo_dir"]))
+                if blocker:
+                    self.debug_print(f"Not evicting {name}, it {blocker}")
+                    continue
+                self._remove_clone(Path(repo_info["repo_dir"]), keep_state=True)
+            finally:
+                lock.release()
+
+            self.debug_print(f"Evicted {name} ({repo_info['size']} bytes) to stay within the disk quota")
+            total_size -= repo_info["size"]
+            evicted_repos.append(name)
+
+        if total_size > quota:
+            self.debug_print(f"Clones use {total_size} bytes, above the disk quota of {quota} bytes, and none can be evicted")
+        return evicted_repos
+
+    def _get_disk_usage(self, param):
+        """Function reports the disk usage and last access time of every clone, and the disk quota of the asset.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        evicted_repos = []
+        if str(param.get("enforce_quota", False)).lower() == "true":
+            evicted_repos = self._enforce_disk_quota()
+
+        usage = self._repo_usage()
+        for name, repo_info in sorted(usage.items(), key=lambda item: item[1]["size"], reverse=True):
+            action_result.add_data(
+                {
+                    "repo_name": name,
+                    "repo_dir": repo_info["repo_dir"],
+                    "size": repo_info["size"],
+                    "last_access": repo_info.get("last_access"),
+                    "last_sync": repo_info.get("last_sync"),
+                    "remote_url": repo_info.get("remote_url"),
+                    "branch": repo_info.get("branch"),
+                }
+            )
+
+        disk_quota = self.config.get(consts.GIT_CONFIG_DISK_QUOTA) or 0
+        action_result.update_summary(
+            {
+                "total_repos": len(usage),
+                "total_size": sum(info["size"] for info in usage.values()),
+                "disk_quota": int(disk_quota * 1024 * 1024) if isinstance(disk_quota, (int, float)) else 0,
+                "evicted_repos": evicted_repos,
+            }
+        )
+        return action_result.set_status(phantom.APP_SUCCESS)
+
     def _list_repos(self, param):
         """Function lists the git repos configured/pulled.
 
@@ -185,34 +837,29 @@ class GitConnector(BaseConnector):
         action_result = self.add_action_result(ActionResult(dict(param)))
         summary_data = action_result.update_summary({})
 
-        repo_list = set()
-        repo_dirs = []
-
-        # Iterate over each sub-directory in the app_state_dir to check for git repos
-        subdirectories = [p for p in self.app_state_dir.iterdir() if p.is_dir()]
-        self.debug_print("Iterating through subdirectories")
-        for path in subdirectories:
-            try:
-                # returns absolute path if it is a git repo otherwise throws an exception
-                repo_dir = Path(git.Repo(path).git_dir).parent
-
-                if repo_dir.name not in repo_list:
-                    repo_list.add(repo_dir.name)
-                    repo_dirs.append(str(repo_dir))
-            except git.exc.InvalidGitRepositoryError:
-                continue
+        manifest = self._sync_repo_manifest()
+        repos = manifest["repos"]
+        repo_list = sorted(name for name in repos if name != self.get_app_id())
+        repo_dirs = [repos[name]["repo_dir"] for name in repo_list]
 
-        appid = self.get_app_id()
-        if appid in repo_list:
-            repo_list.remove(appid)
-        for repo_dir in repo_dirs:
-            if repo_dir.endswith(appid):
-                repo_dirs.remove(repo_dir)
-                break
+        object_caches = []
+        cache_root = self.app_state_dir / consts.GIT_OBJECT_CACHE_DIR
+        if cache_root.is_dir():
+            for cache_dir in sorted(p for p in cache_root.iterdir() if p.is_dir()):
+                users = self._object_cache_users(cache_dir)
+                object_caches.append({"cache_dir": str(cache_dir), "repos": [user.name for user in users]})
 
-        action_result.add_data({"repos": list(repo_list), "repo_dirs": repo_dirs})
+        action_result.add_data(
+            {
+                "repos": repo_list,
+                "repo_dirs": repo_dirs,
+                "repo_details": [dict(repos[name], repo_name=name) for name in repo_list],
+                "object_caches": object_caches,
+            }
+        )
 
         summary_data["total_repos"] = len(repo_list)
+        summary_data["total_object_caches"] = len(object_caches)
         self.debug_print("Total repositories: {}".format(str(summary_data["total_repos"])))
 
         return action_result.set_status(phantom.APP_SUCCESS)
@@ -220,8 +867,7 @@ class GitConnector(BaseConnector):
     def _get_current_branch_name_from_repo(self, repo):
         """Return currently checked-out ref name, or None if unavailable."""
         try:
-            current_branch = repo.git.rev_parse("--abbrev-ref", "HEAD").strip()
-            return current_branch or None
+            return RepoQuery(repo).branch_name() or None
         except Exception:
             return None
 
@@ -237,6 +883,22 @@ class GitConnector(BaseConnector):
             raise ValueError("Repo path must be inside the connector state directory")
         return repo_dir
 
+    def _repo_lock(self, repo_name, timeout=None):
+        """Return the lock serializing the actions that modify the given repo across all actions of the asset.
+
+        :param timeout: seconds to wait for the lock, the lock timeout of the asset if None
+        """
+
+        def remove_stale_git_locks():
+            # The previous holder was killed, so nothing is using the index lock it may have left behind
+            index_lock = self.app_state_dir / repo_name / ".git" / "index.lock"
+            if index_lock.is_file():
+                self.debug_print(f"Removing stale lock {index_lock}")
+                index_lock.unlink(missing_ok=True)
+
+        timeout = self.lock_timeout if timeout is None else timeout
+        return RepoLock(self.app_state_dir / consts.GIT_LOCK_DIR, repo_name, timeout, on_stale=remove_stale_git_locks)
+
     def verify_repo(self, repo_name, action_result):
         """Function checks that directory for given repo exists and it is valid git repo.
 
@@ -252,8 +914,16 @@ class GitConnector(BaseConnector):
             message = "You must provide valid repo URI."
             return action_result.set_status(phantom.APP_ERROR, message), repo_name
 
+        # Reuse the repo, and with it the long-lived `git cat-file` processes of its object database, across actions
+        if repo_dir in self._repos:
+            return phantom.APP_SUCCESS, self._repos[repo_dir]
+
+        import git
+
+        from git_traced_repo import TracedRepo
+
         try:
-            repo = git.Repo(repo_dir)
+            repo = TracedRepo(repo_dir)
 
         except git.exc.InvalidGitRepositoryError as e:
             self.debug_print(e)
@@ -270,72 +940,124 @@ class GitConnector(BaseConnector):
             message = f"Error while verifying the repo: {e!s}"
             return action_result.set_status(phantom.APP_ERROR, message), repo_name
 
+        self._repos[repo_dir] = repo
         return phantom.APP_SUCCESS, repo
 
-    def _file_interaction(self, action_result, action, file_path, contents="", vault_id=None):
-        vault_file_data = None
-
-        # verify that directory exists and it is valid git repo
-        resp_status, repo = self.verify_repo(self.repo_name, action_result)
-        if phantom.is_fail(resp_status):
-            return action_result.get_status()
+    def _validate_file_action(self, repo_dir, action, file_path):
+        """Check that a file action can be applied to the given path of the repository.
 
-        repo_dir = self._repo_dir()
+        :param repo_dir: path of the cloned repository
+        :param action: one of add, update or delete
+        :param file_path: path of the file relative to the repository
+        :return: error message, or None if the action can be applied
+        """
         full_path = repo_dir / file_path
         if not full_path.resolve().is_relative_to(repo_dir):
-            message = "Path outside git repository"
-            return action_result.set_status(phantom.APP_ERROR, message)
+            return "Path outside git repository"
 
         try:
             if full_path.exists() and action == "add":
-                message = f"File '{file_path}' already exists in the local repository"
-                return action_result.set_status(phantom.APP_ERROR, message)
+                return f"File '{file_path}' already exists in the local repository"
 
             if not full_path.exists() and action in ["update", "delete"]:
-                message = f"File '{file_path}' is not present in the local repository"
-                return action_result.set_status(phantom.APP_ERROR, message)
+                return f"File '{file_path}' is not present in the local repository"
         except OSError as ex:
             ex = str(ex)
             if "File name too long" in ex:
-                return action_result.set_status(phantom.APP_ERROR, "File name too long")
-            else:
-                return action_result.set_status(phantom.APP_ERROR, ex)
+                return "File name too long"
+            return ex
         except Exception as e:
-            return action_result.set_status(phantom.APP_ERROR, str(e))
+            return str(e)
 
-        if action in ["update", "add"]:
-            if vault_id:
-                try:
-                    status, message, vault_file_info = phantom_rules.vault_info(vault_id=vault_id, container_id=self.get_container_id())
-                except Exception as e:
-                    self.debug_print(f"Exception : {e}")
-                    return action_result.set_status(phantom.APP_ERROR)
+        return None
 
-                if not status:
-                    self.debug_print(f"Unable to get vault_info: {message}")
-                    return action_result.set_status(phantom.APP_ERROR, f"Unable to get vault_info: {message}")
+    def _get_file_data(self, contents="", vault_id=None):
+        """Return the source of a file: the path of the vault file, or the unescaped bytes of the given contents.
 
-                try:
-                    vault_file_path = Path(next(iter(vault_file_info)).get("path"))
-                    vault_file_data = vault_file_path.read_bytes()
-                except Exception as e:
-                    self.debug_print(f"Exception : {e}")
-                    return action_result.set_status(phantom.APP_ERROR)
+        Vault files are returned as a path so they can be copied into the repository without being read into memory.
+
+        :param contents: textual contents of the file
+        :param vault_id: vault ID of the file, takes precedence over contents
+        :return: status success/failure, error message, vault file path or file data
+        """
+        if vault_id:
+            import phantom.rules as phantom_rules
 
-            file_data = vault_file_data if vault_file_data else contents
-            # try to unescape escaped strings, if it can
             try:
-                file_data = ast.literal_eval(f'"{file_data}"')
-                file_data = file_data.encode()
-            except Exception:
+                status, message, vault_file_info = phantom_rules.vault_info(vault_id=vault_id, container_id=self.get_container_id())
+            except Exception as e:
+                self.debug_print(f"Exception : {e}")
+                return phantom.APP_ERROR, f"Unable to get vault_info: {e!s}", None
+
+            if not status:
+                self.debug_print(f"Unable to get vault_info: {message}")
+                return phantom.APP_ERROR, f"Unable to get vault_info: {message}", None
+
+            try:
+                vault_file_path = Path(next(iter(vault_file_info)).get("path"))
+                if not vault_file_path.is_file():
+                    raise FileNotFoundError(f"No such file: '{vault_file_path}'")
+            except Exception as e:
+                self.debug_print(f"Exception : {e}")
+                return phantom.APP_ERROR, f"Unable to read the vault file: {e!s}", None
+
+            return phantom.APP_SUCCESS, None, vault_file_path
+
+        contents = contents or ""
+        # try to unescape escaped strings, if it can
+        try:
+            file_data = ast.literal_eval(f'"{contents}"').encode()
+        except Exception:
+            file_data = contents.encode()
+
+        return phantom.APP_SUCCESS, None, file_data
+
+    def _copy_file(self, source_path, full_path):
+        """Copy a file into the working tree with bounded memory use.
+
+        A copy-on-write clone of the data is used where the filesystem supports it, otherwise the data is copied in
+        chunks.
+        """
+        with source_path.open("rb") as source, full_path.open("wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), consts.GIT_FICLONE, source.fileno())
+                return
+            except OSError:
                 pass
+            copyfileobj(source, target, consts.GIT_COPY_CHUNK_SIZE)
 
-            # create any missing parent directories
-            full_path.parent.mkdir(parents=True, exist_ok=True)
+    def _write_file(self, full_path, file_data):
+        """Write the file into the working tree, creating any missing parent directories.
 
-            # overwrite file into local disk
+        :param full_path: path of the file in the working tree
+        :param file_data: bytes to write, or path of a vault file to copy
+        """
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(file_data, Path):
+            self._copy_file(file_data, full_path)
+        else:
             full_path.write_bytes(file_data)
 
+    def _file_interaction(self, action_result, action, file_path, contents="", vault_id=None):
+        # verify that directory exists and it is valid git repo
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        repo_dir = self._repo_dir()
+        full_path = repo_dir / file_path
+        message = self._validate_file_action(repo_dir, action, file_path)
+        if message:
+            return action_result.set_status(phantom.APP_ERROR, message)
+
+        if action in ["update", "add"]:
+            status, message, file_data = self._get_file_data(contents, vault_id)
+            if phantom.is_fail(status):
+                return action_result.set_status(phantom.APP_ERROR, message)
+
+            # overwrite file into local disk
+            self._write_file(full_path, file_data)
+
             # add into index
             repo.index.add(file_path)
 
@@ -360,6 +1082,102 @@ class GitConnector(BaseConnector):
 
         return action_result.set_status(phantom.APP_SUCCESS, status_message=message)
 
+    def _write_files(self, param):
+        """Function adds, updates and deletes multiple files in local repository and updates the index once.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+
+        try:
+            files = json.loads(param["files"])
+            if not isinstance(files, list) or not all(isinstance(entry, dict) for entry in files):
+                raise ValueError
+        except Exception:
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_FILES_PARAM_MSG)
+
+        # verify that directory exists and it is valid git repo
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        repo_dir = self._repo_dir()
+        index = repo.index
+        # Last operation applied to each path, staged together once every file is written
+        staged_ops = {}
+        failed = 0
+
+        for entry in files:
+            file_path = str(entry.get("path") or "").strip().strip("/")
+            op = str(entry.get("op") or "update").strip().lower()
+            result = {"file_path": file_path, "op": op, "status": "failed"}
+            action_result.add_data(result)
+
+            if not file_path:
+                message = "File path is required"
+            elif op not in consts.GIT_FILE_OPERATIONS:
+                message = consts.GIT_INVALID_FILE_OP_MSG.format(", ".join(consts.GIT_FILE_OPERATIONS))
+            else:
+                message = self._validate_file_action(repo_dir, op, file_path)
+
+            if not message:
+                full_path = repo_dir / file_path
+                try:
+                    if op == "delete":
+                        full_path.unlink()
+                        staged_ops[file_path] = op
+                    else:
+                        status, message, file_data = self._get_file_data(entry.get("contents", ""), entry.get("vault_id"))
+                        if phantom.is_success(status):
+                            self._write_file(full_path, file_data)
+                            staged_ops[file_path] = op
+                except Exception as e:
+                    message = f"Unable to {op} file: {e!s}"
+
+            if message:
+                failed += 1
+                result["message"] = message
+                continue
+
+            result["status"] = "success"
+            result["message"] = "File '{}' {}ed successfully".format(file_path, op.rstrip("e"))
+
+        # Stage every change with a single read and write of the index
+        added_paths = [file_path for file_path, op in staged_ops.items() if op != "delete"]
+        try:
+            if added_paths:
+                index.add(added_paths, write=False)
+            for file_path, op in staged_ops.items():
+                if op == "delete":
+                    index.entries.pop(index.entry_key(file_path, 0), None)
+            if staged_ops:
+                # The cached tree extension no longer matches the entries, drop it like index.add does
+                index.write(ignore_extension_data=True)
+        except Exception as e:
+            self.debug_print(e)
+            # The files are written to the working tree but none of them is staged
+            message = f"Error while updating the index: {e!s}"
+            for result in action_result.get_data():
+                if result["status"] == "success":
+                    result.update(status="failed", message=message)
+            action_result.update_summary(
+                {"repo_name": self.repo_name, "repo_dir": str(repo_dir), "total_files": len(files), "successful": 0, "failed": len(files)}
+            )
+            return action_result.set_status(phantom.APP_ERROR, message)
+
+        succeeded = len(files) - failed
+        action_result.update_summary(
+            {"repo_name": self.repo_name, "repo_dir": str(repo_dir), "total_files": len(files), "successful": succeeded, "failed": failed}
+        )
+
+        if files and not succeeded:
+            return action_result.set_status(phantom.APP_ERROR, "None of the files could be written")
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"{succeeded} of {len(files)} files written successfully")
+
     def _update_file(self, param):
         """Function updates the file content in local repository and updates the index.
 
@@ -409,7 +1227,48 @@ class GitConnector(BaseConnector):
 
         return self._file_interaction(action_result, "add", file_path, contents, vault_id)
 
-    def push(self, repo, action_result, remote=None, remote_branch=None, set_upstream: bool = False):
+    def _push_once(self, repo, remote=None, remote_branch=None, set_upstream: bool = False, local_branch=None):
+        """Run a single git push, raising on failure. See push for the parameters."""
+        if local_branch:
+            repo.git.push(remote or "origin", f"refs/heads/{local_branch}:refs/heads/{remote_branch or local_branch}")
+        elif not set_upstream:
+            repo.git.push()
+        else:
+            local_branch = RepoQuery(repo).branch_name()
+            repo.git.push("-u", remote or "origin", f"{local_branch}:{remote_branch or local_branch}")
+
+    def _rebase_onto_remote(self, repo, remote=None, remote_branch=None):
+        """Fetch the remote branch and rebase the checked-out branch onto it, fast-forwarding when there is nothing to replay.
+
+        :return: error message, or None on success
+        """
+        try:
+            if remote or remote_branch:
+                repo.git.pull("--rebase", remote or "origin", remote_branch or RepoQuery(repo).branch_name())
+            else:
+                repo.git.pull("--rebase")
+        except Exception as e:
+            self.debug_print(e)
+            try:
+                repo.git.rebase("--abort")
+            except Exception:
+                pass
+            return f"Unable to rebase the local commits onto the remote branch: {e!s}"
+        return None
+
+    def _get_push_retries(self, action_result, param):
+        """Return the number of times a rejected push is retried, 0 unless retry_on_reject is enabled.
+
+        :return: status success/failure, number of retries
+        """
+        if str(param.get("retry_on_reject", False)).lower() != "true":
+            return phantom.APP_SUCCESS, 0
+        status, max_retries = self._validate_integer(action_result, param.get("max_retries"), "max_retries", allow_zero=True)
+        return status, consts.GIT_PUSH_DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+
+    def push(
+        self, repo, action_result, remote=None, remote_branch=None, set_upstream: bool = False, local_branch=None, max_retries=0, rebase=None
+    ):
         """Push git local git repo into remote repository.
 
         :param repo: Repo name to push
@@ -417,37 +1276,51 @@ class GitConnector(BaseConnector):
         :param remote: name of remote and required if set_upstream=True e.g. origin
         :param remote_branch: name of remote branch and required if set_upstream=True e.g. my-branch
         :param set_upstream: boolean to set upstream
+        :param local_branch: name of the local branch to push instead of the checked-out branch
+        :param max_retries: number of times a push rejected as non-fast-forward is retried after rebasing onto the remote
+        :param rebase: function(repo, remote, remote_branch) replaying the local commits onto the remote branch and returning
+            an error message or None, defaults to a rebase of the checked-out branch
         :return: status success/failure
         """
+        if set_upstream and not local_branch and RepoQuery(repo).branch_name() == "HEAD":
+            return action_result.set_status(
+                phantom.APP_ERROR,
+                status_message=consts.GIT_SET_UPSTREAM_DETACHED_HEAD_MSG,
+            )
 
-        try:
-            if not set_upstream:
-                repo.git.push()
-                return phantom.APP_SUCCESS
-            else:
-                remote = remote or "origin"  # Default remote name
-                local_branch = repo.git.rev_parse("--abbrev-ref", "HEAD").strip()
-                if local_branch == "HEAD":
-                    return action_result.set_status(
-                        phantom.APP_ERROR,
-                        status_message=consts.GIT_SET_UPSTREAM_DETACHED_HEAD_MSG,
-                    )
-
-                target_remote_branch = remote_branch or local_branch
-                repo.git.push("-u", remote, f"{local_branch}:{target_remote_branch}")
-                return phantom.APP_SUCCESS
+        rebase = rebase or self._rebase_onto_remote
+        self._start_ssh_master(self._remote_url(repo, remote))
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._push_once(repo, remote, remote_branch, set_upstream, local_branch)
+                break
+            except Exception as e:
+                self.debug_print(e)
+                rejected = any(reason in str(e) for reason in consts.GIT_PUSH_REJECTED_REASONS)
+                if rejected and attempt <= max_retries:
+                    # Full jitter keeps concurrent writers from retrying in lockstep
+                    delay = min(consts.GIT_PUSH_RETRY_MAX_DELAY, consts.GIT_PUSH_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    time.sleep(random.uniform(0, delay))
+                    self.save_progress(f"Push rejected, rebasing onto the remote branch and retrying (attempt {attempt + 1})")
+                    message = rebase(repo, remote, remote_branch)
+                    if not message:
+                        continue
+                else:
+                    message = f"Error while pushing the repository to remote server: {e!s}"
 
-        except Exception as e:
-            self.debug_print(e)
-            message = f"Error while pushing the repository to remote server: {e!s}"
+                    if "You may want to first integrate the remote changes" in str(e):
+                        message = "Latest changes are not available in local repo. You may want to do a git pull first before pushing again."
 
-            if "You may want to first integrate the remote changes" in str(e):
-                message = "Latest changes are not available in local repo. You may want to do a git pull first before pushing again."
+                    if "Invalid username or password" in str(e):
+                        message = "Authentication failed"
 
-            if "Invalid username or password" in str(e):
-                message = "Authentication failed"
+                action_result.update_summary({"push_attempts": attempt})
+                return action_result.set_status(phantom.APP_ERROR, status_message=message)
 
-            return action_result.set_status(phantom.APP_ERROR, status_message=message)
+        action_result.update_summary({"push_attempts": attempt})
+        return phantom.APP_SUCCESS
 
     def _git_commit(self, param):
         """Function commits the repo.
@@ -461,6 +1334,10 @@ class GitConnector(BaseConnector):
         commit_message = param["message"]
         push = param.get("push", False)
 
+        status, max_retries = self._get_push_retries(action_result, param)
+        if phantom.is_fail(status):
+            return action_result.get_status()
+
         resp_status, repo = self.verify_repo(self.repo_name, action_result)
 
         if phantom.is_fail(resp_status):
@@ -470,10 +1347,13 @@ class GitConnector(BaseConnector):
         if any(character in commit_identity for character in ("\n", "\r", "\0", "[")):
             return action_result.set_status(phantom.APP_ERROR, "Username contains characters that are unsafe for Git configuration")
 
-        # config local user for commit
-        with repo.config_writer() as writer:
-            writer.set_value("user", "name", commit_identity)
-            writer.set_value("user", "email", commit_identity)
+        # config local user for commit, rewriting the config file only when the identity changed
+        with repo.config_reader("repository") as reader:
+            configured_identity = (reader.get_value("user", "name", ""), reader.get_value("user", "email", ""))
+        if configured_identity != (commit_identity, commit_identity):
+            with repo.config_writer() as writer:
+                writer.set_value("user", "name", commit_identity)
+                writer.set_value("user", "email", commit_identity)
 
         try:
             repo.git.commit(m=commit_message)
@@ -487,7 +1367,7 @@ class GitConnector(BaseConnector):
             return action_result.set_status(phantom.APP_ERROR, message)
 
         if str(push).lower() == "true":
-            response = self.push(repo, action_result)
+            response = self.push(repo, action_result, max_retries=max_retries)
 
             if phantom.is_fail(response):
                 return action_result.get_status()
@@ -506,8 +1386,188 @@ class GitConnector(BaseConnector):
 
         return action_result.set_status(phantom.APP_SUCCESS, status_message=message)
 
-    def _git_push(self, param):
-        """Function pushes local repository into remote repository.
+    def _commit_files(self, param):
+        """Function commits a batch of file changes straight to a branch, without touching the working tree or the index
+        unless the branch is checked out.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+        commit_message = param["message"]
+        push = str(param.get("push", False)).lower() == "true"
+
+        try:
+            files = json.loads(param["files"])
+            if not isinstance(files, list) or not all(isinstance(entry, dict) for entry in files):
+                raise ValueError
+        except Exception:
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_FILES_PARAM_MSG)
+
+        status, max_retries = self._get_push_retries(action_result, param)
+        if phantom.is_fail(status):
+            return action_result.get_status()
+
+        commit_identity = self.username if self.username else "default"
+        author_name = param.get("author_name") or commit_identity
+        author_email = param.get("author_email") or commit_identity
+        if any(character in f"{author_name}{author_email}" for character in ("\n", "\r", "\0", "<", ">")):
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_COMMIT_IDENTITY_MSG)
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        query = RepoQuery(repo)
+        checked_out_branch = query.branch_name()
+        branch = param.get("branch") or checked_out_branch
+        if not branch or branch == "HEAD":
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_COMMIT_FILES_DETACHED_HEAD_MSG)
+
+        branch_sha = query.branch_sha(branch)
+        parent_ref = param.get("parent")
+        try:
+            if parent_ref:
+                parent = repo.commit(parent_ref)
+            else:
+                parent = repo.commit(branch_sha) if branch_sha else None
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Unable to resolve the parent commit: {e!s}")
+
+        # Committing on a parent that does not contain the branch tip would drop the commits in between from the branch
+        if parent_ref and branch_sha and not repo.is_ancestor(branch_sha, parent.hexsha):
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_COMMIT_FILES_PARENT_MSG.format(branch=branch))
+
+        from git_commit_builder import CommitBuilder
+
+        builder = CommitBuilder(repo, parent)
+        committed = []
+        failed = 0
+
+        for entry in files:
+            file_path = str(entry.get("path") or "").strip().strip("/")
+            op = str(entry.get("op") or "update").strip().lower()
+            result = {"file_path": file_path, "op": op, "status": "failed"}
+            action_result.add_data(result)
+
+            message = None
+            if not file_path:
+                message = "File path is required"
+            elif any(part in ("", ".", "..", ".git") for part in file_path.split("/")):
+                message = "Invalid file path"
+            elif op not in consts.GIT_FILE_OPERATIONS:
+                message = consts.GIT_INVALID_FILE_OP_MSG.format(", ".join(consts.GIT_FILE_OPERATIONS))
+            elif op == "add" and builder.exists(file_path):
+                message = f"File '{file_path}' already exists in the parent commit"
+            elif op in ["update", "delete"] and not builder.exists(file_path):
+                message = f"File '{file_path}' is not present in the parent commit"
+            elif op != "delete" and (conflict := builder.conflict(file_path)):
+                kind = "a directory" if conflict == file_path else "a file"
+                message = f"File '{file_path}' cannot be written, '{conflict}' is {kind} in the parent commit or the batch"
+
+            if not message:
+                try:
+                    if op == "delete":
+                        builder.remove(file_path)
+                    else:
+                        status, message, file_data = self._get_file_data(entry.get("contents", ""), entry.get("vault_id"))
+                        if phantom.is_success(status):
+                            builder.add(file_path, file_data)
+                except Exception as e:
+                    message = f"Unable to {op} file: {e!s}"
+
+            if message:
+                failed += 1
+                result["message"] = message
+                continue
+
+            result["status"] = "success"
+            result["message"] = "File '{}' {}ed successfully".format(file_path, op.rstrip("e"))
+            committed.append(result)
+
+        succeeded = len(files) - failed
+        action_result.update_summary({"total_files": len(files), "successful": succeeded, "failed": failed})
+        if files and not succeeded:
+            return action_result.set_status(phantom.APP_ERROR, "None of the files could be committed")
+
+        import git
+
+        actor = git.Actor(author_name, author_email)
+        try:
+            commit = builder.commit(commit_message, actor)
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Error while committing the files: {e!s}")
+
+        if commit is None:
+            return action_result.set_status(phantom.APP_ERROR, "Nothing to commit, the files match the parent commit.")
+
+        try:
+            if branch == checked_out_branch:
+                # Carry the working tree and the index along, like a fast-forward; fails if local changes are in the way
+                repo.git.read_tree("-m", "-u", branch_sha or commit.hexsha, commit.hexsha)
+            # Only move the branch if nobody else moved it in the meantime
+            repo.git.update_ref("-m", f"commit files: {commit.summary}", f"refs/heads/{branch}", commit.hexsha, branch_sha or "0" * 40)
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Error while updating branch '{branch}': {e!s}")
+
+        def recommit_onto_remote(repo, remote, remote_branch):
+            # The blobs are already in the object database, so replaying the changes onto the new tip only rewrites trees
+            nonlocal commit, replayed, succeeded, failed
+            try:
+                repo.git.fetch(remote or "origin", f"refs/heads/{remote_branch or branch}")
+                remote_tip = repo.commit("FETCH_HEAD")
+                if replayed.parent and not repo.is_ancestor(replayed.parent, remote_tip):
+                    return "The branch has other local commits that are not on the remote branch, please pull before pushing"
+                # Files may have been added, changed or deleted on the remote branch since, check every change again
+                replayed = CommitBuilder(repo, remote_tip)
+                for result in committed:
+                    file_path, op = result["file_path"], result["op"]
+                    if result["status"] == "success":
+                        if op == "add" and replayed.exists(file_path):
+                            result["message"] = f"File '{file_path}' was added on the remote branch in the meantime"
+                        elif op in ["update", "delete"] and not replayed.exists(file_path):
+                            result["message"] = f"File '{file_path}' was deleted on the remote branch in the meantime"
+                        elif op != "delete" and replayed.conflict(file_path):
+                            result["message"] = f"File '{file_path}' conflicts with a path changed on the remote branch in the meantime"
+                        else:
+                            replayed.changes[file_path] = builder.changes[file_path]
+                            continue
+                        result["status"] = "failed"
+                        succeeded -= 1
+                        failed += 1
+                action_result.update_summary({"successful": succeeded, "failed": failed})
+                if not succeeded:
+                    return "None of the files could be committed onto the remote branch"
+                new_commit = replayed.commit(commit_message, actor) or replayed.parent
+                if branch == checked_out_branch:
+                    repo.git.read_tree("-m", "-u", commit.hexsha, new_commit.hexsha)
+                repo.git.update_ref("-m", f"commit files: {commit.summary}", f"refs/heads/{branch}", new_commit.hexsha, commit.hexsha)
+            except Exception as e:
+                self.debug_print(e)
+                return f"Unable to replay the commit onto the remote branch: {e!s}"
+            commit = new_commit
+            return None
+
+        replayed = builder
+
+        if push:
+            response = self.push(repo, action_result, local_branch=branch, max_retries=max_retries, rebase=recommit_onto_remote)
+            if phantom.is_fail(response):
+                return action_result.get_status()
+
+        action_result.update_summary(
+            {"repo_name": self.repo_name, "repo_dir": str(self._repo_dir()), "branch_name": branch, "commit_sha": commit.hexsha}
+        )
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"{succeeded} of {len(files)} files committed to branch {branch} successfully")
+
+    def _git_push(self, param):
+        """Function pushes local repository into remote repository.
 
         :param param: dictionary on input parameters
         :return: status success/failure
@@ -524,8 +1584,11 @@ class GitConnector(BaseConnector):
         remote = param.get("remote")
         remote_branch = param.get("remote_branch")
         set_upstream = str(param.get("set_upstream", False)).lower() == "true"
+        status, max_retries = self._get_push_retries(action_result, param)
+        if phantom.is_fail(status):
+            return action_result.get_status()
 
-        response = self.push(repo, action_result, remote=remote, remote_branch=remote_branch, set_upstream=set_upstream)
+        response = self.push(repo, action_result, remote=remote, remote_branch=remote_branch, set_upstream=set_upstream, max_retries=max_retries)
 
         if phantom.is_fail(response):
             return action_result.get_status()
@@ -592,6 +1655,71 @@ class GitConnector(BaseConnector):
         )
         return action_result.set_status(phantom.APP_SUCCESS, message)
 
+    @staticmethod
+    def _remaining_time(deadline):
+        """Return the seconds left until a deadline of time.monotonic(), or None when there is no deadline.
+
+        :raises TimeoutError: if the deadline has passed
+        """
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("The deadline passed before the next git command could start")
+        return remaining
+
+    def _pull_repo(self, repo, deadline=None):
+        """Pull the checked-out branch, fetching the full history of a shallow clone only when it is too short to merge.
+
+        New commits on the remote branch always connect to the shallow history, so the full history is only needed
+        once the remote branch was rewritten past the start of it. Deepening is no use then: the remote only deepens
+        the history reachable from the branches it sends. Blobs and trees missing from a partial clone are fetched on
+        demand by git itself.
+
+        :param repo: object of git.Repo class
+        :param deadline: time.monotonic() by which every git command must have finished, or None to wait indefinitely
+        :return: output of the git pull command
+        """
+        import git
+
+        self._start_ssh_master(self._remote_url(repo), deadline)
+        try:
+            return repo.git.pull(kill_after_timeout=self._remaining_time(deadline))
+        except git.exc.GitCommandError as e:
+            if not (Path(repo.git_dir) / "shallow").exists() or "unrelated histories" not in str(e):
+                raise
+        self.debug_print("Shallow history has no merge base with the remote, fetching the full history")
+        repo.git.fetch("--unshallow", kill_after_timeout=self._remaining_time(deadline))
+        return repo.git.pull(kill_after_timeout=self._remaining_time(deadline))
+
+    def _fetch_polled_repo(self, action_result, repo, poll_mode, checkout=False):
+        """Update the remote-tracking branch of a fetch-only clone, or every branch of a mirror, without merging.
+
+        :param action_result: object of ActionResult class
+        :param repo: object of git.Repo class
+        :param poll_mode: fetch or mirror
+        :param checkout: whether to force the working tree of a fetch-only clone to the fetched branch
+        :return: status success/failure
+        """
+        self._start_ssh_master(self._remote_url(repo))
+        try:
+            if poll_mode == "mirror":
+                repo.git.fetch("--prune", "origin")
+            else:
+                # Only the polled branch is fetched, whatever other branches the remote has
+                repo.git.fetch("--prune", "origin", f"+refs/heads/{self.branch_name}:refs/remotes/origin/{self.branch_name}")
+                if checkout:
+                    repo.git.checkout("--force", "-B", self.branch_name, f"origin/{self.branch_name}")
+        except Exception as e:
+            self.debug_print(e)
+            message = str(e)
+            if self.password:
+                message = message.replace(self.password, "***")
+            return action_result.set_status(phantom.APP_ERROR, f"Error while fetching the repository: {message}")
+
+        self._update_repo_manifest(self.repo_name, last_sync=self._utc_now())
+        return phantom.APP_SUCCESS
+
     def __git_pull(self, action_result, param):
         self._set_repo_attributes(param=param)
 
@@ -607,9 +1735,10 @@ class GitConnector(BaseConnector):
             return action_result.get_status(), None, None
 
         try:
-            response = repo.git.pull()
+            response = self._pull_repo(repo)
             self.debug_print(response)
             current_branch = self._get_current_branch_name_from_repo(repo)
+            self._update_repo_manifest(Path(repo.working_dir).name, last_sync=self._utc_now())
             return action_result.set_status(phantom.APP_SUCCESS), response, current_branch
         except Exception as e:
             message = f"Error while pulling the repository: {e!s}"
@@ -650,6 +1779,234 @@ class GitConnector(BaseConnector):
 
         return action_result.set_status(phantom.APP_SUCCESS, status_message=message)
 
+    def _sync_repo(self, repo_dir, mode, timeout):
+        """Fetch or pull a single clone. Runs in a worker thread of the sync all repos action.
+
+        :param repo_dir: path of the cloned repository
+        :param mode: fetch or pull
+        :param timeout: seconds after which the sync is aborted, shared by every git command it runs
+        :return: dictionary with the result for the repository
+        """
+        from git_traced_repo import TracedRepo
+
+        result = {"repo_name": repo_dir.name, "repo_dir": str(repo_dir), "status": "failed"}
+        start_time = time.monotonic()
+        try:
+            # A git.Repo is not thread safe, so every worker opens its own
+            with self._repo_lock(repo_dir.name), TracedRepo(repo_dir) as repo:
+                # The time spent waiting for other actions on the repo does not count
+                deadline = time.monotonic() + timeout if timeout else None
+                # Mirrors have no working tree to merge into
+                if mode == "pull" and not repo.bare:
+                    response = self._pull_repo(repo, deadline=deadline)
+                else:
+                    self._start_ssh_master(self._remote_url(repo), deadline)
+                    response = repo.git.fetch("--prune", kill_after_timeout=self._remaining_time(deadline))
+            result["status"] = "success"
+            result["message"] = response or f"Repo {repo_dir.name} {mode}ed successfully"
+        except Exception as e:
+            message = str(e)
+            if self.password:
+                message = message.replace(self.password, "***")
+            result["message"] = message
+        result["duration"] = round(time.monotonic() - start_time, 3)
+        return result
+
+    def _sync_all_repos(self, param):
+        """Function fetches or pulls every cloned repository in parallel.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        mode = param.get("mode") or "fetch"
+        if mode not in consts.GIT_SYNC_MODES:
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_SYNC_MODE_MSG.format(", ".join(consts.GIT_SYNC_MODES)))
+
+        ret_val, max_workers = self._validate_integer(action_result, param.get("max_workers", consts.GIT_SYNC_DEFAULT_WORKERS), "max_workers")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        ret_val, timeout = self._validate_integer(action_result, param.get("timeout", consts.GIT_SYNC_DEFAULT_TIMEOUT), "timeout")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # Sets up the SSH command used by git when the asset connects over SSH
+        if self.repo_uri:
+            self._set_repo_attributes(param={})
+
+        repos = self._sync_repo_manifest()["repos"]
+        repo_dirs = [Path(repos[name]["repo_dir"]) for name in sorted(repos) if name != self.get_app_id()]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers or consts.GIT_SYNC_DEFAULT_WORKERS) as executor:
+            results = list(executor.map(lambda repo_dir: self._sync_repo(repo_dir, mode, timeout), repo_dirs))
+
+        synced = 0
+        sync_time = self._utc_now()
+        with self._edit_repo_manifest() as manifest:
+            for result in results:
+                action_result.add_data(result)
+                if result["status"] == "success":
+                    synced += 1
+                    if result["repo_name"] in manifest["repos"]:
+                        manifest["repos"][result["repo_name"]]["last_sync"] = sync_time
+
+        action_result.update_summary(
+            {
+                "total_repos": len(results),
+                "successful": synced,
+                "failed": len(results) - synced,
+                "duration": round(time.monotonic() - start_time, 3),
+            }
+        )
+
+        if results and not synced:
+            return action_result.set_status(phantom.APP_ERROR, f"Unable to {mode} any of the repos")
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"{synced} of {len(results)} repos {mode}ed successfully")
+
+    def _search_repo(self, repo_dir, args, ref, paths, max_repo_matches, budget):
+        """Run git grep in a single clone, stopping once the repo or the global match cap is reached. Runs in a worker thread
+        of the search repos action.
+
+        :param repo_dir: path of the cloned repository
+        :param args: arguments of git grep, up to the ref
+        :param ref: branch, tag or commit SHA to search, or None for the working tree
+        :param paths: list of paths to limit the search to
+        :param max_repo_matches: maximum number of matches returned for the repository
+        :param budget: dictionary with the number of matches left for all repositories, whether any match was left out and the
+            lock guarding them
+        :return: list of matches, error message or None
+        """
+        matches = []
+        if budget["remaining"] <= 0:
+            budget["truncated"] = True
+            return matches, None
+
+        import git
+
+        from git_traced_repo import TracedRepo
+
+        process = None
+        capped = False
+        try:
+            # A git.Repo is not thread safe, so every worker opens its own
+            with TracedRepo(repo_dir) as repo:
+                process = repo.git.grep(*args, *([ref] if ref else []), "--", *paths, as_process=True)
+                for record in self._iter_records(process.stdout, b"\n", consts.GIT_SEARCH_MAX_RECORD_BYTES):
+                    file_path, _, rest = record.partition(b"\0")
+                    line_number, _, line = rest.partition(b"\0")
+                    if not line_number:
+                        continue
+                    with budget["lock"]:
+                        capped = budget["remaining"] <= 0 or len(matches) >= max_repo_matches
+                        if not capped:
+                            budget["remaining"] -= 1
+                    if capped:
+                        budget["truncated"] = True
+                        # Nothing more is needed from this repo, stop git from searching the rest of it
+                        process.kill()
+                        break
+                    file_path = file_path.decode(errors="replace")
+                    matches.append(
+                        {
+                            "repo_name": repo_dir.name,
+                            "file_path": file_path.removeprefix(f"{ref}:") if ref else file_path,
+                            "line_number": int(line_number),
+                            "line": line.decode(errors="replace")[: consts.GIT_SEARCH_MAX_LINE_LENGTH],
+                        }
+                    )
+                process.wait()
+        except git.exc.GitCommandError as e:
+            # git grep exits with 1 when nothing matched
+            if not capped and e.status != 1:
+                return matches, (e.stderr or str(e)).strip()
+        except Exception as e:
+            return matches, str(e)
+        return matches, None
+
+    def _search_repos(self, param):
+        """Function searches the contents of every cloned repository in parallel.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        pattern = param["pattern"]
+        ref = param.get("ref")
+        path = (param.get("path") or "").strip().strip("/")
+        fixed_string = str(param.get("fixed_string", True)).lower() == "true"
+        ignore_case = str(param.get("ignore_case", False)).lower() == "true"
+        if ref and ref.startswith("-"):
+            return action_result.set_status(phantom.APP_ERROR, "Refs must not start with '-'")
+
+        ret_val, max_workers = self._validate_integer(action_result, param.get("max_workers"), "max_workers")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+        ret_val, max_matches = self._validate_integer(action_result, param.get("max_matches"), "max_matches")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+        ret_val, max_repo_matches = self._validate_integer(action_result, param.get("max_matches_per_repo"), "max_matches_per_repo")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+        max_matches = max_matches or consts.GIT_SEARCH_DEFAULT_MAX_MATCHES
+        max_repo_matches = max_repo_matches or consts.GIT_SEARCH_DEFAULT_MAX_REPO_MATCHES
+
+        # -z separates the path, line number and line with NUL, -I skips binary files
+        args = ["-z", "-n", "-I", "--full-name", "--no-color", "-F" if fixed_string else "-E"]
+        if ignore_case:
+            args.append("-i")
+        args += ["-e", pattern]
+
+        repos = self._sync_repo_manifest()["repos"]
+        repo_dirs = [Path(repos[name]["repo_dir"]) for name in sorted(repos) if name != self.get_app_id()]
+        budget = {"remaining": max_matches, "truncated": False, "lock": threading.Lock()}
+
+        def search(repo_dir):
+            return self._search_repo(repo_dir, args, ref, [path] if path else [], max_repo_matches, budget)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers or consts.GIT_SYNC_DEFAULT_WORKERS) as executor:
+            results = list(executor.map(search, repo_dirs))
+
+        total_matches = 0
+        matched_repos = 0
+        failed_repos = []
+        for repo_dir, (matches, error) in zip(repo_dirs, results):
+            if error:
+                self.debug_print(f"Unable to search {repo_dir.name}: {error}")
+                failed_repos.append(repo_dir.name)
+            if matches:
+                matched_repos += 1
+            total_matches += len(matches)
+            for match in matches:
+                action_result.add_data(match)
+
+        action_result.update_summary(
+            {
+                "total_matches": total_matches,
+                "total_repos": len(repo_dirs),
+                "matched_repos": matched_repos,
+                "failed_repos": failed_repos,
+                "truncated": budget["truncated"],
+                "duration": round(time.monotonic() - start_time, 3),
+            }
+        )
+
+        if repo_dirs and len(failed_repos) == len(repo_dirs):
+            return action_result.set_status(phantom.APP_ERROR, "Unable to search any of the repos")
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"Found {total_matches} matches in {matched_repos} of {len(repo_dirs)} repos")
+
     def _delete_clone(self, param):
         self.save_progress(f"In action handler for: {self.get_action_identifier()}")
         action_result = self.add_action_result(ActionResult(dict(param)))
@@ -682,29 +2039,70 @@ class GitConnector(BaseConnector):
             return action_result.set_status(phantom.APP_ERROR, msg)
 
         git_dir = repo_dir / ".git"
-        if not git_dir.is_dir():
+        # Mirrors cloned by on poll are bare repositories, without a .git directory
+        is_bare = (repo_dir / "HEAD").is_file() and (repo_dir / "objects").is_dir()
+        if not git_dir.is_dir() and not is_bare:
             msg = f"{self.repo_name} doesn't appear to be a git repository"
             self.debug_print(msg)
             return action_result.set_status(phantom.APP_ERROR, msg)
 
         try:
-            rmtree(repo_dir, ignore_errors=True)
+            files_not_deleted, removed_object_caches = self._remove_clone(repo_dir)
         except Exception as e:
             msg = f"Error deleting repository: {e!s}"
             self.debug_print(msg)
             return action_result.set_status(phantom.APP_ERROR, msg)
 
-        # Track errors:
-        files_not_deleted = [str(f.relative_to(repo_dir)) for f in repo_dir.glob("**/*")]
         if files_not_deleted:
             message = "Some files could not be deleted in the repo. Check permissions of the files before trying again."
         else:
             message = "Successfully deleted repository"
 
-        action_result.add_data({"repo_dir": str(repo_dir), "unable_to_delete": files_not_deleted})
+        action_result.add_data(
+            {"repo_dir": str(repo_dir), "unable_to_delete": files_not_deleted, "removed_object_caches": removed_object_caches}
+        )
 
         return action_result.set_status(phantom.APP_SUCCESS, message)
 
+    def _remove_clone(self, repo_dir, keep_state=False):
+        """Delete a clone along with what the state knows about it, and the shared object caches only it used.
+
+        :param repo_dir: path of the cloned repository
+        :param keep_state: whether to keep the poll state of the repo, so that a clone evicted to free space resumes
+            ingesting from the last ingested commit once it is cloned again
+        :return: list of files that could not be deleted, list of removed object cache directories
+        """
+        cache_dirs = self._object_cache_dirs_of(repo_dir)
+        cached_repo = self._repos.pop(repo_dir, None)
+        if cached_repo:
+            cached_repo.close()
+
+        rmtree(repo_dir, ignore_errors=True)
+
+        # Track errors:
+        files_not_deleted = [str(f.relative_to(repo_dir)) for f in repo_dir.glob("**/*")]
+
+        if not keep_state:
+            for state_key in (consts.GIT_STATE_REMOTE_TIPS, consts.GIT_STATE_INGEST, consts.GIT_STATE_MAINTENANCE):
+                self._state.get(state_key, {}).pop(repo_dir.name, None)
+        self._remove_from_repo_manifest(repo_dir.name)
+
+        from git_traced_repo import TracedRepo
+
+        # Drop shared object caches that no remaining clone borrows from
+        removed_object_caches = []
+        for cache_dir in cache_dirs:
+            try:
+                if self._object_cache_users(cache_dir):
+                    self._unpin_object_cache_refs(TracedRepo(cache_dir), repo_dir.name)
+                else:
+                    rmtree(cache_dir, ignore_errors=True)
+                    removed_object_caches.append(str(cache_dir))
+            except Exception as e:
+                self.debug_print(f"Unable to clean up the shared object cache {cache_dir}: {e!s}")
+
+        return files_not_deleted, removed_object_caches
+
     def __clone_repo(self, action_result, param):
         repo_url = param.get("repo_url")
         if not self.config.get("repo_uri") and not repo_url:
@@ -720,11 +2118,52 @@ class GitConnector(BaseConnector):
             message = "You must provide valid repo URI."
             return action_result.set_status(phantom.APP_ERROR, message)
 
-        try:
-            git.Repo.clone_from(self.modified_repo_uri, to_path=repo_dir, branch=self.branch_name)
+        ret_val, clone_options = self._get_clone_options(action_result, param)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # A recent listing of the remote branches rejects an unknown branch before anything is downloaded. Without one,
+        # the remote is not queried just for this, the clone reports an unknown branch itself
+        remote_heads = self._cached_remote_heads()
+        if remote_heads is not None and self.branch_name not in remote_heads:
+            return action_result.set_status(phantom.APP_ERROR, "Branch name is invalid/incorrect")
+
+        if str(param.get("use_object_cache", False)).lower() == "true":
+            if clone_options.get("depth") or clone_options.get("filter"):
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_OBJECT_CACHE_INCOMPATIBLE_MSG)
+
+            cache_dir = self._object_cache_dir()
+            try:
+                self._refresh_object_cache(cache_dir)
+            except Exception as e:
+                self.debug_print(f"Unable to refresh the shared object cache: {e!s}")
+
+            # A stale cache still saves the download of every object it already holds
+            if cache_dir.is_dir():
+                clone_options["reference"] = str(cache_dir)
+                self.object_cache_dir = cache_dir
+
+        from git_traced_repo import TracedRepo
 
-            message = f"Repo {self.repo_name} cloned successfully"
-            return action_result.set_status(phantom.APP_SUCCESS, message)
+        self._start_ssh_master(self.modified_repo_uri)
+        try:
+            repo = TracedRepo.clone_from(self.modified_repo_uri, to_path=repo_dir, branch=self.branch_name, **clone_options)
+            if self.object_cache_dir:
+                try:
+                    self._pin_object_cache_refs(TracedRepo(self.object_cache_dir), repo_dir)
+                except Exception as e:
+                    # The next refresh of the cache pins the clone before anything can be pruned
+                    self.debug_print(f"Unable to pin the refs of the clone in the shared object cache: {e!s}")
+            if repo.bare:
+                # A bare clone has no fetch refspec, mirror the branches so that a plain `git fetch --prune` updates them
+                with repo.config_writer() as writer:
+                    writer.set_value('remote "origin"', "fetch", consts.GIT_MIRROR_REFSPEC)
+            repo.close()
+
+            now = self._utc_now()
+            self._update_repo_manifest(
+                repo_dir.name, remote_url=self._clean_remote_url(self.repo_uri), branch=self.branch_name, last_sync=now, last_access=now
+            )
         except Exception as e:
             self.debug_print(e)
             e = str(e)
@@ -751,6 +2190,14 @@ class GitConnector(BaseConnector):
 
             return action_result.set_status(phantom.APP_ERROR, message)
 
+        evicted_repos = self._enforce_disk_quota(keep=[repo_dir.name])
+        if evicted_repos:
+            self.save_progress(f"Evicted idle clones to stay within the disk quota: {', '.join(evicted_repos)}")
+            action_result.update_summary({"evicted_repos": evicted_repos})
+
+        message = f"Repo {self.repo_name} cloned successfully"
+        return action_result.set_status(phantom.APP_SUCCESS, message)
+
     def _clone_repo(self, param):
         """Function clones remote repository into local repository.
 
@@ -774,10 +2221,61 @@ class GitConnector(BaseConnector):
             return action_result.set_status(phantom.APP_ERROR, message)
 
         response = {"repo_name": self.repo_name, "repo_dir": str(repo_dir), "branch_name": self.branch_name}
+        if self.object_cache_dir:
+            response["object_cache_dir"] = str(self.object_cache_dir)
         action_result.add_data(response)
 
         return action_result.get_status()
 
+    def _refresh_object_cache_action(self, param):
+        """Function refreshes the shared object cache of a remote and optionally garbage collects it.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        if not self.config.get("repo_uri") and not param.get("repo_url"):
+            message = consts.GIT_URL_OR_CONFIG_REQUIRED
+            self.debug_print(message)
+            return action_result.set_status(phantom.APP_ERROR, message)
+
+        if phantom.is_fail(self._set_repo_attributes(param=param)):
+            return action_result.set_status(phantom.APP_ERROR, "You must provide valid repo URI.")
+
+        cache_dir = self._object_cache_dir()
+        try:
+            cache = self._refresh_object_cache(cache_dir)
+            if str(param.get("gc", False)).lower() == "true":
+                cache.git.gc("--quiet")
+        except Exception as e:
+            self.debug_print(e)
+            e = str(e)
+            if self.password:
+                e = e.replace(self.password, "***")
+            return action_result.set_status(phantom.APP_ERROR, f"Error while refreshing the shared object cache: {e}")
+
+        removed_object_caches = []
+        cache_root = self.app_state_dir / consts.GIT_OBJECT_CACHE_DIR
+        if str(param.get("remove_unused", False)).lower() == "true":
+            for unused_dir in [p for p in cache_root.iterdir() if p.is_dir() and p != cache_dir]:
+                if not self._object_cache_users(unused_dir):
+                    rmtree(unused_dir, ignore_errors=True)
+                    removed_object_caches.append(str(unused_dir))
+
+        users = self._object_cache_users(cache_dir)
+        action_result.add_data(
+            {
+                "cache_dir": str(cache_dir),
+                "repos": [user.name for user in users],
+                "removed_object_caches": removed_object_caches,
+            }
+        )
+        action_result.update_summary({"total_repos": len(users), "total_removed_object_caches": len(removed_object_caches)})
+
+        return action_result.set_status(phantom.APP_SUCCESS, "Shared object cache refreshed successfully")
+
     def _configure_ssh(self, param):
         """This function will create an RSA Key pair.
 
@@ -810,7 +2308,12 @@ class GitConnector(BaseConnector):
                     pass
                 return action_result.set_status(phantom.APP_ERROR, "RSA Key already exists")
 
+        import phantom.rules as phantom_rules
+        from Cryptodome.PublicKey import RSA
+
         key = RSA.generate(2048)
+        # Master connections keep using the key they were authenticated with
+        self._close_ssh_sessions()
 
         ssh_key_dir.mkdir(exist_ok=True)
 
@@ -834,6 +2337,106 @@ class GitConnector(BaseConnector):
 
         return action_result.set_status(phantom.APP_SUCCESS, f"Rsa pub key: {pub_key.decode()}")
 
+    @staticmethod
+    def _parse_status(status_output):
+        """Parse the output of `git status --porcelain=v2 --branch -z`.
+
+        :param status_output: NUL separated output of git status
+        :return: dictionary with the branch information, staged and unstaged changes and untracked files
+        """
+        val_map = {"M": "modified", "R": "renamed", "C": "copied", "D": "deleted", "A": "new_file", "T": "typechange", "U": "unmerged"}
+        branch = {"oid": None, "head": None, "upstream": None, "ahead": 0, "behind": 0}
+        staged = {}
+        unstaged = {}
+        untracked_list = []
+
+        entries = iter(status_output.split("\0"))
+        for entry in entries:
+            if not entry:
+                continue
+
+            if entry.startswith("# "):
+                key, _, value = entry[2:].partition(" ")
+                if key == "branch.oid":
+                    branch["oid"] = None if value == "(initial)" else value
+                elif key == "branch.head":
+                    branch["head"] = None if value == "(detached)" else value
+                elif key == "branch.upstream":
+                    branch["upstream"] = value
+                elif key == "branch.ab":
+                    ahead, behind = value.split()
+                    branch["ahead"] = int(ahead)
+                    branch["behind"] = -int(behind)
+                continue
+
+            if entry.startswith("? "):
+                untracked_list.append(entry[2:])
+                continue
+
+            entry_type = entry[0]
+            if entry_type not in "12u":
+                continue
+
+            # Changed entries have 8 space separated fields before the path, renames and copies 9, unmerged ones 10
+            fields = entry.split(" ", {"1": 8, "2": 9, "u": 10}[entry_type])
+            xy, fname = fields[1], fields[-1]
+            staged_name = fname
+            if entry_type == "2":
+                staged_name = f"{next(entries, '')} -> {fname}"
+
+            if xy[0] != ".":
+                staged.setdefault(val_map.get(xy[0], xy[0]), []).append(staged_name)
+            if xy[1] != ".":
+                unstaged.setdefault(val_map.get(xy[1], xy[1]), []).append(fname)
+
+        return {"branch": branch, "staged": staged, "unstaged": unstaged, "untracked_files": untracked_list}
+
+    @staticmethod
+    def _format_branch_status(branch):
+        """Return the line describing how the branch relates to its upstream, as shown by `git status`."""
+        upstream, ahead, behind = branch["upstream"], branch["ahead"], branch["behind"]
+        if not upstream:
+            return None
+        if ahead and behind:
+            return f"Your branch and '{upstream}' have diverged, and have {ahead} and {behind} different commits each, respectively."
+        if ahead:
+            return f"Your branch is ahead of '{upstream}' by {ahead} commit{'s' if ahead > 1 else ''}."
+        if behind:
+            return f"Your branch is behind '{upstream}' by {behind} commit{'s' if behind > 1 else ''}, and can be fast-forwarded."
+        return f"Your branch is up to date with '{upstream}'."
+
+    def _format_status(self, status):
+        """Build a human readable status from the parsed porcelain output, similar to plain `git status`."""
+        branch = status["branch"]
+        if branch["head"]:
+            lines = [f"On branch {branch['head']}"]
+        else:
+            lines = [f"HEAD detached at {(branch['oid'] or '')[:7]}"]
+
+        branch_status = self._format_branch_status(branch)
+        if branch_status:
+            lines.append(branch_status)
+
+        sections = [
+            ("Changes to be committed:", status["staged"]),
+            ("Changes not staged for commit:", status["unstaged"]),
+        ]
+        for title, changes in sections:
+            if changes:
+                lines.extend(["", title])
+                for change, files in changes.items():
+                    label = f"{change.replace('_', ' ')}:"
+                    lines.extend(f"\t{label:<12}{fname}" for fname in files)
+
+        if status["untracked_files"]:
+            lines.extend(["", "Untracked files:"])
+            lines.extend(f"\t{fname}" for fname in status["untracked_files"])
+
+        if not (status["staged"] or status["unstaged"] or status["untracked_files"]):
+            lines.extend(["", "nothing to commit, working tree clean"])
+
+        return "\n".join(lines)
+
     def __git_status(self, action_result, param):
         self._set_repo_attributes(param=param)
         resp_status, repo = self.verify_repo(self.repo_name, action_result)
@@ -841,73 +2444,583 @@ class GitConnector(BaseConnector):
         if phantom.is_fail(resp_status):
             return action_result.get_status(), action_result.get_message(), None
 
-        git = repo.git
+        untracked_files = param.get("untracked_files") or "normal"
+        if untracked_files not in consts.GIT_STATUS_UNTRACKED_FILES:
+            message = consts.GIT_INVALID_UNTRACKED_FILES_MSG.format(", ".join(consts.GIT_STATUS_UNTRACKED_FILES))
+            return action_result.set_status(phantom.APP_ERROR, message), message, None
+
+        paths = [path.strip().strip("/") for path in (param.get("paths") or "").split(",") if path.strip().strip("/")]
 
+        # A single scan of the working tree provides the branch information, the changes and the untracked files
         try:
-            status_str = git.status()
-            status_porcelain = git.status("--porcelain")
+            status_output = repo.git.status("--porcelain=v2", "--branch", "-z", f"--untracked-files={untracked_files}", "--", *paths)
+            status = self._parse_status(status_output)
         except Exception as e:
             message = f"Error in git status: {e!s}"
             return action_result.set_status(phantom.APP_ERROR, message), message, None
 
-        return action_result.set_status(phantom.APP_SUCCESS, status_str), status_str, status_porcelain
+        status_str = self._format_status(status)
+        return action_result.set_status(phantom.APP_SUCCESS, status_str), status_str, status
 
     def _git_status(self, param):
         self.save_progress(f"In action handler for: {self.get_action_identifier()}")
         action_result = self.add_action_result(ActionResult(dict(param)))
 
-        resp_status, status_str, status_porcelain = self.__git_status(action_result=action_result, param=param)
+        resp_status, status_str, status = self.__git_status(action_result=action_result, param=param)
 
         if phantom.is_fail(resp_status):
             return action_result.set_status(phantom.APP_ERROR, status_str)
 
-        val_map = {"M": "modified", "R": "renamed", "D": "deleted", "A": "new_file"}
+        branch = status["branch"]
+        action_result.update_summary(
+            {
+                "status": self._format_branch_status(branch) or status_str.splitlines()[0],
+                "ahead": branch["ahead"],
+                "behind": branch["behind"],
+            }
+        )
 
-        status_lines = status_porcelain.splitlines()
-        staged = {}
-        unstaged = {}
-        untracked_list = []
+        action_result.add_data(
+            {
+                "output": status_str,
+                "branch_name": branch["head"],
+                "upstream": branch["upstream"],
+                "ahead": branch["ahead"],
+                "behind": branch["behind"],
+                "staged": status["staged"],
+                "unstaged": status["unstaged"],
+                "untracked_files": status["untracked_files"],
+                "repo_dir": str(self._repo_dir()),
+            }
+        )
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    @staticmethod
+    def _repo_disk_usage(repo):
+        """Return the object and ref counts of a repository along with the size of its objects on disk in bytes."""
+        counts = {}
+        for line in repo.git.count_objects("-v").splitlines():
+            key, _, value = line.partition(": ")
+            counts[key] = int(value)
+        refs_dir = Path(repo.common_dir) / "refs"
+        return {
+            "size": (counts["size"] + counts["size-pack"] + counts["size-garbage"]) * 1024,
+            "loose_objects": counts["count"],
+            "packs": counts["packs"],
+            "loose_refs": sum(1 for path in refs_dir.rglob("*") if path.is_file()),
+        }
+
+    @staticmethod
+    def _time_repo_commands(repo):
+        """Time the commands that slow down as a repository ages: a walk of the whole history and, with a working tree,
+        `git status`."""
+        import git
+
+        timings = {}
+        commands = {"rev_list_time": ("rev_list", "--count", "HEAD")}
+        if not repo.bare:
+            commands["status_time"] = ("status", "--porcelain")
+        for name, (command, *args) in commands.items():
+            start_time = time.monotonic()
+            try:
+                getattr(repo.git, command)(*args)
+            except git.exc.GitCommandError:
+                timings[name] = None
+                continue
+            timings[name] = round(time.monotonic() - start_time, 4)
+        return timings
+
+    def _maintain_repo(self, repo):
+        """Repack loose objects and refs of a repository and write its commit-graph and multi-pack-index.
+
+        :param repo: object of git.Repo class
+        :return: dictionary with the disk usage before and after, and the duration of the maintenance
+        :raises ValueError: if git is too old to run the maintenance tasks
+        """
+        version = self._git_version()
+        if version < consts.GIT_MAINTENANCE_MIN_VERSION:
+            raise ValueError(consts.GIT_MAINTENANCE_VERSION_MSG.format(".".join(str(part) for part in version)))
+
+        before = self._repo_disk_usage(repo)
+        start_time = time.monotonic()
+        # incremental-repack also writes the multi-pack-index
+        repo.git.maintenance("run", *(f"--task={task}" for task in consts.GIT_MAINTENANCE_TASKS))
+        # loose-objects only deletes the objects it packed on its next run, drop them right away
+        repo.git.prune_packed()
+        duration = round(time.monotonic() - start_time, 4)
+        after = self._repo_disk_usage(repo)
+
+        self._state.setdefault(consts.GIT_STATE_MAINTENANCE, {})[self.repo_name] = time.time()
+        return {"before": before, "after": after, "maintenance_time": duration}
+
+    def _run_maintenance(self, param):
+        """Function runs maintenance tasks on a repo and reports its disk usage and timings before and after.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        measure = str(param.get("measure", True)).lower() == "true"
+        timings_before = self._time_repo_commands(repo) if measure else {}
         try:
-            for line in status_lines:
-                status_staged = line[0]
-                status_unstaged = line[1]
-                fname = line[3:]
-                if status_staged == "?" and status_unstaged == "?":
-                    untracked_list.append(fname)
-                    continue
-                if status_staged != " ":
-                    val = val_map.get(status_staged, status_staged)
-                    if val in staged:
-                        staged[val].append(fname)
-                    else:
-                        staged[val] = [fname]
-                if status_unstaged != " ":
-                    val = val_map.get(status_unstaged, status_unstaged)
-                    if val in unstaged:
-                        unstaged[val].append(fname)
-                    else:
-                        unstaged[val] = [fname]
+            report = self._maintain_repo(repo)
+        except ValueError as e:
+            return action_result.set_status(phantom.APP_ERROR, str(e))
         except Exception as e:
-            self.debug_print(f"Exception in parsing git status: {e!s}")
-            staged = {}
-            unstaged = {}
-            untracked_list = []
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Error while running maintenance: {e!s}")
+        timings_after = self._time_repo_commands(repo) if measure else {}
 
+        report["before"].update(timings_before)
+        report["after"].update(timings_after)
+        action_result.add_data(dict(report, repo_dir=str(self._repo_dir()), tasks=consts.GIT_MAINTENANCE_TASKS))
+        action_result.update_summary(
+            {
+                "size_before": report["before"]["size"],
+                "size_after": report["after"]["size"],
+                "maintenance_time": report["maintenance_time"],
+            }
+        )
+        return action_result.set_status(phantom.APP_SUCCESS, "Maintenance completed successfully")
+
+    def _load_blob_vault_cache(self):
+        """Load the cache of vault IDs keyed by container ID and blob SHA kept in the state directory."""
         try:
-            action_result.update_summary({"status": status_str.splitlines()[1]})
+            cache = json.loads((self.app_state_dir / consts.GIT_BLOB_VAULT_CACHE).read_text())
+            if not isinstance(cache, dict):
+                raise ValueError
+        except (OSError, ValueError):
+            cache = {}
+        return cache
+
+    def _save_blob_vault_cache(self, cache):
+        """Save the blob cache, dropping the least recently used entries beyond its size limit."""
+        for key in list(cache)[: max(len(cache) - consts.GIT_BLOB_VAULT_CACHE_MAX_ENTRIES, 0)]:
+            del cache[key]
+        # Write to a temporary file first, so that concurrent actions never read a partial cache
+        cache_path = self.app_state_dir / consts.GIT_BLOB_VAULT_CACHE
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+        try:
+            tmp_path.write_text(json.dumps(cache))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            self.debug_print(f"Unable to save the blob cache: {e!s}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _vault_add_blob(self, blob, file_name):
+        """Stream a blob from the object database into the vault of the current container with bounded memory use.
+
+        :return: status success/failure, error message, vault ID
+        """
+        import phantom.rules as phantom_rules
+        from phantom.vault import Vault
+
+        tmp_path = Path(Vault.get_vault_tmp_dir()) / f"{blob.hexsha}-{os.getpid()}"
+        try:
+            with tmp_path.open("wb") as tmp_file:
+                copyfileobj(blob.data_stream, tmp_file, consts.GIT_COPY_CHUNK_SIZE)
+            status, message, vault_id = phantom_rules.vault_add(
+                container=self.get_container_id(), file_location=str(tmp_path), file_name=file_name
+            )
         except Exception as e:
-            self.debug_print(f"Error getting commits ahead: {e!s}")
-
-        status = {
-            "output": status_str,
-            "staged": staged,
-            "unstaged": unstaged,
-            "untracked_files": untracked_list,
-            "repo_dir": str(self._repo_dir()),
-        }
+            self.debug_print(e)
+            return phantom.APP_ERROR, f"Unable to add the file to the vault: {e!s}", None
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
-        action_result.add_data(status)
-        return action_result.set_status(phantom.APP_SUCCESS)
+        if not status:
+            return phantom.APP_ERROR, f"Unable to add the file to the vault: {message}", None
+        return phantom.APP_SUCCESS, None, vault_id
+
+    def _get_file(self, param):
+        """Function reads a file at any ref from the object database into the vault, without touching the working tree.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+
+        file_path = param["file_path"].strip().strip("/")
+        ref = param.get("ref") or "HEAD"
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        try:
+            commit = repo.commit(ref)
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Unable to resolve ref '{ref}': {e!s}")
+
+        try:
+            blob = commit.tree / file_path
+        except KeyError:
+            return action_result.set_status(phantom.APP_ERROR, f"File '{file_path}' is not present at ref '{ref}'")
+        if blob.type != "blob":
+            return action_result.set_status(phantom.APP_ERROR, f"'{file_path}' is not a file at ref '{ref}'")
+
+        # Vault IDs are only reused within a container, other containers get their own copy of the file
+        cache = self._load_blob_vault_cache()
+        cache_key = f"{self.get_container_id()}:{blob.hexsha}"
+        vault_id = cache.pop(cache_key, None)
+        if vault_id:
+            import phantom.rules as phantom_rules
+
+            try:
+                status, _, _ = phantom_rules.vault_info(vault_id=vault_id, container_id=self.get_container_id())
+            except Exception as e:
+                self.debug_print(e)
+                status = False
+            if not status:
+                vault_id = None
+        cached = bool(vault_id)
+
+        if not vault_id:
+            status, message, vault_id = self._vault_add_blob(blob, Path(file_path).name)
+            if phantom.is_fail(status):
+                self._save_blob_vault_cache(cache)
+                return action_result.set_status(phantom.APP_ERROR, message)
+
+        cache[cache_key] = vault_id
+        self._save_blob_vault_cache(cache)
+
+        action_result.add_data(
+            {
+                "repo_name": self.repo_name,
+                "file_path": file_path,
+                "file_name": Path(file_path).name,
+                "ref": ref,
+                "commit_sha": commit.hexsha,
+                "blob_sha": blob.hexsha,
+                "size": blob.size,
+                "vault_id": vault_id,
+            }
+        )
+        action_result.update_summary({"vault_id": vault_id, "size": blob.size, "cached": cached})
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"File '{file_path}' at ref '{ref}' added to the vault successfully")
+
+    @staticmethod
+    def _iter_records(stream, separator=b"\0", max_record_bytes=None):
+        """Yield the separated records of a git output stream as they are read, holding at most one chunk in memory.
+
+        :param stream: binary stream with the output of a git process
+        :param separator: single byte separating the records
+        :param max_record_bytes: records are cut to this many bytes and the rest of a longer record is dropped unread,
+            so a huge line never has to fit in memory
+        """
+        record = bytearray()
+        room = max_record_bytes
+        while True:
+            chunk = stream.read1(consts.GIT_COPY_CHUNK_SIZE)
+            start = 0
+            # Every byte is scanned once, the incomplete record at the end of a chunk is carried over as it is
+            while start < len(chunk):
+                end = chunk.find(separator, start)
+                stop = len(chunk) if end < 0 else end
+                if room is None:
+                    record += chunk[start:stop]
+                elif room > 0:
+                    record += chunk[start : min(stop, start + room)]
+                    room = max_record_bytes - len(record)
+                if end < 0:
+                    break
+                yield bytes(record)
+                record.clear()
+                room = max_record_bytes
+                start = end + 1
+            if not chunk:
+                if record:
+                    yield bytes(record)
+                return
+
+    def _parse_log(self, stream):
+        """Yield the commits of `git log -z` output as it is read from the stream.
+
+        :param stream: binary stream with the output of git log using the GIT_LOG_FORMAT format
+        """
+        fields = ["sha", "parents", "author_name", "author_email", "date", "subject"]
+        for record in self._iter_records(stream):
+            record = record.strip(b"\n")
+            if not record:
+                continue
+            commit = dict(zip(fields, record.decode(errors="replace").split("\x1f")))
+            commit["parents"] = commit.get("parents", "").split()
+            yield commit
+
+    def _git_log(self, param):
+        """Function lists commits of the repo one page at a time, returning a cursor to the next page.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+
+        status, limit = self._validate_integer(action_result, param.get("limit"), "limit")
+        if phantom.is_fail(status):
+            return action_result.get_status()
+        limit = min(limit or consts.GIT_LOG_DEFAULT_LIMIT, consts.GIT_LOG_MAX_LIMIT)
+
+        ref = param.get("ref") or "HEAD"
+        since_sha = param.get("since_sha")
+        author = param.get("author")
+        path = (param.get("path") or "").strip().strip("/")
+        cursor = (param.get("cursor") or "").strip().lower()
+
+        # The cursor holds the tip the first page was listed from and the number of commits listed so far, so commits
+        # added in the meantime do not shift the pages
+        cursor_sha, offset = None, 0
+        if cursor:
+            cursor_sha, _, offset = cursor.partition(":")
+            if len(cursor_sha) not in (40, 64) or any(character not in "0123456789abcdef" for character in cursor_sha) or not offset.isdigit():
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_CURSOR_MSG)
+            offset = int(offset)
+
+        if any(value and value.startswith("-") for value in (ref, since_sha)):
+            return action_result.set_status(phantom.APP_ERROR, "Refs must not start with '-'")
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        if cursor_sha:
+            if not RepoQuery(repo).has_object(cursor_sha):
+                return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_CURSOR_MSG)
+            tip_sha = cursor_sha
+        else:
+            try:
+                tip_sha = repo.commit(ref).hexsha
+            except Exception as e:
+                self.debug_print(e)
+                return action_result.set_status(phantom.APP_ERROR, f"Unable to resolve ref '{ref}': {e!s}")
+
+        # One extra commit tells whether there is a next page. git log reads the commit-graph file when it exists.
+        # Every page walks from the same tip, since in a history with merges the commits after a page are not all
+        # ancestors of its last commit
+        args = ["-z", f"--format={consts.GIT_LOG_FORMAT}", f"--max-count={limit + 1}", f"--skip={offset}"]
+        if author:
+            args.append(f"--author={author}")
+        args.append(tip_sha)
+        if since_sha:
+            args.append(f"^{since_sha}")
+        args.append("--")
+        if path:
+            args.append(path)
+
+        commits = []
+        try:
+            process = repo.git.log(*args, as_process=True)
+            for commit in self._parse_log(process.stdout):
+                commits.append(commit)
+            process.wait()
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Error while reading the commit log: {e!s}")
+
+        next_cursor = None
+        if len(commits) > limit:
+            commits = commits[:limit]
+            next_cursor = f"{tip_sha}:{offset + limit}"
+
+        for commit in commits:
+            action_result.add_data(commit)
+
+        action_result.update_summary({"total_commits": len(commits), "head_sha": tip_sha, "next_cursor": next_cursor})
+
+        return action_result.set_status(phantom.APP_SUCCESS, f"Listed {len(commits)} commits")
+
+    def _parse_name_status(self, stream):
+        """Yield the changed files of `git diff --name-status -z` output as it is read from the stream."""
+        tokens = (token.decode(errors="replace") for token in self._iter_records(stream) if token)
+        for status in tokens:
+            change = {"status": status, "file_path": next(tokens, "")}
+            # Renames and copies are followed by the old and the new path
+            if status[:1] in ("R", "C"):
+                change["old_path"], change["file_path"] = change["file_path"], next(tokens, "")
+            yield change
+
+    def _parse_numstat(self, stream):
+        """Yield the changed files of `git diff --numstat -z` output as it is read from the stream."""
+        tokens = (token.decode(errors="replace") for token in self._iter_records(stream))
+        for token in tokens:
+            if not token:
+                continue
+            added, deleted, file_path = token.split("\t", 2)
+            change = {"file_path": file_path}
+            # Renames have an empty path followed by the old and the new path
+            if not file_path:
+                change["old_path"], change["file_path"] = next(tokens, ""), next(tokens, "")
+            # Binary files have no line counts
+            change["binary"] = added == "-"
+            change["additions"] = 0 if change["binary"] else int(added)
+            change["deletions"] = 0 if change["binary"] else int(deleted)
+            yield change
+
+    @staticmethod
+    def _unquote_path(path):
+        """Return a path of a patch header, undoing the C-style quoting git applies to unusual file names."""
+        if not (len(path) > 1 and path.startswith(b'"') and path.endswith(b'"')):
+            return path
+        escapes = {b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v"}
+
+        def unescape(match):
+            escaped = match.group(1)
+            return bytes([int(escaped, 8)]) if escaped[:1].isdigit() else escapes.get(escaped, escaped)
+
+        return re.sub(rb"\\([0-7]{3}|.)", unescape, path[1:-1])
+
+    @classmethod
+    def _diff_header_path(cls, names):
+        """Return the path of the file from the names following `diff --git`, the way git apply reads them.
+
+        Unquoted names are ambiguous when a path contains " b/". Both names are the same path unless the file was renamed
+        or copied, so the line splits in the middle, and renames and copies name the new path again in their own header.
+        """
+        # Paths with special characters are quoted as a whole, prefix included
+        quoted = re.search(rb'"(?:[^"\\]|\\.)*"$', names)
+        if quoted:
+            return cls._unquote_path(quoted.group(0)).removeprefix(b"b/")
+        quoted = re.match(rb'"(?:[^"\\]|\\.)*" ', names)
+        if quoted:
+            return names[quoted.end() :].removeprefix(b"b/")
+        length = (len(names) - 5) // 2
+        if names.startswith(b"a/") and names[2 + length : 5 + length] == b" b/" and names[2 : 2 + length] == names[5 + length :]:
+            return names[5 + length :]
+        return names.rpartition(b" b/")[2]
+
+    def _parse_patch(self, stream, max_file_bytes, max_total_bytes):
+        """Yield the per-file patches of `git diff` output as it is read from the stream, truncated to the size caps.
+
+        Stops reading once the total size cap is reached.
+
+        :return: generator of dictionaries with the file path, the patch and whether it was truncated
+        """
+        change = None
+        pieces = []
+        total_bytes = 0
+        # Lines longer than the per file cap are truncated anyway, so only that much of them is read into memory
+        for line in self._iter_records(stream, b"\n", max_file_bytes + 1):
+            line += b"\n"
+            if line.startswith(b"diff --git "):
+                if change:
+                    change["patch"] = b"".join(pieces)
+                    yield change
+                # diff --git a/<path> b/<path>
+                path = self._diff_header_path(line[len(b"diff --git ") : -1])
+                change = {"file_path": path.decode(errors="replace"), "truncated": False}
+                pieces, patch_bytes, in_header = [], 0, True
+            if change is None:
+                continue
+            if in_header and line.startswith(b"@@"):
+                in_header = False
+            elif in_header and line.startswith((b"rename to ", b"copy to ")):
+                change["file_path"] = self._unquote_path(line.rstrip(b"\n").partition(b" to ")[2]).decode(errors="replace")
+            if patch_bytes + len(line) > max_file_bytes or total_bytes + len(line) > max_total_bytes:
+                change["truncated"] = True
+                if total_bytes + len(line) > max_total_bytes:
+                    break
+                continue
+            pieces.append(line)
+            patch_bytes += len(line)
+            total_bytes += len(line)
+        if change:
+            change["patch"] = b"".join(pieces)
+            yield change
+
+    def _git_diff(self, param):
+        """Function lists the changes between two refs, or between the working tree and a ref.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure
+        """
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        self._set_repo_attributes(param=param)
+
+        base = param.get("base") or "HEAD"
+        target = param.get("target")
+        mode = param.get("mode") or consts.GIT_DIFF_MODES[0]
+        path = (param.get("path") or "").strip().strip("/")
+        if mode not in consts.GIT_DIFF_MODES:
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_DIFF_MODE_MSG.format(", ".join(consts.GIT_DIFF_MODES)))
+        if any(value and value.startswith("-") for value in (base, target)):
+            return action_result.set_status(phantom.APP_ERROR, "Refs must not start with '-'")
+
+        status, max_file_bytes = self._validate_integer(action_result, param.get("max_file_bytes"), "max_file_bytes")
+        if phantom.is_fail(status):
+            return action_result.get_status()
+        status, max_total_bytes = self._validate_integer(action_result, param.get("max_total_bytes"), "max_total_bytes")
+        if phantom.is_fail(status):
+            return action_result.get_status()
+        max_file_bytes = max_file_bytes or consts.GIT_DIFF_DEFAULT_MAX_FILE_BYTES
+        max_total_bytes = max_total_bytes or consts.GIT_DIFF_DEFAULT_MAX_TOTAL_BYTES
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
+        if phantom.is_fail(resp_status):
+            return action_result.get_status()
+
+        args = ["--no-color", "--no-ext-diff"]
+        if mode == "name_status":
+            args += ["--name-status", "-z"]
+            parser = self._parse_name_status
+        elif mode == "stat":
+            args += ["--numstat", "-z"]
+            parser = self._parse_numstat
+        else:
+            # Whatever prefixes the configuration asks for, the patch headers are parsed with the default ones
+            args += ["--src-prefix=a/", "--dst-prefix=b/"]
+            parser = lambda stream: self._parse_patch(stream, max_file_bytes, max_total_bytes)
+        args += [base, target] if target else [base]
+        args.append("--")
+        if path:
+            args.append(path)
+
+        import git
+
+        changes = []
+        try:
+            process = repo.git.diff(*args, as_process=True)
+            for change in parser(process.stdout):
+                changes.append(change)
+            truncated = any(change.get("truncated") for change in changes)
+            if truncated:
+                # The rest of the patch is not needed
+                process.kill()
+            try:
+                process.wait()
+            except git.exc.GitCommandError:
+                if not truncated:
+                    raise
+        except Exception as e:
+            self.debug_print(e)
+            return action_result.set_status(phantom.APP_ERROR, f"Error while reading the diff: {e!s}")
+
+        summary = {"total_files": len(changes)}
+        for change in changes:
+            if mode == "patch":
+                change["patch"] = change["patch"].decode(errors="replace")
+            action_result.add_data(change)
+        if mode == "stat":
+            summary["additions"] = sum(change["additions"] for change in changes)
+            summary["deletions"] = sum(change["deletions"] for change in changes)
+        if mode == "patch":
+            summary["truncated"] = any(change["truncated"] for change in changes)
+        action_result.update_summary(summary)
+
+        compared = f"{base} and {target}" if target else f"the working tree and {base}"
+        return action_result.set_status(phantom.APP_SUCCESS, f"{len(changes)} files changed between {compared}")
 
     def _test_asset_connectivity(self, param):
         """This function tests the connectivity of an asset with given credentials.
@@ -920,13 +3033,16 @@ class GitConnector(BaseConnector):
         self._set_repo_attributes(param=param)
         self.save_progress(consts.GIT_CONNECTION_TEST_MSG)
         self.save_progress(f"Configured repo URI: {self.repo_uri}")
+        try:
+            self.save_progress("Using git {}".format(".".join(str(part) for part in self._git_version())))
+        except Exception as e:
+            self.save_progress(f"Unable to run git: {e!s}")
+            self.set_status(phantom.APP_ERROR, consts.GIT_TEST_CONNECTIVITY_FAIL)
+            return action_result.get_status()
 
-        remote_refs = []
-        g = git.cmd.Git()
-
-        # ls_remote function call the git command ls-remote
+        # Only the branches of the remote are listed, never its pull request refs or tags
         try:
-            repo_details = g.ls_remote(self.modified_repo_uri).split("\n")
+            remote_heads = self._remote_heads()
         except Exception:
             if not self.repo_uri:
                 self.save_progress(
@@ -939,17 +3055,7 @@ class GitConnector(BaseConnector):
             self.set_status(phantom.APP_ERROR, consts.GIT_TEST_CONNECTIVITY_FAIL)
             return action_result.get_status()
 
-        # create a list of refs
-        for ref in repo_details:
-            # if repo is empty
-            if ref:
-                remote_refs.append(ref.split("\t")[1])
-
-        # if branch name is not in ref_list it is invalid
-        for ref in remote_refs:
-            if self.branch_name == ref.split("/")[-1]:
-                break
-        else:
+        if self.branch_name not in remote_heads:
             self.save_progress("Invalid branch name")
             self.set_status(phantom.APP_ERROR, consts.GIT_TEST_CONNECTIVITY_FAIL)
             return action_result.get_status()
@@ -957,24 +3063,281 @@ class GitConnector(BaseConnector):
         self.set_status_save_progress(phantom.APP_SUCCESS, consts.GIT_TEST_CONNECTIVITY_SUCCESS)
         return action_result.get_status()
 
+    def _git_version(self):
+        """Return the version of the git executable as a tuple of integers.
+
+        The version is cached in the state along with the path, size and modification time of the executable, so
+        `git version` only runs again once git is upgraded or replaced.
+        """
+        # Found the way GitPython finds it, without importing GitPython, which runs `git version` when it is imported
+        executable = os.environ.get("GIT_PYTHON_GIT_EXECUTABLE") or "git"
+        executable = which(executable) or executable
+        try:
+            stat = os.stat(executable)
+            fingerprint = [executable, stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            fingerprint = None
+
+        cached = self._state.get(consts.GIT_STATE_GIT_VERSION, {})
+        if fingerprint and cached.get("executable") == fingerprint:
+            return tuple(cached["version"])
+
+        from git_traced_repo import TracedGit
+
+        version = TracedGit().version_info
+        if fingerprint:
+            self._state[consts.GIT_STATE_GIT_VERSION] = {"executable": fingerprint, "version": list(version)}
+        return version
+
+    def _remote_refs_cache_path(self):
+        """Return the file caching the branches of the current remote, keyed on its URL without credentials."""
+        remote = self._clean_remote_url(self.repo_uri).removesuffix(".git")
+        digest = hashlib.sha256(remote.encode()).hexdigest()[:16]
+        return self.app_state_dir / consts.GIT_REMOTE_REFS_DIR / f"{digest}.json"
+
+    def _cached_remote_heads(self, max_age=consts.GIT_REMOTE_REFS_TTL):
+        """Return the branches of the current remote from its last listing, or None if it is older than max_age seconds."""
+        try:
+            cached = json.loads(self._remote_refs_cache_path().read_text())
+            if time.time() - cached["listed_at"] < max_age:
+                return cached["heads"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _remote_heads(self):
+        """Query the branches of the current remote and return them as a dictionary of SHAs keyed by branch name.
+
+        Only refs/heads/ is requested, which servers speaking protocol v2 filter on their side, so pull request refs and
+        tags are never transferred. The result is cached in the state directory, where other actions can reuse it to
+        validate branch names without contacting the server.
+
+        :raises git.exc.GitCommandError: if the remote cannot be queried
+        """
+        cache_path = self._remote_refs_cache_path()
+
+        from git_traced_repo import TracedGit
+
+        self._start_ssh_master(self.modified_repo_uri)
+        output = TracedGit()(c="protocol.version=2").ls_remote("--heads", self.modified_repo_uri)
+        heads = {}
+        for line in output.splitlines():
+            sha, _, ref = line.partition("\t")
+            if ref.startswith("refs/heads/"):
+                heads[ref.removeprefix("refs/heads/")] = sha
+
+        # Write to a temporary file first, so that concurrent actions never read a partial cache
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps({"listed_at": time.time(), "heads": heads}))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            self.debug_print(f"Unable to save the remote branches: {e!s}")
+            tmp_path.unlink(missing_ok=True)
+        return heads
+
+    def _get_remote_tip(self):
+        """Return the SHA the configured remote branch points to, or None if it cannot be determined."""
+        try:
+            return self._remote_heads().get(self.branch_name)
+        except Exception as e:
+            self.debug_print(f"Unable to query the remote branch tip: {e!s}")
+            return None
+
+    def _save_changes(self, repo_name, base_sha, target_sha, changes, offset):
+        """Save a batch of changed files as a container with one artifact per file.
+
+        :return: status success/failure, error message
+        """
+        range_name = f"{base_sha[:7]}..{target_sha[:7]}"
+        container = {
+            "name": f"{repo_name} changes {range_name}",
+            "description": f"Files changed in {repo_name} between {base_sha} and {target_sha}",
+            "label": self.config.get("ingest", {}).get("container_label"),
+            "source_data_identifier": f"{repo_name}:{base_sha}..{target_sha}:{offset}",
+        }
+        status, message, container_id = self.save_container(container)
+        if phantom.is_fail(status):
+            return phantom.APP_ERROR, f"Unable to save the container: {message}"
+
+        artifacts = []
+        for path, change_type, old_sha, new_sha in changes:
+            artifacts.append(
+                {
+                    "name": f"File {change_type}",
+                    "label": "file",
+                    "container_id": container_id,
+                    "source_data_identifier": f"{target_sha}:{path}",
+                    "cef": {
+                        "repoName": repo_name,
+                        "filePath": path,
+                        "fileName": Path(path).name,
+                        "changeType": change_type,
+                        "oldBlobSha": old_sha.hex() if old_sha else None,
+                        "newBlobSha": new_sha.hex() if new_sha else None,
+                        "baseCommitSha": base_sha,
+                        "commitSha": target_sha,
+                    },
+                    "run_automation": False,
+                }
+            )
+        # Run the playbooks once the whole batch is in the container
+        if artifacts:
+            artifacts[-1]["run_automation"] = True
+        status, message, _ = self.save_artifacts(artifacts)
+        if phantom.is_fail(status):
+            return phantom.APP_ERROR, f"Unable to save the artifacts: {message}"
+        return phantom.APP_SUCCESS, None
+
+    def _ingest_changes(self, action_result, repo, max_files, tip_ref="HEAD"):
+        """Ingest the files changed since the last ingested commit, at most max_files per poll.
+
+        The first poll only records the current commit. A change set larger than max_files is ingested over several
+        polls, resuming from a checkpoint kept in the state.
+
+        :param tip_ref: ref of the commit to ingest up to
+        :return: status success/failure, number of ingested files, whether changes are left for the next poll
+        """
+        ingest_state = self._state.setdefault(consts.GIT_STATE_INGEST, {}).setdefault(self.repo_name, {})
+        query = RepoQuery(repo)
+        checkpoint = ingest_state.get("checkpoint")
+        if checkpoint:
+            base_sha, target_sha, offset = checkpoint["base"], checkpoint["target"], checkpoint["offset"]
+        else:
+            base_sha, target_sha, offset = ingest_state.get("ingested_sha"), query.resolve(tip_ref), 0
+
+        if not base_sha or not target_sha:
+            self.save_progress("Recording the current commit, files changed after it will be ingested")
+            ingest_state["ingested_sha"] = target_sha
+            return phantom.APP_SUCCESS, 0, False
+        if base_sha == target_sha:
+            return phantom.APP_SUCCESS, 0, False
+
+        try:
+            base_tree, target_tree = repo.commit(base_sha).tree.binsha, repo.commit(target_sha).tree.binsha
+            # One extra change tells whether another poll is needed
+            changes = list(islice(query.diff_trees(base_tree, target_tree), offset, offset + max_files + 1))
+        except Exception as e:
+            # e.g. the history was rewritten and the commit is gone, start over from the current commit
+            self.debug_print(f"Unable to compare {base_sha} with {target_sha}: {e!s}")
+            ingest_state.pop("checkpoint", None)
+            ingest_state["ingested_sha"] = query.resolve(tip_ref)
+            return action_result.set_status(phantom.APP_ERROR, f"Unable to find the files changed since {base_sha}: {e!s}"), 0, False
+
+        pending = len(changes) > max_files
+        changes = changes[:max_files]
+        if changes:
+            status, message = self._save_changes(self.repo_name, base_sha, target_sha, changes, offset)
+            if phantom.is_fail(status):
+                return action_result.set_status(phantom.APP_ERROR, message), 0, pending
+
+        if pending:
+            ingest_state["checkpoint"] = {"base": base_sha, "target": target_sha, "offset": offset + len(changes)}
+        else:
+            ingest_state.pop("checkpoint", None)
+            ingest_state["ingested_sha"] = target_sha
+        return phantom.APP_SUCCESS, len(changes), pending
+
     def _on_poll(self, param):
-        """This function will attempt to either perform a pull or clone depending on results of git status on a schedule
+        """This function will attempt to either perform a pull or clone depending on whether the repo exists on a schedule.
+            The pull is skipped when the remote branch tip has not moved since the last poll.
             _on_poll will make use of asset configs
         :param param: dictionary of input parameters
         """
 
         action_result = self.add_action_result(phantom.ActionResult(param))
+        self._set_repo_attributes(param=param)
 
-        resp_status, status_str, status_porcelain = self.__git_status(action_result=action_result, param=param)
+        ingest = str(param.get("ingest_changes", False)).lower() == "true"
+        ret_val, max_files = self._validate_integer(action_result, param.get("max_files"), "max_files")
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+        ret_val, maintenance_interval = self._validate_integer(
+            action_result, param.get("maintenance_interval"), "maintenance_interval", allow_zero=True
+        )
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        poll_mode = param.get("poll_mode") or consts.GIT_POLL_MODES[0]
+        if poll_mode not in consts.GIT_POLL_MODES:
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_INVALID_POLL_MODE_MSG.format(", ".join(consts.GIT_POLL_MODES)))
+        checkout = str(param.get("checkout", False)).lower() == "true"
+
+        poll_stats = self._state.setdefault(consts.GIT_STATE_POLL_STATS, {"skipped": 0, "updated": 0})
+        remote_tips = self._state.setdefault(consts.GIT_STATE_REMOTE_TIPS, {})
+        remote_tip = self._get_remote_tip()
+
+        resp_status, repo = self.verify_repo(self.repo_name, action_result)
         if phantom.is_fail(resp_status):
             clone_res = self.__clone_repo(action_result=action_result, param=param)
             if phantom.is_fail(clone_res):
                 return action_result.get_status()
+            poll_result = "cloned"
 
-        else:
+        elif repo.bare != (poll_mode == "mirror"):
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_POLL_MODE_MISMATCH_MSG.format(repo_name=self.repo_name))
+
+        elif remote_tip and remote_tips.get(self.repo_name) == remote_tip:
+            self.save_progress(f"Remote branch {self.branch_name} has not changed, skipping {poll_mode}")
+            poll_result = "skipped"
+
+        elif poll_mode == "pull":
             res_status, _, _ = self.__git_pull(action_result=action_result, param=param)
             if phantom.is_fail(res_status):
                 return action_result.get_status()
+            poll_result = "updated"
+
+        else:
+            if phantom.is_fail(self._fetch_polled_repo(action_result, repo, poll_mode, checkout)):
+                return action_result.get_status()
+            poll_result = "updated"
+
+        if remote_tip:
+            remote_tips[self.repo_name] = remote_tip
+        if poll_result in poll_stats:
+            poll_stats[poll_result] += 1
+
+        action_result.update_summary(
+            {
+                "poll_result": poll_result,
+                "poll_mode": poll_mode,
+                "remote_tip": remote_tip,
+                "total_skipped_polls": poll_stats["skipped"],
+                "total_updated_polls": poll_stats["updated"],
+            }
+        )
+
+        if ingest:
+            resp_status, repo = self.verify_repo(self.repo_name, action_result)
+            if phantom.is_fail(resp_status):
+                return action_result.get_status()
+            # Fetch-only clones and mirrors do not move HEAD, ingest up to the fetched branch instead
+            tip_ref = {"pull": "HEAD", "fetch": f"refs/remotes/origin/{self.branch_name}", "mirror": f"refs/heads/{self.branch_name}"}[poll_mode]
+            status, ingested_files, pending = self._ingest_changes(
+                action_result, repo, max_files or consts.GIT_INGEST_DEFAULT_MAX_FILES, tip_ref
+            )
+            if phantom.is_fail(status):
+                return action_result.get_status()
+            action_result.update_summary({"ingested_files": ingested_files, "pending_changes": pending})
+
+        if maintenance_interval:
+            last_maintenance = self._state.setdefault(consts.GIT_STATE_MAINTENANCE, {})
+            if poll_result == "cloned":
+                # A fresh clone is fully packed, start its schedule instead
+                last_maintenance[self.repo_name] = time.time()
+            elif time.time() - last_maintenance.get(self.repo_name, 0) >= maintenance_interval * 3600:
+                resp_status, repo = self.verify_repo(self.repo_name, action_result)
+                if phantom.is_fail(resp_status):
+                    return action_result.get_status()
+                # A failed maintenance leaves the repo as it was, it must not fail the poll
+                try:
+                    report = self._maintain_repo(repo)
+                    action_result.update_summary(
+                        {"maintenance_time": report["maintenance_time"], "size_after_maintenance": report["after"]["size"]}
+                    )
+                except Exception as e:
+                    self.debug_print(f"Scheduled maintenance of {self.repo_name} failed: {e!s}")
 
         return action_result.set_status(phantom.APP_SUCCESS)
 
@@ -985,33 +3348,104 @@ class GitConnector(BaseConnector):
         :return: status success/failure
         """
 
-        # Dictionary mapping each action with its corresponding actions
-        action_mapping = {
-            "clone_repo": self._clone_repo,
-            "delete_clone": self._delete_clone,
-            "delete_file": self._delete_file,
-            "git_pull": self._git_pull,
-            "add_file": self._add_file,
-            "git_push": self._git_push,
-            "list_repos": self._list_repos,
-            "git_commit": self._git_commit,
-            "update_file": self._update_file,
-            "configure_ssh": self._configure_ssh,
-            "git_status": self._git_status,
-            "git_checkout": self._git_checkout,
-            "on_poll": self._on_poll,
-            "test_asset_connectivity": self._test_asset_connectivity,
-        }
-
         action = self.get_action_identifier()
         action_execution_status = phantom.APP_SUCCESS
 
-        if action in action_mapping:
-            action_function = action_mapping[action]
-            action_execution_status = action_function(param)
+        if action in self.ACTION_HANDLERS:
+            action_function = getattr(self, self.ACTION_HANDLERS[action])
+            results_before = len(self.get_action_results())
+            lock = None
+            if action in consts.GIT_REPO_LOCKED_ACTIONS:
+                status, lock = self._acquire_repo_lock(param)
+                if phantom.is_fail(status):
+                    return status
+            try:
+                action_execution_status = action_function(param)
+            finally:
+                if lock:
+                    lock.release()
+            if self._repos:
+                self._record_repo_access([repo_dir.name for repo_dir in self._repos])
+            action_results = self.get_action_results()[results_before:]
+            if lock:
+                for action_result in action_results:
+                    action_result.update_summary({"lock_wait_time": lock.wait_time})
+            self._report_git_commands(action_results)
 
         return action_execution_status
 
+    def _acquire_repo_lock(self, param):
+        """Wait for the other actions modifying the repo of this action to finish.
+
+        :param param: dictionary on input parameters
+        :return: status success/failure, acquired RepoLock or None if the action does not target a repo
+        """
+        action_result = ActionResult(dict(param))
+        # The lock is polled, so a fraction of a second is as good a timeout as a whole number of seconds
+        lock_timeout = self.lock_timeout
+        try:
+            lock_timeout = consts.GIT_DEFAULT_LOCK_TIMEOUT if lock_timeout is None or lock_timeout == "" else float(lock_timeout)
+            valid = 0 <= lock_timeout < float("inf")
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            self.add_action_result(action_result)
+            return action_result.set_status(phantom.APP_ERROR, consts.GIT_NON_NEG_NUMBER_MSG.format(param=consts.GIT_CONFIG_LOCK_TIMEOUT)), None
+        self.lock_timeout = lock_timeout
+
+        # The handler reports an invalid repo itself
+        if phantom.is_fail(self._set_repo_attributes(param=param)):
+            return phantom.APP_SUCCESS, None
+        try:
+            repo_name = self._repo_dir().name
+        except ValueError:
+            return phantom.APP_SUCCESS, None
+
+        lock = self._repo_lock(repo_name)
+        try:
+            lock.acquire()
+        except RepoLockTimeout as e:
+            self.add_action_result(action_result)
+            return action_result.set_status(phantom.APP_ERROR, str(e)), None
+        if lock.wait_time:
+            self.save_progress(f"Waited {lock.wait_time} seconds for other actions on {repo_name} to finish")
+        return phantom.APP_SUCCESS, lock
+
+    def _report_git_commands(self, action_results):
+        """Add the git command timings of the action to its summary, the debug log and the optional trace file.
+
+        :param action_results: list of ActionResult objects added by the action
+        """
+        git_summary = self._git_trace.summary()
+        commands = self._git_trace.reset()
+        for action_result in action_results:
+            action_result.update_summary(git_summary)
+
+        for command in commands:
+            self.debug_print(
+                "git command: {} ({}s, exit code {}, {} bytes stdout, {} bytes stderr)".format(
+                    " ".join(command["argv"]), command["duration"], command["exit_code"], command["stdout_bytes"], command["stderr_bytes"]
+                )
+            )
+
+        if not commands or not self.config.get(consts.GIT_CONFIG_GIT_TRACE):
+            return
+
+        trace_path = self.app_state_dir / consts.GIT_TRACE_FILE
+        try:
+            # Keep a single previous generation once the trace grows past its size limit
+            if trace_path.is_file() and trace_path.stat().st_size > consts.GIT_TRACE_MAX_BYTES:
+                trace_path.replace(trace_path.with_name(f"{consts.GIT_TRACE_FILE}.1"))
+            timestamp = self._utc_now()
+            with trace_path.open("a") as trace_file:
+                for command in commands:
+                    trace_file.write(
+                        json.dumps(dict(command, time=timestamp, asset_id=self.get_asset_id(), action=self.get_action_identifier()))
+                    )
+                    trace_file.write("\n")
+        except OSError as e:
+            self.debug_print(f"Unable to write the git trace file: {e!s}")
+
     def finalize(self):
         """This function gets called once all the param dictionary elements are looped over and no more handle_action
         calls are left to be made. It gives the AppConnector a chance to loop through all the results that were
@@ -1019,6 +3453,11 @@ class GitConnector(BaseConnector):
         cleanup, disconnect from remote devices etc.
         """
 
+        for repo in self._repos.values():
+            repo.close()
+        self._repos.clear()
+
+        self.save_state(self._state)
         return phantom.APP_SUCCESS
 
 
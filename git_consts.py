@@ -18,6 +18,10 @@ GIT_CONFIG_BRANCH_NAME = "branch_name"
 GIT_CONFIG_USERNAME = "username"
 GIT_CONFIG_PASSWORD = "password"  # pragma: allowlist secret
 GIT_CONFIG_SSH_HOST_KEY = "ssh_host_key"
+GIT_CONFIG_GIT_TRACE = "git_trace"
+GIT_CONFIG_LOCK_TIMEOUT = "lock_timeout"
+GIT_CONFIG_SSH_MULTIPLEXING = "ssh_multiplexing"
+GIT_CONFIG_DISK_QUOTA = "disk_quota"
 GIT_CONNECTION_TEST_MSG = "Querying to verify the repo URI"
 GIT_TEST_CONNECTIVITY_FAIL = "Connectivity test failed"
 GIT_TEST_CONNECTIVITY_SUCCESS = "Connectivity test succeeded"
@@ -25,3 +29,149 @@ GIT_INVALID_URI_TYPE = "App only supports http(s) URI"
 GIT_USERNAME_AND_PASSWORD_REQUIRED = "Username and password are required in case of http(s) URI"  # pragma: allowlist secret
 GIT_URL_OR_CONFIG_REQUIRED = "You must either provide a URL to clone or configure the app with required information"
 GIT_SET_UPSTREAM_DETACHED_HEAD_MSG = "Unable to set upstream while in detached HEAD. Checkout a branch first"
+GIT_VALID_INT_MSG = "Please provide a valid integer value in the '{param}' parameter"
+GIT_NON_NEG_NON_ZERO_INT_MSG = "Please provide a valid non-zero positive integer value in the '{param}' parameter"
+GIT_NON_NEG_INT_MSG = "Please provide a valid non-negative integer value in the '{param}' parameter"
+GIT_NON_NEG_NUMBER_MSG = "Please provide a valid non-negative number in the '{param}' parameter"
+
+# SSH connection multiplexing
+GIT_SSH_CONTROL_PERSIST = 60  # seconds an idle master connection stays open
+GIT_SSH_CONTROL_SOCKET_PREFIX = "cm-"
+# Unix socket paths are limited to 108 bytes, ssh appends a 17 byte suffix while creating the socket
+GIT_SSH_MAX_CONTROL_PATH = 90
+GIT_SSH_CONTROL_EXIT_TIMEOUT = 10
+GIT_SSH_MASTER_START_TIMEOUT = 30
+# Lock files serializing the start of a master connection, named so that they never match the control socket prefix
+GIT_SSH_MASTER_LOCK_PREFIX = "lock-"
+
+# Repository maintenance, the tasks run in the given order
+GIT_MAINTENANCE_TASKS = ["pack-refs", "loose-objects", "incremental-repack", "commit-graph"]
+GIT_MAINTENANCE_MIN_VERSION = (2, 31)
+GIT_MAINTENANCE_VERSION_MSG = "Repository maintenance requires git 2.31 or later, found {}"
+
+# Remote branch listings
+GIT_REMOTE_REFS_DIR = ".remote-refs"
+GIT_REMOTE_REFS_TTL = 300
+
+# Clone options
+GIT_CLONE_FILTERS = ["blob:none", "tree:0"]
+GIT_INVALID_CLONE_FILTER_MSG = "Please provide a valid value in the 'filter' parameter. Supported values: {}"
+# Git configuration applied at clone time for each tuning profile
+GIT_TUNING_PROFILES = {
+    "none": {},
+    "large_repo": {
+        "feature.manyFiles": "true",
+        "index.version": "4",
+        "core.untrackedCache": "true",
+        "fetch.writeCommitGraph": "true",
+    },
+}
+GIT_INVALID_TUNING_PROFILE_MSG = "Please provide a valid value in the 'tuning_profile' parameter. Supported values: {}"
+
+# Shared object cache
+GIT_OBJECT_CACHE_DIR = ".object-cache"
+GIT_OBJECT_CACHE_INCOMPATIBLE_MSG = "The shared object cache cannot be combined with the 'depth' or 'filter' parameters"
+GIT_OBJECT_CACHE_PIN_PREFIX = "refs/clones"
+# Objects are only pruned from a cache by the gc of the 'refresh object cache' action, once the clones are pinned
+GIT_OBJECT_CACHE_CONFIG = {"gc.auto": "0", "maintenance.auto": "false"}
+
+# State file keys
+GIT_STATE_REMOTE_TIPS = "remote_tips"
+GIT_STATE_POLL_STATS = "poll_stats"
+GIT_STATE_INGEST = "ingest"
+GIT_STATE_GIT_VERSION = "git_version"
+GIT_STATE_MAINTENANCE = "last_maintenance"
+
+# Bulk file writes
+GIT_FILE_OPERATIONS = ["add", "update", "delete"]
+GIT_INVALID_FILES_PARAM_MSG = (
+    "Please provide a JSON list of objects with 'path', 'op' and 'contents' or 'vault_id' keys in the 'files' parameter"
+)
+GIT_INVALID_FILE_OP_MSG = "Invalid file operation. Supported values: {}"
+
+# Vault file copies
+GIT_FICLONE = 0x40049409  # ioctl request for a copy-on-write clone of a whole file
+GIT_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Repo manifest, kept in its own directory so that replacing it leaves the modification time of the state directory alone
+GIT_REPO_MANIFEST_DIR = ".manifest"
+GIT_REPO_MANIFEST = "repo_manifest.json"
+GIT_REPO_MANIFEST_LOCK = "repo_manifest.lock"
+# Seconds before the access time of a clone is written again, it only orders the clones for eviction
+GIT_REPO_ACCESS_INTERVAL = 3600
+
+# Git status
+GIT_STATUS_UNTRACKED_FILES = ["no", "normal", "all"]
+GIT_INVALID_UNTRACKED_FILES_MSG = "Please provide a valid value in the 'untracked_files' parameter. Supported values: {}"
+
+# Sync all repos
+GIT_SYNC_MODES = ["fetch", "pull"]
+GIT_INVALID_SYNC_MODE_MSG = "Please provide a valid value in the 'mode' parameter. Supported values: {}"
+GIT_SYNC_DEFAULT_WORKERS = 4
+GIT_SYNC_DEFAULT_TIMEOUT = 300
+
+# Git command trace
+GIT_TRACE_FILE = "git_trace.jsonl"
+GIT_TRACE_MAX_BYTES = 10 * 1024 * 1024
+
+# Commit files
+GIT_INVALID_COMMIT_IDENTITY_MSG = "Author name and email must not contain line breaks, null characters or angle brackets"
+GIT_COMMIT_FILES_DETACHED_HEAD_MSG = "HEAD is detached, please provide the branch to commit to"
+GIT_COMMIT_FILES_PARENT_MSG = "The parent commit must contain the tip of branch '{branch}', please pull and use a newer parent"
+
+# Push retries
+GIT_PUSH_DEFAULT_MAX_RETRIES = 3
+GIT_PUSH_RETRY_BASE_DELAY = 0.5
+GIT_PUSH_RETRY_MAX_DELAY = 8
+GIT_PUSH_REJECTED_REASONS = ["[rejected]", "non-fast-forward", "fetch first"]
+
+# Repo locks
+GIT_LOCK_DIR = ".locks"
+GIT_DEFAULT_LOCK_TIMEOUT = 300
+GIT_REPO_LOCKED_ACTIONS = [
+    "add_file",
+    "clone_repo",
+    "commit_files",
+    "delete_clone",
+    "delete_file",
+    "git_checkout",
+    "git_commit",
+    "git_pull",
+    "git_push",
+    "on_poll",
+    "run_maintenance",
+    "update_file",
+    "write_files",
+]
+
+# Get file
+GIT_BLOB_VAULT_CACHE = "blob_vault_cache.json"
+GIT_BLOB_VAULT_CACHE_MAX_ENTRIES = 5000
+
+# Git log
+GIT_LOG_FORMAT = "%H%x1f%P%x1f%an%x1f%ae%x1f%aI%x1f%s"
+GIT_LOG_DEFAULT_LIMIT = 100
+GIT_LOG_MAX_LIMIT = 1000
+GIT_INVALID_CURSOR_MSG = "Invalid cursor, please use the next_cursor value returned by a previous run of the action"
+
+# Git diff
+GIT_DIFF_MODES = ["name_status", "stat", "patch"]
+GIT_INVALID_DIFF_MODE_MSG = "Invalid mode. Supported values: {}"
+GIT_DIFF_DEFAULT_MAX_FILE_BYTES = 64 * 1024
+GIT_DIFF_DEFAULT_MAX_TOTAL_BYTES = 1024 * 1024
+
+# Search repos
+GIT_SEARCH_DEFAULT_MAX_MATCHES = 100
+GIT_SEARCH_DEFAULT_MAX_REPO_MATCHES = 20
+GIT_SEARCH_MAX_LINE_LENGTH = 500
+# Bytes of a match read from git grep: the path, the line number and the start of the line, which is cut anyway
+GIT_SEARCH_MAX_RECORD_BYTES = 8192
+
+# On poll ingestion
+GIT_INGEST_DEFAULT_MAX_FILES = 100
+
+# Poll modes
+GIT_POLL_MODES = ["pull", "fetch", "mirror"]
+GIT_INVALID_POLL_MODE_MSG = "Please provide a valid value in the 'poll_mode' parameter. Supported values: {}"
+GIT_POLL_MODE_MISMATCH_MSG = "Repo {repo_name} was cloned in a different poll mode, please delete it so that it is cloned again"
+GIT_MIRROR_REFSPEC = "+refs/heads/*:refs/heads/*"
@@ -0,0 +1,140 @@
+# File: git_repo_lock.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import fcntl
+import os
+import time
+import uuid
+from pathlib import Path
+
+
+MIN_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.2
+
+
+class RepoLockTimeout(Exception):
+    pass
+
+
+def _process_start_time(pid):
+    """Return the start time of a process, which tells it apart from a later process reusing its PID, or None if it is not
+    running."""
+    try:
+        # The command name in the second field may contain spaces, the start time is the 20th field after it
+        return Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[19]
+    except FileNotFoundError:
+        return None
+    except (OSError, IndexError):
+        pass
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    return ""
+
+
+class RepoLock:
+    """Advisory lock serializing the actions that modify a repository, shared by every process of the asset.
+
+    Waiters queue up in a file next to the lock and are served in arrival order. Entries record the PID and the start
+    time of their process, so the entry of an action that was killed is dropped as soon as another action looks at
+    the queue.
+    """
+
+    def __init__(self, lock_dir, name, timeout, on_stale=None):
+        """
+        :param lock_dir: directory holding the lock files
+        :param name: name of the lock, e.g. the repo name
+        :param timeout: seconds to wait for the lock before giving up
+        :param on_stale: function called once the lock is acquired if its previous holder died while holding it
+        """
+        self.queue_path = Path(lock_dir) / f"{name}.queue"
+        self.name = name
+        self.timeout = timeout
+        self.on_stale = on_stale
+        self.entry = None
+        self.wait_time = 0
+
+    def _update_queue(self, update):
+        """Apply a function to the entries of the queue under an exclusive lock and return its result.
+
+        :param update: function taking the list of entries, which it may modify in place
+        """
+        self.queue_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.queue_path.open("a+") as queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            queue.seek(0)
+            entries = [line for line in queue.read().splitlines() if line]
+            result = update(entries)
+            queue.seek(0)
+            queue.truncate()
+            queue.write("".join(f"{entry}\n" for entry in entries))
+            return result
+
+    def _take_turn(self, entries):
+        """Drop the entries of dead processes and return whether this entry is first in line, and whether the entry
+        that held the lock died."""
+        holder_died = False
+        for position, entry in reversed(list(enumerate(entries))):
+            pid, start_time, _ = entry.split(" ", 2)
+            if entry != self.entry and _process_start_time(int(pid)) != start_time:
+                entries.pop(position)
+                holder_died = holder_died or position == 0
+        if self.entry not in entries:
+            # The queue file was removed or truncated, queue up again
+            entries.append(self.entry)
+        return entries[0] == self.entry, holder_died
+
+    def acquire(self):
+        """Wait for this lock to be first in the queue.
+
+        :raises RepoLockTimeout: if the lock could not be acquired in time
+        """
+        pid = os.getpid()
+        self.entry = f"{pid} {_process_start_time(pid)} {uuid.uuid4().hex}"
+        self._update_queue(lambda entries: entries.append(self.entry))
+
+        start = time.monotonic()
+        interval = MIN_POLL_INTERVAL
+        stale = False
+        while True:
+            acquired, holder_died = self._update_queue(self._take_turn)
+            stale = stale or holder_died
+            if acquired:
+                break
+            if time.monotonic() - start >= self.timeout:
+                self.release()
+                raise RepoLockTimeout(f"Timed out after {self.timeout:g} seconds waiting for another action on {self.name} to finish")
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+        self.wait_time = round(time.monotonic() - start, 3)
+        if stale and self.on_stale:
+            self.on_stale()
+        return self
+
+    def release(self):
+        """Leave the queue, letting the next waiter in."""
+        if self.entry:
+            self._update_queue(lambda entries: self.entry in entries and entries.remove(self.entry))
+            self.entry = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *args):
+        self.release()
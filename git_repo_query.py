@@ -0,0 +1,147 @@
+# File: git_repo_query.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from pathlib import Path
+
+
+MAX_SYMREF_DEPTH = 5
+TREE_MODE = 0o40000
+GITLINK_MODE = 0o160000
+
+
+class RepoQuery:
+    """Answers common questions about a repository without spawning a git process per question.
+
+    HEAD and refs are read straight from the git directory and packed-refs. Object lookups go through the object
+    database of the repo, which keeps a single long-lived `git cat-file --batch-check` process per repository.
+    """
+
+    def __init__(self, repo):
+        """
+        :param repo: object of git.Repo class
+        """
+        self.repo = repo
+        self.git_dir = Path(repo.git_dir)
+        self.common_dir = Path(repo.common_dir)
+        self._packed_refs = None
+        self._trees = {}
+
+    def _read_packed_refs(self):
+        """Return the refs stored in packed-refs, keyed by ref name."""
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            try:
+                lines = (self.common_dir / "packed-refs").read_text().splitlines()
+            except OSError:
+                lines = []
+            for line in lines:
+                # Skip the header and the peeled values of annotated tags
+                if not line or line.startswith(("#", "^")):
+                    continue
+                sha, _, ref = line.partition(" ")
+                self._packed_refs[ref] = sha
+        return self._packed_refs
+
+    def _read_ref(self, ref):
+        """Return the raw value of a ref: a SHA, 'ref: <target>' for a symbolic ref, or None if it does not exist."""
+        if ".." in ref or ref.startswith("/"):
+            return None
+        ref_path = self.git_dir / ref if ref == "HEAD" else self.common_dir / ref
+        try:
+            return ref_path.read_text().strip()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return self._read_packed_refs().get(ref)
+
+    def symbolic_target(self, ref="HEAD"):
+        """Return the ref a symbolic ref points to, or None if it is detached or does not exist."""
+        value = self._read_ref(ref)
+        if value and value.startswith("ref: "):
+            return value[5:].strip()
+        return None
+
+    def resolve(self, ref="HEAD"):
+        """Return the SHA a ref points to, following symbolic refs, or None if it cannot be resolved."""
+        for _ in range(MAX_SYMREF_DEPTH):
+            value = self._read_ref(ref)
+            if not value:
+                return None
+            if not value.startswith("ref: "):
+                return value
+            ref = value[5:].strip()
+        return None
+
+    def branch_name(self):
+        """Return the checked-out branch name, or 'HEAD' when HEAD is detached like `git rev-parse --abbrev-ref HEAD`."""
+        target = self.symbolic_target("HEAD")
+        if target is None:
+            return "HEAD" if self._read_ref("HEAD") else None
+        return target.removeprefix("refs/heads/")
+
+    def branch_sha(self, branch_name):
+        """Return the SHA of a local branch, or None if it does not exist."""
+        return self.resolve(f"refs/heads/{branch_name}")
+
+    def remote_branch_sha(self, branch_name, remote="origin"):
+        """Return the SHA of a remote-tracking branch, or None if it does not exist."""
+        return self.resolve(f"refs/remotes/{remote}/{branch_name}")
+
+    def has_object(self, sha):
+        """Return whether the object database contains the given object."""
+        try:
+            self.repo.odb.info(bytes.fromhex(sha))
+            return True
+        except Exception:
+            return False
+
+    def tree_entries(self, binsha):
+        """Return the entries of a tree keyed by name, as (binsha, mode) tuples."""
+        if binsha is None:
+            return {}
+        if binsha not in self._trees:
+            from git.objects.fun import tree_entries_from_data
+
+            data = self.repo.odb.stream(binsha).read()
+            self._trees[binsha] = {name: (sha, mode) for sha, mode, name in tree_entries_from_data(data)}
+        return dict(self._trees[binsha])
+
+    def diff_trees(self, old_tree, new_tree, prefix=""):
+        """Yield the files that differ between two trees, in path order.
+
+        Subtrees with the same SHA on both sides are skipped without being read, so the cost depends on the size of the
+        change rather than the size of the trees. Submodules are ignored.
+
+        :param old_tree: binsha of the old tree, or None for an empty tree
+        :param new_tree: binsha of the new tree, or None for an empty tree
+        :param prefix: path of the trees inside the repository, used when recursing
+        :return: generator of (path, status, old binsha, new binsha) tuples, with status added, modified or deleted
+        """
+        old_entries = self.tree_entries(old_tree)
+        new_entries = self.tree_entries(new_tree)
+        for name in sorted(old_entries.keys() | new_entries.keys()):
+            old, new = old_entries.get(name), new_entries.get(name)
+            if old == new:
+                continue
+            path = f"{prefix}{name}"
+            old_subtree = old[0] if old and old[1] == TREE_MODE else None
+            new_subtree = new[0] if new and new[1] == TREE_MODE else None
+            if old_subtree or new_subtree:
+                yield from self.diff_trees(old_subtree, new_subtree, f"{path}/")
+            old_file = old if old and old[1] not in (TREE_MODE, GITLINK_MODE) else None
+            new_file = new if new and new[1] not in (TREE_MODE, GITLINK_MODE) else None
+            if old_file and new_file:
+                yield path, "modified", old_file[0], new_file[0]
+            elif new_file:
+                yield path, "added", None, new_file[0]
+            elif old_file:
+                yield path, "deleted", old_file[0], None
@@ -0,0 +1,72 @@
+# File: git_traced_repo.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import time
+
+import git
+
+from git_command_trace import GitCommandTrace, output_size
+
+
+class _TracedProcess:
+    """Wraps a git process started with as_process=True so that it is recorded once it is waited for."""
+
+    def __init__(self, process, trace, argv, start_time):
+        self._process = process
+        self._trace = trace
+        self._argv = argv
+        self._start_time = start_time
+
+    def __getattr__(self, attr):
+        return getattr(self._process, attr)
+
+    def wait(self, *args, **kwargs):
+        try:
+            status = self._process.wait(*args, **kwargs)
+        except git.exc.GitCommandError as e:
+            self._trace.record(self._argv, time.monotonic() - self._start_time, e.status, 0, output_size(e.stderr))
+            raise
+        self._trace.record(self._argv, time.monotonic() - self._start_time, status, 0, 0)
+        return status
+
+
+class TracedGit(git.cmd.Git):
+    """Git command wrapper that records every command it runs in the active trace."""
+
+    def execute(self, command, **kwargs):
+        trace = GitCommandTrace.active
+        if trace is None or kwargs.get("output_stream") is not None:
+            return super().execute(command, **kwargs)
+
+        argv = command if isinstance(command, (list, tuple)) else [command]
+        start_time = time.monotonic()
+
+        if kwargs.get("as_process"):
+            return _TracedProcess(super().execute(command, **kwargs), trace, argv, start_time)
+
+        with_extended_output = kwargs.pop("with_extended_output", False)
+        try:
+            status, stdout, stderr = super().execute(command, with_extended_output=True, **kwargs)
+        except git.exc.GitCommandError as e:
+            trace.record(argv, time.monotonic() - start_time, e.status, output_size(e.stdout), output_size(e.stderr))
+            raise
+
+        trace.record(argv, time.monotonic() - start_time, status, output_size(stdout), output_size(stderr))
+        return (status, stdout, stderr) if with_extended_output else stdout
+
+
+class TracedRepo(git.Repo):
+    """Repo whose git commands, including clone and init, are recorded in the active trace."""
+
+    GitCommandWrapperType = TracedGit
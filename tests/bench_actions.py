@@ -0,0 +1,210 @@
+# File: bench_actions.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Benchmark every action of the connector against a synthetic remote served over file://.
+
+Every action runs in a new Python process, like on the platform, which reports the latency of the action, the number
+of subprocesses and git commands it started, and the peak resident set size of the process and of its largest child.
+Linux counts the resident set of the parent at fork time towards a child, so the child figure only stands out once
+a git command grows past the size of the Python process.
+
+    python tests/bench_actions.py --files 5000 --depth 200 --binary-size 1048576 --output bench.json
+    python tests/bench_actions.py --clone-param '{"depth": 1, "filter": "blob:none"}'
+    python tests/bench_actions.py --vault-size 536870912
+"""
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import support
+
+
+def scenario(remote_path, clone_param=None, vault_id=None):
+    """Yield the label, action, parameters and whether the step can be repeated, for every step of the benchmark.
+
+    The steps run in order against the same asset, so later steps find the clone and the commits of earlier ones.
+    """
+    url = Path(remote_path).as_uri()
+    new_files = [{"path": f"bench/batch{index}.txt", "op": "add", "contents": f"batch {index}"} for index in range(20)]
+    yield "test_asset_connectivity", "test_asset_connectivity", {}, True
+    yield "configure_ssh", "configure_ssh", {}, False
+    yield "clone_repo", "clone_repo", dict(clone_param or {}), False
+    yield "refresh_object_cache", "refresh_object_cache", {"repo_url": url}, True
+    yield "list_repos", "list_repos", {}, True
+    yield "get_disk_usage", "get_disk_usage", {}, True
+    yield "git_status", "git_status", {}, True
+    yield "git_log", "git_log", {"limit": 100}, True
+    yield "get_file", "get_file", {"file_path": support.file_path(0)}, True
+    yield "search_repos", "search_repos", {"pattern": "revision 1", "fixed_string": True}, True
+    yield "update_file", "update_file", {"file_path": support.file_path(1), "contents": "updated"}, True
+    yield "add_file", "add_file", {"file_path": "bench/added.txt", "contents": "added"}, False
+    if vault_id:
+        yield "add_file_from_vault", "add_file", {"file_path": "bench/vault.bin", "vault_id": vault_id}, False
+    yield "delete_file", "delete_file", {"file_path": support.file_path(2)}, False
+    yield "write_files", "write_files", {"files": json.dumps(new_files)}, False
+    yield "git_diff", "git_diff", {"mode": "patch"}, True
+    yield "git_commit", "git_commit", {"message": "Benchmark commit"}, False
+    yield "git_push", "git_push", {}, False
+    yield (
+        "commit_files",
+        "commit_files",
+        {"files": json.dumps([dict(entry, op="update", contents="recommitted") for entry in new_files]), "message": "Batch", "push": True},
+        False,
+    )
+    yield "git_checkout", "git_checkout", {"branch_name": "main"}, True
+    yield "upstream_commit", None, {support.file_path(3): "changed upstream"}, False
+    yield "git_pull", "git_pull", {}, False
+    yield "sync_all_repos", "sync_all_repos", {"mode": "fetch"}, True
+    yield "upstream_commit", None, {support.file_path(4): "changed upstream"}, False
+    yield "on_poll", "on_poll", {"ingest_changes": True}, False
+    yield "on_poll_unchanged", "on_poll", {"ingest_changes": True}, True
+    yield "run_maintenance", "run_maintenance", {}, True
+    yield "delete_clone", "delete_clone", {}, False
+
+
+def run_worker():
+    """Run the action described by the JSON job on standard input and print its measurements as JSON."""
+    job = json.load(sys.stdin)
+    spawned = []
+    popen_init = subprocess.Popen.__init__
+
+    def counting_init(self, args, *popen_args, **popen_kwargs):
+        spawned.append(args)
+        popen_init(self, args, *popen_args, **popen_kwargs)
+
+    started = time.perf_counter()
+    import git_connector  # noqa: F401
+
+    import_time = time.perf_counter() - started
+    subprocess.Popen.__init__ = counting_init
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    runner = support.AppRunner(job["state_dir"], job["vault_dir"], job["config"])
+    started = time.perf_counter()
+    run = runner.run(job["action"], job["param"])
+    latency = time.perf_counter() - started
+
+    json.dump(
+        {
+            "status": run.status,
+            "message": run.message,
+            "latency": round(latency, 4),
+            "import_time": round(import_time, 4),
+            "subprocesses": len(spawned),
+            "git_commands": run.summary.get("git_commands", 0),
+            "git_time_by_command": run.summary.get("git_time_by_command", {}),
+            "rss_before_kb": rss_before,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "children_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        },
+        sys.stdout,
+    )
+
+
+def disk_usage_kb(path):
+    """Kilobytes allocated to the files below ``path``."""
+    return sum(entry.stat().st_blocks * 512 for entry in Path(path).rglob("*") if not entry.is_symlink()) // 1024
+
+
+def run_step(job):
+    """Run one action in a worker process and return its measurements."""
+    worker = subprocess.run(
+        [sys.executable, __file__, "--worker"], input=json.dumps(job), capture_output=True, text=True, check=False, cwd=support.APP_DIR
+    )
+    if worker.returncode:
+        return {"status": "failed", "message": worker.stderr.strip().rpartition("\n")[2]}
+    return json.loads(worker.stdout)
+
+
+def run_benchmark(args, work_dir):
+    """Create the synthetic remote in ``work_dir``, run every step of the scenario against it and return the report."""
+    remote_path = work_dir / "remote.git"
+    started = time.perf_counter()
+    url = support.make_remote(remote_path, files=args.files, depth=args.depth, binary_size=args.binary_size)
+    setup_time = time.perf_counter() - started
+
+    vault_id = support.add_to_vault(work_dir / "vault", args.vault_size) if args.vault_size else None
+    config = {"repo_uri": url, "branch_name": "main", "ssh_multiplexing": False}
+    job = {"state_dir": str(work_dir / "state"), "vault_dir": str(work_dir / "vault"), "config": config}
+    steps = []
+    for label, action, param, repeatable in scenario(remote_path, args.clone_param, vault_id):
+        if action is None:
+            support.commit_to_remote(remote_path, param, message=label)
+            continue
+        runs = [run_step(dict(job, action=action, param=param)) for _ in range(args.repeat if repeatable else 1)]
+        step = dict(runs[-1], label=label, action=action, runs=len(runs))
+        latencies = [run["latency"] for run in runs if "latency" in run]
+        if latencies:
+            step["latency"] = round(statistics.median(latencies), 4)
+            step["latencies"] = latencies
+        if action == "clone_repo":
+            step["clone_size_kb"] = disk_usage_kb(Path(job["state_dir"]) / f"{remote_path.stem}_main")
+        steps.append(step)
+        print(f"{label}: {step['status']} {step.get('latency')}s", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "git_version": support.git("version").strip(),
+        "remote": {
+            "files": args.files,
+            "depth": args.depth,
+            "binary_size": args.binary_size,
+            "vault_size": args.vault_size,
+            "setup_time": round(setup_time, 4),
+        },
+        "clone_param": args.clone_param,
+        "repeat": args.repeat,
+        "steps": steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000, help="number of text files in the synthetic remote")
+    parser.add_argument("--depth", type=int, default=50, help="number of commits in the synthetic remote")
+    parser.add_argument("--binary-size", type=int, default=0, help="bytes of the binary file rewritten by every commit")
+    parser.add_argument("--vault-size", type=int, default=0, help="bytes of a vault file added to the repo")
+    parser.add_argument("--clone-param", type=json.loads, help="JSON parameters of the clone, e.g. '{\"depth\": 1}'")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every step that leaves the repo unchanged")
+    parser.add_argument("--work-dir", type=Path, help="keep the remote and the state directory in this directory")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file instead of standard output")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker()
+
+    if args.work_dir:
+        args.work_dir.mkdir(parents=True)
+        report = run_benchmark(args, args.work_dir.resolve())
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = run_benchmark(args, Path(work_dir))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
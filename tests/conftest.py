@@ -0,0 +1,40 @@
+# File: conftest.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import pytest
+import support
+
+
+@pytest.fixture
+def remote_path(tmp_path):
+    """Bare repository with a short synthetic history on its main branch."""
+    path = tmp_path / "remote.git"
+    support.make_remote(path, files=20, depth=5)
+    return path
+
+
+@pytest.fixture
+def remote_url(remote_path):
+    return remote_path.as_uri()
+
+
+@pytest.fixture
+def app(tmp_path, remote_url, monkeypatch):
+    """Runner for the actions of an asset configured with the synthetic remote."""
+    monkeypatch.delenv("GIT_SSH_COMMAND", raising=False)
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Test Author")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "author@example.com")
+    return support.AppRunner(tmp_path / "state", tmp_path / "vault", {"repo_uri": remote_url, "branch_name": "main"})
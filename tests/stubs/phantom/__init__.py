@@ -0,0 +1,19 @@
+# File: __init__.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Minimal stand-in for the SOAR platform modules used by the connector, so its actions can run outside SOAR.
+
+The state directory and the vault live under the directories named by the ``PHANTOM_STATE_DIR`` and
+``PHANTOM_VAULT_DIR`` environment variables.
+"""
@@ -0,0 +1,29 @@
+# File: app.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from phantom.action_result import ActionResult
+
+
+APP_SUCCESS = True
+APP_ERROR = False
+
+__all__ = ["APP_ERROR", "APP_SUCCESS", "ActionResult", "is_fail", "is_success"]
+
+
+def is_fail(status):
+    return not status
+
+
+def is_success(status):
+    return bool(status)
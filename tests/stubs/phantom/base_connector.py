@@ -0,0 +1,140 @@
+# File: base_connector.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+import os
+import sys
+from pathlib import Path
+
+
+class BaseConnector:
+    """Runs the actions of a connector the way the platform does, one ``_handle_action`` call per action run."""
+
+    def __init__(self):
+        self._config = {}
+        self._action = None
+        self._asset_id = None
+        self._action_results = []
+        self._status = True
+        self._status_message = ""
+        self.containers = []
+        self.artifacts = []
+        self.progress = []
+        self.debug = []
+
+    def _handle_action(self, in_json, handle):
+        in_json = json.loads(in_json)
+        self._config = in_json.get("config", {})
+        self._action = in_json.get("identifier")
+        self._asset_id = str(in_json.get("asset_id", "1"))
+        self._action_results = []
+        if self.initialize():
+            for param in in_json.get("parameters") or [{}]:
+                self.handle_action(param)
+        self.finalize()
+        results = [action_result.get_dict() for action_result in self._action_results]
+        if not results:
+            # Actions that do not add a result report the status of the connector
+            status = "success" if self._status else "failed"
+            results = [{"status": status, "message": self._status_message, "data": [], "summary": {}, "parameter": {}}]
+        return json.dumps(results, default=str)
+
+    def initialize(self):
+        return True
+
+    def finalize(self):
+        return True
+
+    def get_config(self):
+        return self._config
+
+    def get_action_identifier(self):
+        return self._action
+
+    def get_asset_id(self):
+        return self._asset_id
+
+    def get_app_id(self):
+        return self.get_app_json().get("appid")
+
+    def get_container_id(self):
+        return 1
+
+    def get_app_json(self):
+        app_dir = Path(sys.modules[type(self).__module__].__file__).parent
+        for json_path in sorted(app_dir.glob("*.json")):
+            app_json = json.loads(json_path.read_text())
+            if isinstance(app_json, dict) and "appid" in app_json:
+                return app_json
+        return {}
+
+    def get_state_dir(self):
+        state_dir = Path(os.environ["PHANTOM_STATE_DIR"])
+        state_dir.mkdir(parents=True, exist_ok=True)
+        return str(state_dir)
+
+    def _state_file_path(self):
+        return Path(self.get_state_dir()) / f"{self.get_asset_id()}_state.json"
+
+    def load_state(self):
+        try:
+            return json.loads(self._state_file_path().read_text())
+        except FileNotFoundError:
+            return {}
+
+    def save_state(self, state):
+        self._state_file_path().write_text(json.dumps(state))
+        return True
+
+    def add_action_result(self, action_result):
+        self._action_results.append(action_result)
+        return action_result
+
+    def get_action_results(self):
+        return self._action_results
+
+    def save_progress(self, message, *args, **kwargs):
+        self.progress.append(message)
+
+    def send_progress(self, message, *args, **kwargs):
+        self.progress.append(message)
+
+    def debug_print(self, message, dump_object=""):
+        self.debug.append(f"{message} {dump_object}".rstrip())
+
+    def error_print(self, message, dump_object=""):
+        self.debug.append(f"{message} {dump_object}".rstrip())
+
+    def set_status(self, status, status_message="", exception=None):
+        self._status = status
+        self._status_message = status_message
+        return status
+
+    def set_status_save_progress(self, status, status_message="", exception=None):
+        self.progress.append(status_message)
+        return self.set_status(status, status_message)
+
+    def get_status(self):
+        return self._status
+
+    def is_poll_now(self):
+        return False
+
+    def save_container(self, container):
+        self.containers.append(container)
+        return True, "Container saved", len(self.containers)
+
+    def save_artifacts(self, artifacts):
+        self.artifacts.extend(artifacts)
+        return True, "Artifacts saved", list(range(len(self.artifacts) - len(artifacts), len(self.artifacts)))
@@ -0,0 +1,41 @@
+# File: rules.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+
+def _vault_dir():
+    vault_dir = Path(os.environ["PHANTOM_VAULT_DIR"])
+    vault_dir.mkdir(parents=True, exist_ok=True)
+    return vault_dir
+
+
+def vault_info(vault_id=None, container_id=None, file_name=None):
+    path = _vault_dir() / str(vault_id)
+    if not vault_id or not path.is_file():
+        return False, "Vault file not found", []
+    return True, "Vault file found", [{"vault_id": vault_id, "path": str(path), "name": file_name or vault_id, "size": path.stat().st_size}]
+
+
+def vault_add(container=None, file_location=None, file_name=None, metadata=None, trace=False):
+    digest = hashlib.sha1()
+    with open(file_location, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    vault_id = digest.hexdigest()
+    shutil.copyfile(file_location, _vault_dir() / vault_id)
+    return True, "File added to the vault", vault_id
@@ -0,0 +1,24 @@
+# File: vault.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import os
+from pathlib import Path
+
+
+class Vault:
+    @staticmethod
+    def get_vault_tmp_dir():
+        tmp_dir = Path(os.environ["PHANTOM_VAULT_DIR"]) / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return str(tmp_dir)
@@ -0,0 +1,182 @@
+# File: support.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Helpers shared by the tests and the action benchmark: synthetic remotes and a runner for connector actions."""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+TESTS_DIR = Path(__file__).resolve().parent
+APP_DIR = TESTS_DIR.parent
+STUBS_DIR = TESTS_DIR / "stubs"
+
+for import_dir in (APP_DIR, STUBS_DIR):
+    if str(import_dir) not in sys.path:
+        sys.path.insert(0, str(import_dir))
+
+AUTHOR = b"Test Author <author@example.com>"
+
+
+def git(*args, cwd=None, input=None):
+    """Run a git command and return its standard output as text."""
+    return subprocess.run(["git", *map(str, args)], cwd=cwd, input=input, check=True, capture_output=True).stdout.decode()
+
+
+def _fast_import(repo_path, commands):
+    """Feed the fast-import commands yielded by ``commands`` into the repository at ``repo_path``."""
+    process = subprocess.Popen(["git", "-C", str(repo_path), "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    try:
+        for command in commands:
+            process.stdin.write(command)
+    finally:
+        process.stdin.close()
+    if process.wait():
+        raise RuntimeError(f"git fast-import failed in {repo_path}")
+
+
+def _commit_header(ref, message, parent=None):
+    message = message.encode()
+    header = b"commit %s\ncommitter %s %d +0000\ndata %d\n%s\n" % (ref.encode(), AUTHOR, int(time.time()), len(message), message)
+    if parent:
+        header += b"from %s\n" % parent.encode()
+    return header
+
+
+def _file_command(path, data):
+    if data is None:
+        return b"D %s\n" % path.encode()
+    return b"M 100644 inline %s\ndata %d\n%s\n" % (path.encode(), len(data), data)
+
+
+def file_path(index):
+    """Path of the ``index``-th text file of a synthetic remote."""
+    return f"src/d{index % 32:02d}/file{index:05d}.txt"
+
+
+def make_remote(path, files=10, depth=3, binary_size=0, branch="main"):
+    """Create a bare repository with a synthetic history and return its file:// URL.
+
+    The first commit adds ``files`` text files, every later commit rewrites a tenth of them. With a ``binary_size``
+    every commit also rewrites ``assets/blob.bin`` with that many random bytes.
+    """
+    path = Path(path)
+    git("init", "-q", "--bare", "-b", branch, path)
+    git("-C", path, "config", "uploadpack.allowFilter", "true")
+    git("-C", path, "config", "uploadpack.allowAnySHA1InWant", "true")
+
+    def commands():
+        step = max(files // 10, 1)
+        for revision in range(depth):
+            yield _commit_header(f"refs/heads/{branch}", f"Revision {revision}")
+            indexes = range(files) if not revision else range(revision % step, files, step)
+            for index in indexes:
+                yield _file_command(file_path(index), f"file {index} revision {revision}\n".encode() * 20)
+            if binary_size:
+                yield _file_command("assets/blob.bin", os.urandom(binary_size))
+            yield b"\n"
+
+    _fast_import(path, commands())
+    return path.as_uri()
+
+
+def commit_to_remote(path, changes, message="Upstream change", branch="main"):
+    """Commit ``changes``, a mapping of path to new contents or None to delete it, on top of a branch of a bare repository.
+
+    :return: SHA of the new commit
+    """
+
+    def commands():
+        yield _commit_header(f"refs/heads/{branch}", message, parent=f"refs/heads/{branch}^0")
+        for changed_path, data in changes.items():
+            yield _file_command(changed_path, data if data is None or isinstance(data, bytes) else data.encode())
+        yield b"\n"
+
+    _fast_import(path, commands())
+    return git("-C", path, "rev-parse", branch).strip()
+
+
+def add_to_vault(vault_dir, size, chunk=b"\x00\\n\xff" * 21845):
+    """Add a file of ``size`` bytes to the vault, written in chunks, and return its vault ID."""
+    vault_dir = Path(vault_dir)
+    vault_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1()
+    tmp_path = vault_dir / "adding"
+    with tmp_path.open("wb") as vault_file:
+        for offset in range(0, size, len(chunk)):
+            data = chunk[: size - offset]
+            digest.update(data)
+            vault_file.write(data)
+    vault_id = digest.hexdigest()
+    tmp_path.rename(vault_dir / vault_id)
+    return vault_id
+
+
+class ActionRun:
+    """Outcome of running an action: the action results as the platform reports them and the connector that ran it."""
+
+    def __init__(self, connector, results):
+        self.connector = connector
+        self.results = results
+
+    @property
+    def result(self):
+        return self.results[0]
+
+    @property
+    def status(self):
+        return self.result["status"]
+
+    @property
+    def message(self):
+        return self.result["message"]
+
+    @property
+    def summary(self):
+        return self.result["summary"]
+
+    @property
+    def data(self):
+        return self.result["data"]
+
+
+class AppRunner:
+    """Run actions of one asset, each with a fresh connector the way the platform runs every action in a new process."""
+
+    def __init__(self, state_dir, vault_dir, config):
+        self.state_dir = Path(state_dir)
+        self.vault_dir = Path(vault_dir)
+        self.config = dict(config)
+
+    def run(self, action, param=None, **config):
+        from git_connector import GitConnector
+
+        os.environ["PHANTOM_STATE_DIR"] = str(self.state_dir)
+        os.environ["PHANTOM_VAULT_DIR"] = str(self.vault_dir)
+        connector = GitConnector()
+        in_json = {"identifier": action, "asset_id": "1", "config": dict(self.config, **config), "parameters": [param or {}]}
+        results = json.loads(connector._handle_action(json.dumps(in_json), None))
+        return ActionRun(connector, results)
+
+    def repo_dir(self, remote_url, branch="main"):
+        """Directory the connector clones a branch of ``remote_url`` into."""
+        return self.state_dir / f"{Path(remote_url).name.removesuffix('.git')}_{branch}"
+
+    def vault_file(self, vault_id):
+        return self.vault_dir / vault_id
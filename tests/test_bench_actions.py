@@ -0,0 +1,31 @@
+# File: test_bench_actions.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import argparse
+import json
+
+import bench_actions
+import support
+
+
+def test_benchmark_runs_every_action(tmp_path):
+    args = argparse.Namespace(files=20, depth=3, binary_size=1024, vault_size=4096, clone_param=None, repeat=1)
+    report = bench_actions.run_benchmark(args, tmp_path)
+
+    actions = {action["identifier"] for action in json.loads((support.APP_DIR / "git.json").read_text())["actions"]}
+    assert {step["action"] for step in report["steps"]} == actions
+    for step in report["steps"]:
+        assert step["status"] == "success", step
+        assert step["latency"] >= 0
+        assert step["peak_rss_kb"] > 0
@@ -0,0 +1,127 @@
+# File: test_clone_options.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+from support import commit_to_remote, file_path, git
+
+
+def commit_count(repo_dir, ref="HEAD"):
+    return int(git("-C", repo_dir, "rev-list", "--count", ref))
+
+
+def is_shallow(repo_dir):
+    return git("-C", repo_dir, "rev-parse", "--is-shallow-repository").strip() == "true"
+
+
+def missing_objects(repo_dir):
+    return [line for line in git("-C", repo_dir, "rev-list", "--objects", "--all", "--missing=print").splitlines() if line[0] == "?"]
+
+
+def test_shallow_clone_pulls_new_commits_without_deepening(app, remote_path, remote_url):
+    assert app.run("clone_repo", {"depth": 1}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+    assert is_shallow(repo_dir)
+    assert commit_count(repo_dir) == 1
+
+    tip = commit_to_remote(remote_path, {"new.txt": "first"})
+    tip = commit_to_remote(remote_path, {"new.txt": "second"})
+    run = app.run("git_pull")
+
+    assert run.status == "success"
+    assert git("-C", repo_dir, "rev-parse", "HEAD").strip() == tip
+    assert is_shallow(repo_dir)
+    assert commit_count(repo_dir) == 3
+    assert run.summary["git_time_by_command"].keys() == {"pull"}
+
+
+def test_shallow_clone_fetches_full_history_once_remote_is_rewritten(app, remote_path, remote_url):
+    assert app.run("clone_repo", {"depth": 1}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+    git("-C", repo_dir, "config", "pull.rebase", "false")
+    files = json.dumps([{"path": "local.txt", "op": "add", "contents": "local"}])
+    assert app.run("commit_files", {"files": files, "message": "Local change"}).status == "success"
+
+    # The shallow commit is no longer on the remote branch, only an older commit connects both histories
+    git("-C", remote_path, "update-ref", "refs/heads/main", "main~3")
+    upstream_tip = commit_to_remote(remote_path, {"upstream.txt": "upstream"})
+    run = app.run("git_pull")
+
+    assert run.status == "success"
+    # The failed pull, a single fetch of the full history and the pull again
+    assert run.summary["git_commands"] == 3
+    assert not is_shallow(repo_dir)
+    assert git("-C", repo_dir, "merge-base", "--is-ancestor", upstream_tip, "HEAD") == ""
+    assert (repo_dir / "local.txt").read_text() == "local"
+
+
+def test_single_branch_clone_without_tags(app, remote_path, remote_url):
+    git("-C", remote_path, "branch", "other", "main~1")
+    git("-C", remote_path, "tag", "v1", "main~2")
+
+    assert app.run("clone_repo", {"single_branch": True, "no_tags": True}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+
+    assert git("-C", repo_dir, "for-each-ref", "refs/remotes/origin/other") == ""
+    assert git("-C", repo_dir, "tag") == ""
+
+
+def test_blobless_clone_fetches_old_contents_on_demand(app, remote_url):
+    assert app.run("clone_repo", {"filter": "blob:none"}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+    assert missing_objects(repo_dir)
+
+    run = app.run("get_file", {"file_path": file_path(0), "ref": "HEAD~4"})
+    assert run.status == "success"
+    assert app.vault_file(run.data[0]["vault_id"]).read_text() == "file 0 revision 0\n" * 20
+
+    run = app.run("git_diff", {"base": "HEAD~4", "target": "HEAD", "mode": "patch"})
+    assert run.status == "success"
+    assert run.summary["total_files"] == 20
+
+
+def test_treeless_clone_reports_status_and_history(app, remote_url):
+    assert app.run("clone_repo", {"filter": "tree:0"}).status == "success"
+
+    assert app.run("git_status").data[0]["untracked_files"] == []
+    run = app.run("git_log", {"path": file_path(1)})
+    assert run.status == "success"
+    assert [commit["subject"] for commit in run.data] == ["Revision 3", "Revision 1", "Revision 0"]
+
+
+def test_on_poll_keeps_shallow_partial_clone_up_to_date(app, remote_path, remote_url):
+    param = {"depth": 1, "filter": "blob:none", "single_branch": True}
+    assert app.run("on_poll", param).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+
+    tip = commit_to_remote(remote_path, {file_path(3): "changed upstream"})
+    assert app.run("on_poll", param).status == "success"
+
+    assert git("-C", repo_dir, "rev-parse", "HEAD").strip() == tip
+    assert (repo_dir / file_path(3)).read_text() == "changed upstream"
+    assert is_shallow(repo_dir)
+
+
+def test_clone_checks_the_branch_against_a_recent_listing_only(app):
+    run = app.run("clone_repo")
+    assert run.status == "success"
+    assert "ls-remote" not in run.summary["git_time_by_command"]
+
+    assert app.run("test_asset_connectivity").status == "success"
+    run = app.run("clone_repo", {"branch": "missing"})
+
+    # The listing made by the connectivity test answers without contacting the remote
+    assert run.status == "failed"
+    assert run.message == "Branch name is invalid/incorrect"
+    assert run.summary["git_commands"] == 0
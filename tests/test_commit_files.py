@@ -0,0 +1,109 @@
+# File: test_commit_files.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+import pytest
+from support import commit_to_remote, file_path, git
+
+
+@pytest.fixture
+def repo_dir(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    return app.repo_dir(remote_url)
+
+
+def commit_files(app, *entries, **param):
+    return app.run("commit_files", dict(param, files=json.dumps(entries), message="Commit files"))
+
+
+def tree(repo_dir, ref="main"):
+    return git("-C", repo_dir, "ls-tree", "-r", "--name-only", ref).splitlines()
+
+
+def test_parent_must_contain_the_branch_tip(app, repo_dir):
+    tip = git("-C", repo_dir, "rev-parse", "main").strip()
+
+    run = commit_files(app, {"path": "new.txt", "op": "add", "contents": "new"}, parent="main~2")
+
+    assert run.status == "failed"
+    assert "must contain the tip of branch 'main'" in run.message
+    assert git("-C", repo_dir, "rev-parse", "main").strip() == tip
+
+    run = commit_files(app, {"path": "new.txt", "op": "add", "contents": "new"}, parent=tip)
+
+    assert run.status == "success"
+    assert git("-C", repo_dir, "rev-parse", "main~1").strip() == tip
+
+
+def test_file_and_directory_conflicts_fail_their_rows(app, repo_dir):
+    run = commit_files(
+        app,
+        {"path": "x", "op": "add", "contents": "file"},
+        {"path": "x/y", "op": "add", "contents": "below a file of the batch"},
+        {"path": "src/d01", "op": "add", "contents": "in place of a directory"},
+        {"path": f"{file_path(1)}/y", "op": "add", "contents": "below a file of the parent"},
+        {"path": file_path(2), "op": "delete"},
+        {"path": f"{file_path(2)}/y", "op": "add", "contents": "in place of a deleted file"},
+    )
+
+    assert run.status == "success"
+    assert [row["status"] for row in run.data] == ["success", "failed", "failed", "failed", "success", "success"]
+    assert "'x' is a file" in run.data[1]["message"]
+    assert "'src/d01' is a directory" in run.data[2]["message"]
+    assert run.summary["successful"] == 3
+    files = tree(repo_dir)
+    assert "x" in files
+    assert f"{file_path(2)}/y" in files
+    assert file_path(1) in files
+    assert file_path(2) not in files
+    assert "src/d01" not in files
+
+
+def test_directory_emptied_by_the_batch_can_become_a_file(app, repo_dir):
+    directory = "src/d05"
+    deletes = [{"path": path, "op": "delete"} for path in tree(repo_dir) if path.startswith(f"{directory}/")]
+
+    run = commit_files(
+        app, {"path": directory, "op": "add", "contents": "too early"}, *deletes, {"path": directory, "op": "add", "contents": "file"}
+    )
+
+    assert [row["status"] for row in run.data] == ["failed"] + ["success"] * len(deletes) + ["success"]
+    assert git("-C", repo_dir, "show", f"main:{directory}") == "file"
+
+
+def test_push_replays_only_the_changes_that_still_apply(app, repo_dir, remote_path):
+    remote_tip = commit_to_remote(remote_path, {"new.txt": "added upstream", file_path(2): None, file_path(4): None, "upstream/x": "file"})
+
+    run = commit_files(
+        app,
+        {"path": "new.txt", "op": "add", "contents": "added locally"},
+        {"path": file_path(2), "op": "delete"},
+        {"path": file_path(3), "op": "update", "contents": "updated locally"},
+        {"path": file_path(4), "op": "update", "contents": "updated locally"},
+        {"path": "upstream", "op": "add", "contents": "in place of an upstream directory"},
+        push=True,
+        retry_on_reject=True,
+    )
+
+    assert run.status == "success"
+    assert [row["status"] for row in run.data] == ["failed", "failed", "success", "failed", "failed"]
+    assert "added on the remote branch" in run.data[0]["message"]
+    assert "deleted on the remote branch" in run.data[1]["message"]
+    assert run.summary["successful"] == 1
+    assert run.summary["failed"] == 4
+    assert git("-C", remote_path, "rev-parse", "main~1").strip() == remote_tip
+    assert git("-C", remote_path, "show", "main:new.txt") == "added upstream"
+    assert git("-C", remote_path, "show", f"main:{file_path(3)}") == "updated locally"
+    assert git("-C", remote_path, "diff", "--name-only", remote_tip, "main").splitlines() == [file_path(3)]
@@ -0,0 +1,66 @@
+# File: test_disk_quota.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+import os
+
+import pytest
+from support import commit_to_remote, make_remote
+
+import git_consts as consts
+
+
+def manifest_path(state_dir):
+    return state_dir / consts.GIT_REPO_MANIFEST_DIR / consts.GIT_REPO_MANIFEST
+
+
+def test_eviction_keeps_the_poll_state(app, tmp_path, remote_path, remote_url):
+    assert app.run("on_poll", {"ingest_changes": True}).status == "success"
+    other_url = make_remote(tmp_path / "other.git")
+
+    run = app.run("clone_repo", {"repo_url": other_url}, disk_quota=0.001)
+    assert run.summary["evicted_repos"] == ["remote_main"]
+    state = json.loads((app.state_dir / "1_state.json").read_text())
+    assert "remote_main" in state[consts.GIT_STATE_INGEST]
+
+    # Once cloned again, the poll ingests what changed since the commit ingested before the eviction
+    commit_to_remote(remote_path, {"new.txt": "new"})
+    run = app.run("on_poll", {"ingest_changes": True})
+    assert run.summary["poll_result"] == "cloned"
+    assert run.summary["ingested_files"] == 1
+
+
+@pytest.mark.parametrize("poll_mode", ["fetch", "mirror"])
+def test_clones_without_a_working_tree_are_evicted(app, tmp_path, poll_mode):
+    assert app.run("on_poll", {"poll_mode": poll_mode}).status == "success"
+    other_url = make_remote(tmp_path / "other.git")
+
+    run = app.run("clone_repo", {"repo_url": other_url}, disk_quota=0.001)
+    assert run.summary["evicted_repos"] == ["remote_main"]
+    assert not (app.state_dir / "remote_main").exists()
+
+
+def test_access_time_is_only_written_once_it_is_stale(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    written = os.stat(manifest_path(app.state_dir)).st_ino
+
+    assert app.run("git_log").status == "success"
+    assert os.stat(manifest_path(app.state_dir)).st_ino == written
+
+    manifest = json.loads(manifest_path(app.state_dir).read_text())
+    manifest["repos"]["remote_main"]["last_access"] = "2000-01-01T00:00:00Z"
+    manifest_path(app.state_dir).write_text(json.dumps(manifest))
+    assert app.run("git_log").status == "success"
+    last_access = json.loads(manifest_path(app.state_dir).read_text())["repos"]["remote_main"]["last_access"]
+    assert last_access > "2000-01-01T00:00:00Z"
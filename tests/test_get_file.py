@@ -0,0 +1,34 @@
+# File: test_get_file.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+from support import file_path
+
+
+def test_vault_ids_are_cached_in_a_replaced_file(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    cache_path = app.state_dir / "blob_vault_cache.json"
+
+    first = app.run("get_file", {"file_path": file_path(1)})
+    inode = cache_path.stat().st_ino
+    second = app.run("get_file", {"file_path": file_path(1)})
+
+    assert first.status == second.status == "success"
+    assert (first.summary["cached"], second.summary["cached"]) == (False, True)
+    assert second.summary["vault_id"] == first.summary["vault_id"]
+    # The cache is replaced rather than rewritten in place, so a concurrent reader never sees a partial file
+    assert cache_path.stat().st_ino != inode
+    assert list(json.loads(cache_path.read_text()).values()) == [first.summary["vault_id"]]
+    assert not list(app.state_dir.glob("blob_vault_cache.json.*"))
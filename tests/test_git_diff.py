@@ -0,0 +1,75 @@
+# File: test_git_diff.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import io
+import tracemalloc
+
+from support import commit_to_remote, file_path, git
+
+from git_connector import GitConnector
+
+
+def records(data, **kwargs):
+    return list(GitConnector._iter_records(io.BufferedReader(io.BytesIO(data), buffer_size=7), **kwargs))
+
+
+def test_records_are_split_across_chunks():
+    assert records(b"one\0two\0\0three") == [b"one", b"two", b"", b"three"]
+    assert records(b"one\0two\0") == [b"one", b"two"]
+    assert records(b"a long record\0short\0another long one", max_record_bytes=5) == [b"a lon", b"short", b"anoth"]
+
+
+def test_huge_lines_are_not_read_into_memory(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    line = b"x" * 64 * 1024 * 1024
+    (app.repo_dir(remote_url) / file_path(1)).write_bytes(line + b"\n")
+
+    tracemalloc.start()
+    try:
+        run = app.run("git_diff", {"mode": "patch", "max_file_bytes": 1000})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert run.status == "success"
+    assert [(change["file_path"], change["truncated"]) for change in run.data] == [(file_path(1), True)]
+    assert len(run.data[0]["patch"]) <= 1000
+    assert run.data[0]["patch"].startswith(f"diff --git a/{file_path(1)}")
+    assert peak < 16 * 1024 * 1024
+
+
+def test_patches_name_unusual_paths(app, remote_path, remote_url):
+    renamed = "".join(f"line {index}\n" for index in range(20))
+    commit_to_remote(remote_path, {"dir b/file.txt": "old", "old name.txt": renamed, "bin b/data.bin": b"\0old"})
+    commit_to_remote(
+        remote_path,
+        {
+            "dir b/file.txt": "new",
+            "old name.txt": None,
+            "new b/name.txt": renamed,
+            "bin b/data.bin": b"\0new",
+            'na\u00efve "quoted".txt': "new",
+            "tab\there.txt": "new",
+            "with space.txt": "new",
+        },
+    )
+    assert app.run("clone_repo").status == "success"
+    git("-C", app.repo_dir(remote_url), "config", "diff.noprefix", "true")
+
+    run = app.run("git_diff", {"mode": "patch", "base": "HEAD~1", "target": "HEAD"})
+
+    assert run.status == "success"
+    expected = git("-C", app.repo_dir(remote_url), "diff", "--name-only", "-z", "-M", "HEAD~1", "HEAD").split("\0")[:-1]
+    assert "new b/name.txt" in expected
+    assert [change["file_path"] for change in run.data] == expected
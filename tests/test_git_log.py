@@ -0,0 +1,73 @@
+# File: test_git_log.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from support import commit_to_remote, git
+
+
+def test_pages_continue_from_the_last_commit(app, remote_path, remote_url):
+    assert app.run("clone_repo").status == "success"
+    shas = git("-C", app.repo_dir(remote_url), "rev-list", "HEAD").split()
+
+    first = app.run("git_log", {"limit": 2})
+    commit_to_remote(remote_path, {"new.txt": "new"})
+    assert app.run("git_pull").status == "success"
+    second = app.run("git_log", {"limit": 2, "cursor": first.summary["next_cursor"]})
+    last = app.run("git_log", {"limit": 2, "cursor": second.summary["next_cursor"]})
+
+    assert [commit["sha"] for commit in first.data] == shas[:2]
+    assert first.summary["next_cursor"] == f"{shas[0]}:2"
+    # The commit pulled in the meantime does not shift the pages
+    assert [commit["sha"] for commit in second.data] == shas[2:4]
+    assert [commit["sha"] for commit in last.data] == shas[4:]
+    assert last.summary["next_cursor"] is None
+
+
+def test_cursor_must_be_a_commit_sha_and_an_offset(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+
+    for cursor in ("0" * 40 + ":2", "HEAD~1:2", f"{git('-C', app.repo_dir(remote_url), 'rev-parse', 'HEAD').strip()}:x"):
+        run = app.run("git_log", {"cursor": cursor})
+        assert run.status == "failed"
+        assert run.message.startswith("Invalid cursor")
+
+
+def test_limit_is_applied_after_the_path_filter(app):
+    assert app.run("clone_repo").status == "success"
+    run = app.run("git_log", {"limit": 1, "path": "src/d01"})
+    following = app.run("git_log", {"limit": 1, "path": "src/d01", "cursor": run.summary["next_cursor"]})
+
+    assert [commit["subject"] for commit in run.data + following.data] == ["Revision 3", "Revision 1"]
+
+
+def test_pages_cover_both_sides_of_a_merge(app, remote_path, remote_url):
+    git("-C", remote_path, "branch", "side", "main~2")
+    commit_to_remote(remote_path, {"side.txt": "side 1"}, branch="side")
+    commit_to_remote(remote_path, {"side.txt": "side 2"}, branch="side")
+    commit_to_remote(remote_path, {"main.txt": "main"})
+    work_dir = remote_path.parent / "work"
+    git("clone", "-q", remote_path, work_dir)
+    git("-C", work_dir, "merge", "-q", "--no-ff", "-m", "Merge side", "origin/side")
+    git("-C", work_dir, "push", "-q", "origin", "main")
+    assert app.run("clone_repo").status == "success"
+    shas = git("-C", app.repo_dir(remote_url), "rev-list", "HEAD").split()
+
+    listed, cursor = [], None
+    while True:
+        run = app.run("git_log", {"limit": 2, "cursor": cursor} if cursor else {"limit": 2})
+        listed += [commit["sha"] for commit in run.data]
+        cursor = run.summary["next_cursor"]
+        if not cursor:
+            break
+
+    assert listed == shas
@@ -0,0 +1,34 @@
+# File: test_imports.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import subprocess
+import sys
+
+import support
+
+
+def test_importing_the_connector_runs_no_git_command():
+    # GitPython runs `git version` when it is imported, so it is only imported by the actions that run git
+    check = (
+        "import subprocess, sys\n"
+        "started = []\n"
+        "popen_init = subprocess.Popen.__init__\n"
+        "subprocess.Popen.__init__ = lambda self, args, *a, **k: started.append(args) or popen_init(self, args, *a, **k)\n"
+        "import git_connector\n"
+        "print(started, 'git' in sys.modules)\n"
+    )
+    env = {"PYTHONPATH": str(support.STUBS_DIR), "PATH": "/usr/bin:/bin"}
+    output = subprocess.run([sys.executable, "-c", check], cwd=support.APP_DIR, env=env, capture_output=True, text=True, check=True)
+
+    assert output.stdout.split() == ["[]", "False"]
@@ -0,0 +1,65 @@
+# File: test_object_cache.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from pathlib import Path
+
+from support import commit_to_remote, git
+
+
+def object_cache_dir(run):
+    return Path(run.data[0]["object_cache_dir"])
+
+
+def test_cache_never_collects_garbage_on_its_own(app):
+    run = app.run("clone_repo", {"use_object_cache": True})
+    assert run.status == "success"
+    cache_dir = object_cache_dir(run)
+
+    assert git("-C", cache_dir, "config", "gc.auto").strip() == "0"
+    assert git("-C", cache_dir, "config", "maintenance.auto").strip() == "false"
+
+
+def test_clone_refs_are_pinned_when_cloned(app, remote_url):
+    run = app.run("clone_repo", {"use_object_cache": True})
+    cache_dir = object_cache_dir(run)
+    repo_dir = app.repo_dir(remote_url)
+
+    head = git("-C", repo_dir, "rev-parse", "HEAD").strip()
+    pinned = git("-C", cache_dir, "for-each-ref", "--format=%(refname) %(objectname)", f"refs/clones/{repo_dir.name}/heads")
+    assert pinned.split() == [f"refs/clones/{repo_dir.name}/heads/main", head]
+
+
+def test_gc_keeps_objects_of_branches_deleted_on_the_remote(app, remote_path, remote_url):
+    git("-C", remote_path, "branch", "feature", "main")
+    feature_tip = commit_to_remote(remote_path, {"feature.txt": "only on the feature branch"}, branch="feature")
+    run = app.run("clone_repo", {"use_object_cache": True, "branch": "feature"})
+    assert run.status == "success"
+    cache_dir = object_cache_dir(run)
+    repo_dir = app.repo_dir(remote_url, branch="feature")
+    # The clone borrowed every object instead of downloading it
+    assert git("-C", repo_dir, "count-objects", "-v").splitlines()[0] == "count: 0"
+
+    # The clone is local work nobody pushed yet
+    git("-C", repo_dir, "commit", "--allow-empty", "-qm", "Local commit")
+    local_tip = git("-C", repo_dir, "rev-parse", "HEAD").strip()
+
+    git("-C", remote_path, "branch", "-D", "feature")
+    git("-C", cache_dir, "config", "gc.pruneExpire", "now")
+    run = app.run("refresh_object_cache", {"gc": True})
+    assert run.status == "success"
+
+    assert git("-C", cache_dir, "for-each-ref", "refs/heads/feature") == ""
+    git("-C", repo_dir, "fsck", "--connectivity-only", "--no-dangling")
+    assert git("-C", repo_dir, "show", f"{feature_tip}:feature.txt") == "only on the feature branch"
+    assert git("-C", repo_dir, "rev-parse", "HEAD").strip() == local_tip
@@ -0,0 +1,30 @@
+# File: test_poll_modes.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+from support import git
+
+
+def test_mirror_clone_can_be_deleted_and_cloned_again_in_another_mode(app, remote_url):
+    assert app.run("on_poll", {"poll_mode": "mirror"}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+    assert git("-C", repo_dir, "rev-parse", "--is-bare-repository").strip() == "true"
+    assert app.run("on_poll", {"poll_mode": "pull"}).message.startswith("Repo remote_main was cloned in a different poll mode")
+
+    run = app.run("delete_clone")
+    assert run.status == "success", run.message
+    assert not repo_dir.exists()
+
+    run = app.run("on_poll", {"poll_mode": "pull"})
+    assert run.summary["poll_result"] == "cloned"
+    assert git("-C", repo_dir, "rev-parse", "--is-bare-repository").strip() == "false"
@@ -0,0 +1,95 @@
+# File: test_repo_lock.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import multiprocessing
+import subprocess
+import time
+import uuid
+
+import pytest
+from support import git
+
+import git_consts as consts
+from git_repo_lock import RepoLock
+
+
+@pytest.fixture
+def repo_dir(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    return app.repo_dir(remote_url)
+
+
+def hold_lock(app, timeout=10):
+    return RepoLock(app.state_dir / consts.GIT_LOCK_DIR, "remote_main", timeout).acquire()
+
+
+def queue_length(app):
+    return len((app.state_dir / consts.GIT_LOCK_DIR / "remote_main.queue").read_text().splitlines())
+
+
+def test_lock_left_by_a_dead_action_is_taken_over(app, repo_dir):
+    dead = subprocess.Popen(["true"])
+    dead.wait()
+    (app.state_dir / consts.GIT_LOCK_DIR / "remote_main.queue").write_text(f"{dead.pid} 1 {uuid.uuid4().hex}\n")
+    (repo_dir / ".git" / "index.lock").touch()
+
+    run = app.run("add_file", {"file_path": "new.txt", "contents": "new"})
+
+    assert run.status == "success", run.message
+    assert not (repo_dir / ".git" / "index.lock").exists()
+    assert git("-C", repo_dir, "diff", "--cached", "--name-only") == "new.txt\n"
+
+
+def test_action_gives_up_after_the_lock_timeout(app, repo_dir):
+    lock = hold_lock(app)
+    try:
+        started = time.monotonic()
+        run = app.run("add_file", {"file_path": "new.txt", "contents": "new"}, lock_timeout=0.5)
+        waited = time.monotonic() - started
+    finally:
+        lock.release()
+
+    assert run.status == "failed"
+    assert run.message == "Timed out after 0.5 seconds waiting for another action on remote_main to finish"
+    assert 0.5 <= waited < 2
+    assert not (repo_dir / "new.txt").exists()
+
+
+def add_file(app, index, acquired):
+    started = time.time()
+    run = app.run("add_file", {"file_path": f"new{index}.txt", "contents": "new"})
+    acquired.put((started + run.summary["lock_wait_time"], index, run.status))
+
+
+def test_waiting_actions_are_served_in_arrival_order(app, repo_dir):
+    context = multiprocessing.get_context("fork")
+    acquired = context.Queue()
+    lock = hold_lock(app)
+    workers = []
+    try:
+        for index in range(4):
+            worker = context.Process(target=add_file, args=(app, index, acquired))
+            worker.start()
+            workers.append(worker)
+            # Wait for the action to queue up before the next one starts
+            deadline = time.monotonic() + 10
+            while queue_length(app) < index + 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+    finally:
+        lock.release()
+    for worker in workers:
+        worker.join()
+
+    results = sorted(acquired.get(timeout=10) for _ in workers)
+    assert [(index, status) for _, index, status in results] == [(index, "success") for index in range(4)]
@@ -0,0 +1,78 @@
+# File: test_repo_manifest.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+import multiprocessing
+from pathlib import Path
+
+from support import git
+
+import git_consts as consts
+from git_connector import GitConnector
+
+
+def read_manifest(state_dir):
+    return json.loads((state_dir / consts.GIT_REPO_MANIFEST_DIR / consts.GIT_REPO_MANIFEST).read_text())
+
+
+def listed_repos(app):
+    run = app.run("list_repos")
+    assert run.status == "success"
+    return run.data[0]["repos"]
+
+
+def test_saving_the_manifest_keeps_it_in_sync_with_the_state_directory(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    assert listed_repos(app) == ["remote_main"]
+
+    assert read_manifest(app.state_dir)["state_dir_mtime"] == app.state_dir.stat().st_mtime_ns
+    assert not (app.state_dir / consts.GIT_REPO_MANIFEST).exists()
+    run = app.run("list_repos")
+    assert not any("reconciling" in message for message in run.connector.debug)
+
+
+def update_manifest(state_dir, repo_names, updates):
+    connector = GitConnector()
+    connector.app_state_dir = Path(state_dir)
+    for update in range(updates):
+        for repo_name in repo_names:
+            connector._update_repo_manifest(repo_name, last_sync=str(update))
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    repo_names = [f"repo{index}_main" for index in range(4)]
+    for repo_name in repo_names:
+        git("init", "-q", tmp_path / repo_name)
+
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=update_manifest, args=(tmp_path, [repo_name], 25)) for repo_name in repo_names]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    manifest = read_manifest(tmp_path)
+    assert {name: info.get("last_sync") for name, info in manifest["repos"].items()} == dict.fromkeys(repo_names, "24")
+
+
+def test_directories_are_checked_again_once_they_change(app, remote_url):
+    half_cloned = app.state_dir / "half_main"
+    half_cloned.mkdir(parents=True)
+    assert listed_repos(app) == []
+    assert "half_main" in read_manifest(app.state_dir)["ignored"]
+
+    git("init", "-q", half_cloned)
+    (app.state_dir / "other").mkdir()
+
+    assert listed_repos(app) == ["half_main"]
@@ -0,0 +1,103 @@
+# File: test_repo_query.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import subprocess
+
+import pytest
+from support import file_path, git
+
+from git_repo_query import RepoQuery
+from git_traced_repo import TracedRepo
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Arguments of every subprocess started while the test runs."""
+    spawned = []
+    popen_init = subprocess.Popen.__init__
+
+    def counting_init(self, args, *popen_args, **popen_kwargs):
+        spawned.append(args)
+        popen_init(self, args, *popen_args, **popen_kwargs)
+
+    monkeypatch.setattr(subprocess.Popen, "__init__", counting_init)
+    return spawned
+
+
+@pytest.fixture
+def repo_dir(tmp_path, remote_url):
+    repo_dir = tmp_path / "clone"
+    git("clone", "-q", remote_url, repo_dir)
+    git("-C", repo_dir, "branch", "feature", "HEAD~1")
+    return repo_dir
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_answers_match_git(repo_dir, packed, spawned):
+    if packed:
+        git("-C", repo_dir, "pack-refs", "--all")
+    head, feature, origin_main = git("-C", repo_dir, "rev-parse", "HEAD", "feature", "origin/main").split()
+    old_tree, new_tree = (bytes.fromhex(sha) for sha in git("-C", repo_dir, "rev-parse", "feature^{tree}", "HEAD^{tree}").split())
+    changed = git("-C", repo_dir, "diff-tree", "-r", "--name-only", "feature", "HEAD").split()
+    spawned.clear()
+
+    with TracedRepo(repo_dir) as repo:
+        query = RepoQuery(repo)
+        assert query.resolve() == head
+        assert query.symbolic_target() == "refs/heads/main"
+        assert query.branch_name() == "main"
+        assert query.branch_sha("feature") == feature
+        assert query.remote_branch_sha("main") == origin_main
+        assert query.branch_sha("missing") is None
+        assert query.has_object(feature)
+        assert not query.has_object("0" * 40)
+        assert [path for path, _, _, _ in query.diff_trees(old_tree, new_tree)] == changed
+
+    # Refs are read from disk, object lookups share one `cat-file --batch-check` and one `cat-file --batch` process
+    assert sorted(args[1:] for args in spawned) == [["cat-file", "--batch"], ["cat-file", "--batch-check"]]
+
+
+def test_detached_head(repo_dir):
+    git("-C", repo_dir, "checkout", "-q", "--detach", "HEAD~2")
+    with TracedRepo(repo_dir) as repo:
+        query = RepoQuery(repo)
+        assert query.branch_name() == "HEAD"
+        assert query.symbolic_target() is None
+        assert query.resolve() == git("-C", repo_dir, "rev-parse", "HEAD").strip()
+
+
+# Upper bounds of the git processes started by each action
+ACTION_PROCESSES = [
+    ("list_repos", {}, 0),
+    ("get_disk_usage", {}, 0),
+    ("git_status", {}, 1),
+    ("git_log", {"limit": 10}, 2),
+    ("get_file", {"file_path": file_path(0)}, 2),
+    ("update_file", {"file_path": file_path(1), "contents": "updated"}, 0),
+    ("add_file", {"file_path": "added.txt", "contents": "added"}, 0),
+    ("git_commit", {"message": "Commit"}, 1),
+    ("git_checkout", {"branch_name": "main"}, 2),
+    ("git_push", {}, 1),
+]
+
+
+def test_git_processes_per_action(app, spawned):
+    assert app.run("clone_repo").status == "success"
+
+    for action, param, max_processes in ACTION_PROCESSES:
+        spawned.clear()
+        run = app.run(action, param)
+        assert run.status == "success", (action, run.message)
+        git_processes = [args for args in spawned if args[0] == "git"]
+        assert len(git_processes) <= max_processes, (action, git_processes)
@@ -0,0 +1,153 @@
+# File: test_ssh_multiplexing.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import asyncio
+import os
+import re
+import subprocess
+import threading
+import time
+
+import pytest
+from support import commit_to_remote, git
+
+
+asyncssh = pytest.importorskip("asyncssh")
+
+
+class GitServer:
+    """SSH server standing in for a git host: it runs the git commands of every session against the local file system."""
+
+    def __init__(self, client_key):
+        self.connections = []
+        self.host_key = asyncssh.generate_private_key("ssh-ed25519")
+        self.client_key = client_key
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.acceptor = asyncio.run_coroutine_threadsafe(self._listen(), self.loop).result(timeout=10)
+        self.port = self.acceptor.sockets[0].getsockname()[1]
+
+    async def _listen(self):
+        server = self
+
+        class Server(asyncssh.SSHServer):
+            def connection_made(self, connection):
+                server.connections.append(connection)
+
+        return await asyncssh.listen(
+            "127.0.0.1",
+            0,
+            server_factory=Server,
+            server_host_keys=[self.host_key],
+            authorized_client_keys=asyncssh.import_authorized_keys(self.client_key.export_public_key().decode()),
+            process_factory=self._run_command,
+            encoding=None,
+        )
+
+    @staticmethod
+    async def _run_command(process):
+        command = await asyncio.create_subprocess_shell(
+            process.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        async def send_input():
+            try:
+                while data := await process.stdin.read(65536):
+                    command.stdin.write(data)
+                    await command.stdin.drain()
+                command.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                # git closes its input once it has read everything it needs
+                pass
+
+        async def send_output(reader, writer):
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+
+        sending = asyncio.ensure_future(send_input())
+        await asyncio.gather(send_output(command.stdout, process.stdout), send_output(command.stderr, process.stderr))
+        status = await command.wait()
+        sending.cancel()
+        process.exit(status)
+
+    def known_hosts_line(self):
+        return f"[127.0.0.1]:{self.port} {self.host_key.export_public_key().decode().strip()}"
+
+    async def _close(self):
+        self.acceptor.close()
+        await self.acceptor.wait_closed()
+        for connection in self.connections:
+            connection.close()
+            await connection.wait_closed()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+
+@pytest.fixture
+def ssh_app(app, remote_path, monkeypatch):
+    """Runner whose asset reaches the synthetic remote over SSH, through the stand-in server, with multiplexing."""
+    # The connector exports the ssh command of the asset, restore the environment afterwards
+    monkeypatch.setenv("GIT_SSH_COMMAND", "")
+    client_key = asyncssh.generate_private_key("ssh-ed25519")
+    ssh_dir = app.state_dir / ".ssh-1"
+    ssh_dir.mkdir(parents=True, mode=0o700)
+    key_path = ssh_dir / "id_rsa"
+    key_path.write_bytes(client_key.export_private_key())
+    key_path.chmod(0o600)
+
+    server = GitServer(client_key)
+    app.config.update(
+        repo_uri=f"ssh://git@127.0.0.1:{server.port}{remote_path}",
+        ssh_host_key=server.known_hosts_line(),
+        ssh_multiplexing=True,
+    )
+    yield app, server
+    # Stop the master connections before the server
+    app.run("list_repos").connector._close_ssh_sessions()
+    server.close()
+
+
+def test_actions_share_one_detached_master_connection(ssh_app, remote_path):
+    app, server = ssh_app
+
+    started = time.monotonic()
+    run = app.run("clone_repo")
+    assert run.status == "success", run.message
+    # git only returns once every process holding its output is gone, a master attached to it would keep it waiting
+    assert time.monotonic() - started < 20
+    # Starting the master, which includes the SSH handshake, is part of the git timings of the action
+    assert {"ssh -O check", "ssh", "clone"} <= set(run.summary["git_time_by_command"])
+
+    commit_to_remote(remote_path, {"new.txt": "new"})
+    run = app.run("git_pull")
+    assert run.status == "success"
+    # A running master is only checked
+    assert "ssh" not in run.summary["git_time_by_command"]
+    assert "ssh -O check" in run.summary["git_time_by_command"]
+    assert app.run("test_asset_connectivity").status == "success"
+
+    repo_dir = app.repo_dir(str(remote_path))
+    assert git("-C", repo_dir, "show", "HEAD:new.txt") == "new"
+    assert len(server.connections) == 1
+
+    # The master holds none of the pipes of the git commands or of the connector
+    (socket_path,) = run.connector._ssh_control_dir().glob("cm-*")
+    check = subprocess.run(["ssh", f"-oControlPath={socket_path}", "-O", "check", "git"], capture_output=True, text=True, check=True)
+    master_pid = re.search(r"pid=(\d+)", check.stderr).group(1)
+    assert [os.readlink(f"/proc/{master_pid}/fd/{fd}") for fd in range(3)] == ["/dev/null"] * 3
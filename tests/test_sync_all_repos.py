@@ -0,0 +1,53 @@
+# File: test_sync_all_repos.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+from support import commit_to_remote, git
+
+
+def slow_down_remote(repo_dir, tmp_path, seconds):
+    """Make every connection of a clone to its remote take at least ``seconds``."""
+    upload_pack = tmp_path / "slow-upload-pack"
+    upload_pack.write_text(f'#!/bin/sh\nsleep {seconds}\nexec git-upload-pack "$@"\n')
+    upload_pack.chmod(0o755)
+    git("-C", repo_dir, "config", "remote.origin.uploadpack", upload_pack)
+
+
+def test_pull_all_repos(app, remote_path, remote_url):
+    assert app.run("clone_repo").status == "success"
+    tip = commit_to_remote(remote_path, {"new.txt": "new"})
+
+    run = app.run("sync_all_repos", {"mode": "pull"})
+
+    assert run.status == "success"
+    assert [(repo["repo_name"], repo["status"]) for repo in run.data] == [("remote_main", "success")]
+    assert git("-C", app.repo_dir(remote_url), "rev-parse", "HEAD").strip() == tip
+
+
+def test_timeout_covers_every_git_command_of_a_repo(app, tmp_path, remote_path, remote_url):
+    # A pull of a shallow clone of a rewritten branch runs three git commands
+    assert app.run("clone_repo", {"depth": 1}).status == "success"
+    repo_dir = app.repo_dir(remote_url)
+    git("-C", repo_dir, "config", "pull.rebase", "false")
+    files = json.dumps([{"path": "local.txt", "op": "add", "contents": "local"}])
+    assert app.run("commit_files", {"files": files, "message": "Local change"}).status == "success"
+    git("-C", remote_path, "update-ref", "refs/heads/main", "main~3")
+    commit_to_remote(remote_path, {"upstream.txt": "upstream"})
+    slow_down_remote(repo_dir, tmp_path, 1.5)
+
+    run = app.run("sync_all_repos", {"mode": "pull", "timeout": 2})
+
+    assert run.data[0]["status"] == "failed"
+    assert run.data[0]["duration"] < 3.5
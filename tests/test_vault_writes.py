@@ -0,0 +1,60 @@
+# File: test_vault_writes.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+import bench_actions
+import pytest
+from support import add_to_vault, git
+
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def repo_dir(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    return app.repo_dir(remote_url)
+
+
+def test_vault_files_are_copied_unchanged(app, repo_dir):
+    vault_id = add_to_vault(app.vault_dir, 300000)
+
+    assert app.run("add_file", {"file_path": "vault.bin", "vault_id": vault_id}).status == "success"
+    files = json.dumps([{"path": "batch.bin", "op": "add", "vault_id": vault_id}])
+    assert app.run("write_files", {"files": files}).status == "success"
+
+    vault_data = app.vault_file(vault_id).read_bytes()
+    assert (repo_dir / "vault.bin").read_bytes() == vault_data
+    assert (repo_dir / "batch.bin").read_bytes() == vault_data
+    assert git("-C", repo_dir, "hash-object", "vault.bin") == git("-C", repo_dir, "rev-parse", ":vault.bin")
+
+
+def test_escape_sequences_are_only_applied_to_inline_contents(app, repo_dir):
+    assert app.run("add_file", {"file_path": "inline.txt", "contents": "first\\nsecond\\t"}).status == "success"
+
+    assert (repo_dir / "inline.txt").read_bytes() == b"first\nsecond\t"
+
+
+def test_peak_memory_does_not_grow_with_the_vault_file(app, repo_dir):
+    job = {"state_dir": str(app.state_dir), "vault_dir": str(app.vault_dir), "config": app.config}
+    peak_rss = {}
+    for size in (8 * MB, 128 * MB):
+        vault_id = add_to_vault(app.vault_dir, size)
+        measurements = bench_actions.run_step(dict(job, action="add_file", param={"file_path": f"{size}.bin", "vault_id": vault_id}))
+        assert measurements["status"] == "success", measurements
+        assert (repo_dir / f"{size}.bin").stat().st_size == size
+        peak_rss[size] = measurements["peak_rss_kb"] * 1024
+
+    assert peak_rss[128 * MB] - peak_rss[8 * MB] < 16 * MB
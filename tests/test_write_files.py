@@ -0,0 +1,60 @@
+# File: test_write_files.py
+#
+# Copyright (c) 2017-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+import pytest
+from support import file_path, git
+
+
+@pytest.fixture
+def repo_dir(app, remote_url):
+    assert app.run("clone_repo").status == "success"
+    return app.repo_dir(remote_url)
+
+
+def write_files(app, *entries):
+    return app.run("write_files", {"files": json.dumps(entries)})
+
+
+def test_changes_are_staged_together(app, repo_dir):
+    run = write_files(
+        app,
+        {"path": "new.txt", "op": "add", "contents": "new"},
+        {"path": file_path(1), "op": "update", "contents": "updated"},
+        {"path": file_path(2), "op": "delete"},
+        {"path": "missing.txt", "op": "delete"},
+    )
+
+    assert run.status == "success"
+    assert [row["status"] for row in run.data] == ["success", "success", "success", "failed"]
+    assert run.summary["successful"] == 3
+    assert git("-C", repo_dir, "diff", "--cached", "--name-status").splitlines() == [
+        "A\tnew.txt",
+        f"M\t{file_path(1)}",
+        f"D\t{file_path(2)}",
+    ]
+
+
+def test_rows_fail_when_the_index_cannot_be_written(app, repo_dir):
+    (repo_dir / ".git" / "index.lock").touch()
+
+    run = write_files(app, {"path": "new.txt", "op": "add", "contents": "new"}, {"path": file_path(2), "op": "delete"})
+
+    assert run.status == "failed"
+    assert [row["status"] for row in run.data] == ["failed", "failed"]
+    assert all(row["message"].startswith("Error while updating the index") for row in run.data)
+    assert run.summary["successful"] == 0
+    (repo_dir / ".git" / "index.lock").unlink()
+    assert git("-C", repo_dir, "diff", "--cached", "--name-only") == ""